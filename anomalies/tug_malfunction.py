@@ -1,4 +1,3 @@
-import copy
 import random
 
 from shapely.geometry import Point
@@ -8,9 +7,10 @@ from components import Position, VesselPath
 from components.fsm import TugStateMachine, VesselStateMachine
 from components.fsm.states import TugState, VesselState
 from components.location_info import LocationType
+from environment.context import SimulationContext
 from environment.queries import WaitingLocationList, berth_info_by_id
 from exceptions import NoPathException, NotEnoughAvailableTugsException
-from utils.timer import SimulationTimer, TimerScheduler
+from utils.timer import SimulationTimer
 
 
 class TugMalfunctionAnomaly(BaseVesselAnomaly):
@@ -26,11 +26,12 @@ class TugMalfunctionAnomaly(BaseVesselAnomaly):
         deattach_location_polygon,
         broken_tug_time_sampler=None,
         default_malfunction_duration=18000,
+        context=None,
     ):
         """
         Input:
             :param world: Esper world object
-            :param path_finder: reference to a PathFinder singleton object
+            :param path_finder: reference to a PathFinder object
             :param break_percentage_idle: probability of the tugboats malfunctioning
                 in an idle state (must be 0 <= x <= 1)
             :param break_percentage_busy: probability of the tugboats malfunctioning
@@ -43,6 +44,7 @@ class TugMalfunctionAnomaly(BaseVesselAnomaly):
                 the tugboat should be broken for
             :param default_malfunction_duration: an amount of time in seconds for which the
                 tugboat should be broken for
+            :param context: the simulation context, defaults to SimulationContext.default()
         """
 
         self.world = world
@@ -53,6 +55,7 @@ class TugMalfunctionAnomaly(BaseVesselAnomaly):
         self.broken_tug_time_sampler = broken_tug_time_sampler
         self.default_malfunction_duration = default_malfunction_duration
         self.deattach_location_polygon = deattach_location_polygon
+        self.timer_scheduler = (context or SimulationContext.default()).timer_scheduler
 
     def check_for_anomaly(self, entity_id):
         """Performs a check whether the tug is supposed to malfunction.
@@ -98,7 +101,7 @@ class TugMalfunctionAnomaly(BaseVesselAnomaly):
             tug_position=tug_position,
         )
 
-        TimerScheduler.get_instance().schedule(complete_processing_timer)
+        self.timer_scheduler.schedule(complete_processing_timer)
 
         # If the tug was booked/operating find a replacement
         vessel_id = tug_fsm.current_target_vessel_id()
@@ -108,10 +111,11 @@ class TugMalfunctionAnomaly(BaseVesselAnomaly):
             vessel_fsm = self.world.component_for_entity(vessel_id, VesselStateMachine)
 
             if vessel_fsm.current() == VesselState.LEAVING:
-                # Used to retain the same spawn path to return to the waiting location
-                vessel_path = copy.deepcopy(
-                    self.world.component_for_entity(vessel_id, VesselPath).path
-                )
+                # Used to retain the same spawn path to return to the waiting location.
+                # Paths are immutable views, so they can be shared without copying
+                vessel_path = self.world.component_for_entity(
+                    vessel_id, VesselPath
+                ).path
 
             self._replace_tug(vessel_id, tug_fsm, entity_id)
 
@@ -220,14 +224,17 @@ class TugMalfunctionAnomaly(BaseVesselAnomaly):
                     )
 
                     # Stop the trace at the vessel's new position
-                    self.path_finder.trim_trace_to_current_position(
-                        vessel_position=vessel_pos.lonlat, trace=tug_wl_destination_path
+                    tug_wl_destination_path = (
+                        self.path_finder.trim_trace_to_current_position(
+                            vessel_position=vessel_pos.lonlat,
+                            trace=tug_wl_destination_path,
+                        )
                     )
 
                     tug_wl_destination_path = self.path_finder.reverse_path(
                         tug_wl_destination_path
                     )
-                    self.path_finder.prefix_path(
+                    tug_wl_destination_path = self.path_finder.prefix_path(
                         new_tug_position.lonlat, tug_wl_destination_path
                     )
 
@@ -254,16 +261,19 @@ class TugMalfunctionAnomaly(BaseVesselAnomaly):
                             tug_wl_destination_path
                         )
 
-                        # Copy the spawn path of the vessel and cut it up to the vessel's position
-                        vessel_spawn_path = copy.deepcopy(
-                            self.world.component_for_entity(vessel_id, VesselPath).path
-                        )
+                        # Take the spawn path of the vessel and cut it up to the vessel's position
+                        vessel_spawn_path = self.world.component_for_entity(
+                            vessel_id, VesselPath
+                        ).path
                         vessel_spawn_path = self.path_finder.reverse_path(
                             vessel_spawn_path
                         )
 
-                        self.path_finder.trim_trace_to_current_position(
-                            vessel_position=vessel_pos.lonlat, trace=vessel_spawn_path
+                        vessel_spawn_path = (
+                            self.path_finder.trim_trace_to_current_position(
+                                vessel_position=vessel_pos.lonlat,
+                                trace=vessel_spawn_path,
+                            )
                         )
 
                         vessel_spawn_path = self.path_finder.reverse_path(
@@ -293,7 +303,7 @@ class TugMalfunctionAnomaly(BaseVesselAnomaly):
                     tug_wl_destination_path = self.path_finder.reverse_path(
                         tug_wl_destination_path
                     )
-                    self.path_finder.prefix_path(
+                    tug_wl_destination_path = self.path_finder.prefix_path(
                         new_tug_position.lonlat, tug_wl_destination_path
                     )
 
@@ -345,7 +355,7 @@ class TugMalfunctionAnomaly(BaseVesselAnomaly):
             old_tug_pos=old_tug_pos,
         )
 
-        TimerScheduler.get_instance().schedule(tug_assignment_timer)
+        self.timer_scheduler.schedule(tug_assignment_timer)
 
     def _redirect_fixed_tug_to_waiting_location(self, tug_fsm, tug_path, tug_position):
         """Orders the now fixed tug to go to the waiting location and await new assignments."""
@@ -389,7 +399,7 @@ class TugMalfunctionAnomaly(BaseVesselAnomaly):
             )
         elif tug_fsm.state_before_failure in [TugState.TUGGING_OUT]:
             # Create a path to the old berth from the current position
-            old_outgoing_path = copy.deepcopy(tug_fsm.previous_vessel_path)
+            old_outgoing_path = tug_fsm.previous_vessel_path
             old_outgoing_path = self.path_finder.reverse_path(old_outgoing_path)
 
             # Find a berth -> waiting location path
@@ -0,0 +1,148 @@
+"""
+    Benchmark runner: runs fixed-seed headless scenarios of the example
+    port at several scales, measures their speed, memory and the cost of
+    every processor, and writes the measures to a JSON file. The measures
+    can be compared with the ones of a previous run, the baseline.
+
+    For example, to check that a change does not slow down the simulation:
+
+    python benchmark.py --results baseline.json
+    python benchmark.py --results benchmark.json --baseline baseline.json
+
+    The port_500 and port_2000 scenarios run on synthetic ports with
+    thousands of berths and traces, see generate_port.py:
+
+    python benchmark.py --scenarios port_500,port_2000 --max-time 20000
+"""
+
+import argparse
+import json
+import sys
+
+from experiment import parse_assignment, parse_value
+from simulation.benchmark import (PORT_SCENARIOS, SCENARIOS, compare_to_baseline,
+                                  run_benchmark)
+
+
+def init_parser():
+    parser = argparse.ArgumentParser(
+        description="PySeidon - benchmark the simulator at several scales"
+    )
+
+    parser.add_argument(
+        "--scenarios",
+        default=",".join(SCENARIOS),
+        help="Comma-separated scenarios to run "
+        f"({', '.join([*SCENARIOS, *PORT_SCENARIOS])})",
+        type=str,
+    )
+    parser.add_argument(
+        "--max-time", default=None, help="Simulated seconds of every scenario", type=int
+    )
+    parser.add_argument(
+        "--repeat",
+        default=1,
+        help="Runs of every scenario, the fastest one is kept",
+        type=int,
+    )
+    parser.add_argument(
+        "--results",
+        default="benchmark.json",
+        help="File the benchmark report is written to",
+        type=str,
+    )
+    parser.add_argument(
+        "--baseline",
+        default=None,
+        help="Benchmark report to compare the results with (optional)",
+        type=str,
+    )
+    parser.add_argument(
+        "--tolerance",
+        default=0.1,
+        help="Relative slowdown (or memory growth) reported as a regression",
+        type=float,
+    )
+    parser.add_argument(
+        "--set",
+        default=[],
+        action="append",
+        help="Value of a parameter shared by all the scenarios, e.g. step=5 (can be repeated)",
+        type=str,
+    )
+
+    return parser
+
+
+def print_report(report):
+    for name, metrics in report["scenarios"].items():
+        print(
+            f"{name}: {metrics['ticks_per_second']:.0f} ticks/s, "
+            f"{metrics['simulated_hours_per_second']:.2f} simulated hours/s, "
+            f"peak RSS {metrics['peak_rss_mb']:.0f} MB, "
+            f"traces loaded in {metrics['load_time']:.2f}s"
+        )
+
+        for processor, stats in metrics["processors"].items():
+            print(f"  {processor}: {stats['share']:.1%} ({stats['total_time']:.2f}s)")
+
+
+def print_comparisons(comparisons):
+    for comparison in comparisons:
+        status = "REGRESSION" if comparison["regression"] else "ok"
+
+        if comparison["metric"] == "kpis":
+            print(f"{comparison['scenario']} kpis: {status}")
+            continue
+
+        print(
+            f"{comparison['scenario']} {comparison['metric']}: "
+            f"{comparison['baseline']:.2f} → {comparison['current']:.2f} "
+            f"({comparison['change']:+.1%}) {status}"
+        )
+
+
+def main():
+    args = init_parser().parse_args()
+
+    known_scenarios = {**SCENARIOS, **PORT_SCENARIOS}
+    scenarios = {}
+
+    for name in args.scenarios.split(","):
+        if name not in known_scenarios:
+            print(f"Unknown scenario {name}!")
+            sys.exit(-1)
+
+        scenarios[name] = known_scenarios[name]
+
+    base_config = {}
+
+    if args.max_time is not None:
+        base_config["max_time"] = args.max_time
+
+    for assignment in args.set:
+        key, value = parse_assignment(assignment)
+        base_config[key] = parse_value(value)
+
+    report = run_benchmark(scenarios, base_config, repeat=args.repeat)
+
+    with open(args.results, "w") as results_file:
+        json.dump(report, results_file, indent=2)
+
+    print_report(report)
+    print(f"Written the benchmark report to {args.results}")
+
+    if args.baseline is not None:
+        with open(args.baseline) as baseline_file:
+            comparisons = compare_to_baseline(
+                report, json.load(baseline_file), args.tolerance
+            )
+
+        print_comparisons(comparisons)
+
+        if any(comparison["regression"] for comparison in comparisons):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ class BerthInfo:
         max_depth: float,
         allowed_vessel_content_type,
         section: str,
+        allowed_vessel_classes,
         **kwargs,
     ):
         """Initializes a new Berth Info
@@ -19,6 +20,7 @@ class BerthInfo:
         :param max_depth: max depth of the berth.
         :param allowed_vessel_content_type: content types of vessels allowed in the berth.
         :param section: the port section the berth belongs to
+        :param allowed_vessel_classes: classes of the vessels allowed in the berth.
         """
         if not name:
             raise ValueError("A berth name is required!")
@@ -26,6 +28,9 @@ class BerthInfo:
         if not max_depth or type(max_depth) != float:
             raise ValueError("max_depth must be a not None float!")
 
+        if allowed_vessel_classes is None:
+            raise ValueError("The allowed vessel classes are required!")
+
         if max_quay_length is not None and str(max_quay_length).strip() != "":
             self.max_quay_length = float(max_quay_length)
         else:
@@ -35,6 +40,7 @@ class BerthInfo:
         self.max_depth = max_depth
         self._allowed_vessel_content_type = allowed_vessel_content_type
         self.section = section
+        self.allowed_vessel_classes = allowed_vessel_classes
 
         # Add the rest of the arguments to class attributes
         self.__dict__.update(kwargs)
@@ -1,4 +1,5 @@
 from .anchorages import AnchorageStateMachine
+from .base import StateMachine
 from .berth import BerthStateMachine
 from .pilot import PilotStateMachine
 from .speed import NULL_SPEED_MODEL, SpeedStateMachine
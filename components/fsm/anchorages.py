@@ -1,21 +1,17 @@
-from fysom import Fysom
-
+from components.fsm.base import StateMachine
 from components.fsm.states import AnchorageState
 
 
-class AnchorageStateMachine:
+class AnchorageStateMachine(StateMachine):
     """Keeps track of the state of an anchorage in the port."""
 
     def __init__(self):
         self.current_vessel_fsms = []
-        self.fsm = Fysom(AnchorageState.get_state_graph())
+        super().__init__(AnchorageState.get_state_graph())
 
     def occupancy(self):
         return len(self.current_vessel_fsms)
 
-    def current(self):
-        return self.fsm.current
-
     def book(self, vessel_fsm):
         assert vessel_fsm is not None, "A vessel state machine is required!"
 
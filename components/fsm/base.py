@@ -0,0 +1,40 @@
+from fysom import Fysom
+
+
+class StateMachine:
+    """Base class of the state machines, wrapping a fysom state machine.
+
+    Every state change calls the on_state_change callback (if any) and then
+    the state listeners, so that e.g. the indexes of the entities can follow
+    the states without replacing the callback.
+    """
+
+    def __init__(self, state_graph, on_state_change=None):
+        """
+        :param state_graph: the fysom state graph
+        :param on_state_change: function to execute when the state changes (optional).
+        """
+        self.fsm = Fysom(state_graph)
+
+        # Functions f(event) called after on_state_change with every state change
+        self.state_listeners = []
+
+        self._on_state_change = on_state_change
+        self.fsm.onchangestate = self._state_changed
+
+    def current(self):
+        return self.fsm.current
+
+    def on_state_change(self, callback):
+        """Sets the function to execute when the state changes
+
+        :param callback: function called with the fysom transition event
+        """
+        self._on_state_change = callback
+
+    def _state_changed(self, event):
+        if self._on_state_change is not None:
+            self._on_state_change(event)
+
+        for listener in self.state_listeners:
+            listener(event)
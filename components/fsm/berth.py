@@ -1,30 +1,32 @@
 import random
 
-from fysom import Fysom
-
 from utils.timer import SimulationTimer, TimerScheduler
 
+from .base import StateMachine
 from .states import BerthState
 
 
-class BerthStateMachine:
+class BerthStateMachine(StateMachine):
     """Keeps track of the state of a berth in the port."""
 
-    def __init__(self, service_time_sampler, random_check_prob=0):
+    def __init__(self, service_time_sampler, random_check_prob=0, timer_scheduler=None):
         """
         Initializes a new BerthStateMachine
 
         :param service_time_sampler: function to sample time from
+        :param timer_scheduler: the scheduler of the service timers, defaults
+            to the default TimerScheduler instance
         """
+        if timer_scheduler is None:
+            timer_scheduler = TimerScheduler.get_instance()
+
+        self.timer_scheduler = timer_scheduler
         self.current_vessel_fsm = None
-        self.fsm = Fysom(BerthState.get_state_graph())
+        super().__init__(BerthState.get_state_graph())
         self.service_time_sampler = service_time_sampler
         self.current_berth_timer_id = None
         self.random_check_prob = random_check_prob
 
-    def current(self):
-        return self.fsm.current
-
     def book(self, vessel_fsm):
         assert vessel_fsm is not None, "A vessel state machine is required!"
         assert (
@@ -55,7 +57,7 @@ class BerthStateMachine:
             duration=seconds, target_function=self.finish_processing
         )
 
-        TimerScheduler.get_instance().schedule(complete_processing_timer)
+        self.timer_scheduler.schedule(complete_processing_timer)
 
     def finish_processing(self):
         self.current_vessel_fsm.done_servicing()
@@ -1,9 +1,8 @@
-from fysom import Fysom
-
+from .base import StateMachine
 from .states import PilotState
 
 
-class PilotStateMachine:
+class PilotStateMachine(StateMachine):
     """Keeps track of the state of a pilot vessel in the port."""
 
     def __init__(self, waiting_location_id, on_state_change=None):
@@ -16,13 +15,7 @@ class PilotStateMachine:
         self.berth_id = None
         self.rendezvous_id = None
         self.waiting_location_id = waiting_location_id
-        self.fsm = Fysom(PilotState.get_state_graph())
-
-        if on_state_change is not None:
-            self.fsm.onchangestate = on_state_change
-
-    def current(self):
-        return self.fsm.current
+        super().__init__(PilotState.get_state_graph(), on_state_change)
 
     def booked_vessel_id(self):
         return self.destination_vessel_id
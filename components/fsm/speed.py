@@ -1,21 +1,30 @@
 import random
 
-from fysom import Fysom
-
 from utils.timer import SimulationTimer, TimerScheduler
 
+from .base import StateMachine
 from .states import SpeedState
 
 # Probabilities for an always normal speed model
 NULL_SPEED_MODEL = {"double": 0, "half": 0, "reset": 0}
 
 
-class SpeedStateMachine:
+class SpeedStateMachine(StateMachine):
     """Velocity finite state machine. Used for introducing velocity anomalies."""
 
     def __init__(
-        self, double_p, halve_p, normal_p, transition_chance_interval=7200, factor=2.0
+        self,
+        double_p,
+        halve_p,
+        normal_p,
+        transition_chance_interval=7200,
+        factor=2.0,
+        timer_scheduler=None,
     ):
+        if timer_scheduler is None:
+            timer_scheduler = TimerScheduler.get_instance()
+
+        self.timer_scheduler = timer_scheduler
         self.transition_chance_interval = transition_chance_interval
         self.probabilities = {"double": double_p, "half": halve_p, "reset": normal_p}
         self.factor = factor
@@ -24,12 +33,9 @@ class SpeedStateMachine:
             sum([double_p, halve_p, normal_p]) <= 1
         ), "Probabilities must sum up to 1!"
 
-        self.fsm = Fysom(SpeedState.get_state_graph())
+        super().__init__(SpeedState.get_state_graph())
         self._schedule_transition_timer()
 
-    def current(self):
-        return self.fsm.current
-
     def _timer_callback(self):
         self.random_transition()
         self._schedule_transition_timer()
@@ -39,7 +45,7 @@ class SpeedStateMachine:
             duration=self.transition_chance_interval,
             target_function=self._timer_callback,
         )
-        TimerScheduler.get_instance().schedule(self.timer)
+        self.timer_scheduler.schedule(self.timer)
 
     def random_transition(self):
         sample = random.random()
@@ -1,9 +1,8 @@
-from fysom import Fysom
-
+from .base import StateMachine
 from .states import TugState
 
 
-class TugStateMachine:
+class TugStateMachine(StateMachine):
     """Keeps track of the state of a tugboat in the port."""
 
     def __init__(self, waiting_location_id, on_state_change=None):
@@ -18,13 +17,7 @@ class TugStateMachine:
         self.state_before_failure = None
         self.previous_vessel_path = None
 
-        self.fsm = Fysom(TugState.get_state_graph())
-
-        if on_state_change is not None:
-            self.fsm.onchangestate = on_state_change
-
-    def current(self):
-        return self.fsm.current
+        super().__init__(TugState.get_state_graph(), on_state_change)
 
     def current_target_vessel_id(self):
         return self.destination_vessel_id
@@ -1,9 +1,8 @@
-from fysom import Fysom
-
+from .base import StateMachine
 from .states import VesselState
 
 
-class VesselStateMachine:
+class VesselStateMachine(StateMachine):
     """Keeps track of the state of a vessel in the port."""
 
     def __init__(self, on_state_change=None):
@@ -21,17 +20,11 @@ class VesselStateMachine:
         self.tugboats = None
         self.tug_company = None
         self.pilot_boarded = False
-        self.fsm = Fysom(VesselState.get_state_graph())
+        super().__init__(VesselState.get_state_graph(), on_state_change)
 
         # Used to keep the state the vessel was in before a malfunction (e.g. broken tug)
         self.state_before_failure = None
 
-        if on_state_change is not None:
-            self.fsm.onchangestate = on_state_change
-
-    def current(self):
-        return self.fsm.current
-
     def generate(self):
         self.fsm.generate()
 
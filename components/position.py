@@ -7,8 +7,19 @@ class Position:
     # The length of the vessel position's history
     TRACE_LENGTH = 100
 
-    def __init__(self, lonlat=None):
-        self._history = {"lon": [], "lat": []}
+    def __init__(self, lonlat=None, keep_history=True):
+        """
+        :param lonlat: numpy array of the form [lon, lat] (optional)
+        :param keep_history: whether the positions history is kept, it is
+            only used by the graphics
+        """
+        self.keep_history = keep_history
+
+        # Ring buffer of [lon, lat] rows, every position is written twice
+        # (at i and i + TRACE_LENGTH) so that the latest positions are
+        # always a contiguous slice of the buffer
+        self._history = None
+        self._history_count = 0
 
         self._lonlat = lonlat
 
@@ -39,17 +50,36 @@ class Position:
         self._lonlat = lonlat
         self._save_to_history(lonlat)
 
-        # Keep only the last n positions
-        self._history["lon"] = self._history["lon"][-self.TRACE_LENGTH :]
-        self._history["lat"] = self._history["lat"][-self.TRACE_LENGTH :]
-
     def _save_to_history(self, lonlat):
-        self._history["lon"].append(lonlat[0])
-        self._history["lat"].append(lonlat[1])
+        if not self.keep_history:
+            return
+
+        if self._history is None:
+            self._history = np.empty((2, 2 * self.TRACE_LENGTH))
+
+        i = self._history_count % self.TRACE_LENGTH
+
+        self._history[:, i] = lonlat
+        self._history[:, i + self.TRACE_LENGTH] = lonlat
+        self._history_count += 1
 
     def history(self):
-        """Return an array with previous position of the entity"""
-        return self._history
+        """Return the last positions of the entity, from the oldest one, as
+        read-only views of the history buffer
+        """
+        if self._history is None:
+            return {"lon": np.empty(0), "lat": np.empty(0)}
+
+        if self._history_count < self.TRACE_LENGTH:
+            start, end = 0, self._history_count
+        else:
+            start = self._history_count % self.TRACE_LENGTH
+            end = start + self.TRACE_LENGTH
+
+        lonlat = self._history[:, start:end]
+        lonlat.flags.writeable = False
+
+        return {"lon": lonlat[0], "lat": lonlat[1]}
 
     def lon(self):
         """Return the longitude"""
@@ -40,9 +40,25 @@ class VesselInfo:
         self.pilot_required = pilot_required
         self.number_of_tugboats = number_of_tugboats
 
+        # Class of the vessel given its length and draught, see resolve_vessel_class
+        self._resolved_class = None
+
         # Add the rest of the arguments to class attributes
         self.__dict__.update(kwargs)
 
+    def resolve_vessel_class(self, vessel_base_class):
+        """Returns the class of the vessel given its length and actual draught.
+        The class is resolved only once by vessel_base_class.get_vessel_class.
+
+        :param vessel_base_class: the Python base class of vessel classes
+        """
+        if self._resolved_class is None:
+            self._resolved_class = vessel_base_class.get_vessel_class(
+                self.length, self.actual_draught
+            )
+
+        return self._resolved_class
+
     @property
     def tugs_required(self):
         return self.number_of_tugboats > 0
@@ -1,8 +1,4 @@
-from math import acos, degrees
-
-import numpy as np
-from haversine import haversine
-
+from environment.navigation.trace import as_trace_view, turn_angle
 from exceptions import NoPathException, PathTerminatedException
 
 
@@ -16,8 +12,8 @@ class VesselPath:
     def get_path_node_id(self):
         return self.path_idx
 
-    def advance_path(self):
-        self.path_idx += 1
+    def advance_path(self, steps=1):
+        self.path_idx += steps
 
     def get_next_destination(self):
         """Returns the current destination node in the path"""
@@ -25,9 +21,7 @@ class VesselPath:
             raise NoPathException("The path is none")
 
         try:
-            return np.array(
-                [self.path["x"][self.path_idx + 1], self.path["y"][self.path_idx + 1]]
-            )
+            return self.path.point(self.path_idx + 1)
         except Exception as _:
             raise PathTerminatedException("Path terminated")
 
@@ -37,9 +31,7 @@ class VesselPath:
             raise NoPathException("The path is none")
 
         try:
-            return np.array(
-                [self.path["x"][self.path_idx], self.path["y"][self.path_idx]]
-            )
+            return self.path.point(self.path_idx)
         except Exception as _:
             raise PathTerminatedException("Path terminated")
 
@@ -51,7 +43,7 @@ class VesselPath:
             raise NoPathException("The path is none")
 
         try:
-            return self.path["point_sections"][self.path_idx + 1]
+            return self.path.section(self.path_idx + 1)
         except Exception as _:
             raise PathTerminatedException("Path terminated")
 
@@ -61,7 +53,18 @@ class VesselPath:
             raise NoPathException("The path is none")
 
         try:
-            return self.path["point_sections"][self.path_idx]
+            return self.path.section(self.path_idx)
+        except Exception as _:
+            raise NoPathException("Path terminated")
+
+    def get_current_speed_limits(self, vessel_class):
+        """Returns the [min, max] speed limits of a vessel class at the
+        current destination of the path"""
+        if self.path is None:
+            raise NoPathException("The path is none")
+
+        try:
+            return self.path.speed_limits(vessel_class, self.path_idx)
         except Exception as _:
             raise NoPathException("Path terminated")
 
@@ -70,7 +73,7 @@ class VesselPath:
         if self.path is None:
             raise NoPathException("The path is none")
 
-        return self.path["crossed_sections"]
+        return self.path.crossed_sections
 
     def has_current_route(self):
         # If no path is set there is no current route
@@ -90,13 +93,14 @@ class VesselPath:
         if self.path is None:
             raise NoPathException("The path is none")
 
-        return [self.path["x"][0], self.path["y"][0]]
+        return self.path.point(0).tolist()
 
     def set_path(self, path):
         if path is None:
             raise NoPathException("The path is none")
 
-        self.path = path
+        # Paths are stored as (immutable) trace views
+        self.path = as_trace_view(path)
         self.path_idx = 0
 
     def angle(self, window=1):
@@ -106,26 +110,25 @@ class VesselPath:
         """
         current = self.path_idx
 
-        if (current - 1) < window or (current + window - 1) >= len(self.path["y"]):
+        if (current - 1) < window or (current + window - 1) >= len(self.path):
             return 0
-        else:
-            prev = (
-                self.path["y"][current - window - 1],
-                self.path["x"][current - window - 1],
-            )
-            cur = (self.path["y"][current - 1], self.path["x"][current - 1])
-            nex = (
-                self.path["y"][current + window - 1],
-                self.path["x"][current + window - 1],
-            )
-
-            d_B = abs(haversine(cur, prev))
-            d_A = abs(haversine(cur, nex))
-            d_C = abs(haversine(nex, prev))
-
-            if d_B == 0 or d_A == 0:
-                return 0
-
-        return 180 - degrees(
-            acos(round((d_A * d_A + d_B * d_B - d_C * d_C) / (2.0 * d_A * d_B), 5))
+
+        if window == 1:
+            # The angles between consecutive waypoints are precomputed
+            return self.path.turn_angle(current - 1)
+
+        return turn_angle(
+            self.path.point(current - window - 1),
+            self.path.point(current - 1),
+            self.path.point(current + window - 1),
         )
+
+    def remaining_distance(self):
+        """Returns the distance in metres from the current destination
+        to the end of the path, along the path"""
+        if self.path is None:
+            raise NoPathException("The path is none")
+
+        last = len(self.path) - 1
+
+        return self.path.distance(last) - self.path.distance(min(self.path_idx, last))
@@ -0,0 +1,84 @@
+from environment.idle_speeds import IdleSpeeds
+from environment.messaging import MessageBroker
+from environment.navigation import PathFinder
+from environment.navigation.sections import SectionManager
+from environment.run_info import RunInfo
+from log.pilot import PilotEventLogger
+from log.tug import TugEventLogger
+from log.vessel import VesselEventLogger
+from utils.timer import TimerScheduler
+
+
+class SimulationContext:
+    """The services of a simulation run: its clock, message broker, timers,
+    event loggers, idle speeds, sections and path finder.
+
+    The processors, strategies and initializers of a simulation are given
+    its context, so that several simulations can live in the same process.
+    The sections and the path finder (i.e. the loaded traces) are immutable
+    once loaded, and are shared by the contexts created with replicate().
+    """
+
+    __default = None
+
+    @staticmethod
+    def default():
+        """Returns the context made of the default instance of every service,
+        used by the components that are not given a context.
+        """
+        if SimulationContext.__default is None:
+            context = SimulationContext.__new__(SimulationContext)
+
+            context.run_info = RunInfo.get_instance()
+            context.message_broker = MessageBroker.get_instance()
+            context.timer_scheduler = TimerScheduler.get_instance()
+            context.section_manager = SectionManager.get_instance()
+            context.path_finder = PathFinder.get_instance()
+            context.vessel_event_logger = VesselEventLogger.get_instance()
+            context.pilot_event_logger = PilotEventLogger.get_instance()
+            context.tug_event_logger = TugEventLogger.get_instance()
+            context.idle_speeds = IdleSpeeds(context.run_info)
+            context.tug_company_strategy = None
+            context.keep_position_history = True
+
+            SimulationContext.__default = context
+
+        return SimulationContext.__default
+
+    def __init__(self, section_manager=None, path_finder=None):
+        """
+        :param section_manager: the sections of the port (optional)
+        :param path_finder: the path finder of the port (optional), it should
+            use the same section manager
+        """
+        if section_manager is None:
+            section_manager = SectionManager()
+
+        if path_finder is None:
+            path_finder = PathFinder(section_manager)
+
+        self.section_manager = section_manager
+        self.path_finder = path_finder
+
+        self.run_info = RunInfo()
+        self.message_broker = MessageBroker()
+        self.timer_scheduler = TimerScheduler()
+
+        self.vessel_event_logger = VesselEventLogger(self.run_info)
+        self.pilot_event_logger = PilotEventLogger(self.run_info)
+        self.tug_event_logger = TugEventLogger(self.run_info)
+
+        self.idle_speeds = IdleSpeeds(self.run_info)
+
+        # Set by the model, e.g. the DefaultTugCompanyStrategy of the example
+        self.tug_company_strategy = None
+
+        # Whether the Position components of the entities keep their history,
+        # it is only displayed by the graphics
+        self.keep_position_history = True
+
+    def replicate(self):
+        """Returns a new context for another run, sharing the sections and
+        the path finder of this context.
+        """
+        return SimulationContext(self.section_manager, self.path_finder)
@@ -0,0 +1,41 @@
+class IdleSpeeds:
+    """The speeds of the vessels during the idle steps processed at once,
+    see BaseProcessor._process_idle.
+
+    Vessels without a route do not move while idle, but their speed is
+    smoothed in every step. The speed history of a block of idle steps is
+    computed once, by the function set by the vessel movement processor,
+    and shared by the processors reading it, whatever their order.
+    """
+
+    def __init__(self, run_info):
+        """
+        :param run_info: the clock of the simulation
+        """
+        self.run_info = run_info
+
+        # Function f(steps) returning the speed history of the vessels,
+        # set by the VesselMovementProcessor
+        self.compute = None
+
+        self._key = None
+        self._history = {}
+
+    def history(self, steps):
+        """Returns the speeds of the vessels whose speed changes during the
+        next idle steps, starting at the current time
+
+        :param steps: the number of idle steps
+        :return: a dict of the (steps + 1,) arrays of speeds of the vessels by
+            entity id, before each step and after the last one
+        """
+        if self.compute is None:
+            return {}
+
+        key = (self.run_info.timestamp(), steps)
+
+        if key != self._key:
+            self._history = self.compute(steps)
+            self._key = key
+
+        return self._history
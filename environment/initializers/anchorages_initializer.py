@@ -2,6 +2,7 @@ import geojson
 
 from components import AnchorageInfo, Shape
 from components.fsm import AnchorageStateMachine
+from environment.queries import ResourceIndex
 
 
 class AnchoragesInitializer:
@@ -37,4 +38,7 @@ class AnchoragesInitializer:
         self.world.add_component(anchorage, anchorage_info)
         self.world.add_component(anchorage, AnchorageStateMachine())
 
+        # The resource queries must see the new anchorage
+        ResourceIndex.invalidate(self.world)
+
         return anchorage
@@ -3,6 +3,8 @@ import pandas as pd
 
 from components import BerthInfo, Position
 from components.fsm import BerthStateMachine
+from environment.context import SimulationContext
+from environment.queries import ResourceIndex
 
 
 class BerthsInitializer:
@@ -15,8 +17,13 @@ class BerthsInitializer:
         vessel_content_types,
         berth_service_distribution_factory,
         berth_randomized_check_prob=0,
+        context=None,
     ):
+        context = context or SimulationContext.default()
+
         self.world = world
+        self.timer_scheduler = context.timer_scheduler
+        self.keep_position_history = context.keep_position_history
         self.berths_data = pd.read_csv(filename, sep=",")
         self.vessel_content_types = vessel_content_types
         self.berth_service_distribution_factory = berth_service_distribution_factory
@@ -49,10 +56,23 @@ class BerthsInitializer:
             row["terminal"]
         )
 
-        self.world.add_component(berth, Position(lonlat=np.array(position)))
+        self.world.add_component(
+            berth,
+            Position(
+                lonlat=np.array(position), keep_history=self.keep_position_history
+            ),
+        )
         self.world.add_component(berth, berth_info)
         self.world.add_component(
-            berth, BerthStateMachine(sampler, self.berth_randomized_check_prob)
+            berth,
+            BerthStateMachine(
+                sampler,
+                self.berth_randomized_check_prob,
+                timer_scheduler=self.timer_scheduler,
+            ),
         )
 
+        # The resource queries must see the new berth
+        ResourceIndex.invalidate(self.world)
+
         return berth
@@ -1,4 +1,3 @@
-import copy
 import json
 import random
 
@@ -7,9 +6,10 @@ from shapely.geometry import Polygon
 from components import (Course, LocationInfo, LocationType, PilotInfo,
                         Position, Shape, Velocity, VesselPath)
 from components.fsm import PilotStateMachine
-from environment import RunInfo
+from environment.context import SimulationContext
+from environment.queries import ResourceIndex
+from log.events.codes import transition_code
 from log.events.pilot import PilotEvent
-from log.pilot import PilotEventLogger
 from utils import shapes
 
 
@@ -18,8 +18,20 @@ class PilotsInitializer:
 
     DEFAULT_PILOT_SPEED = 10.0
 
-    def __init__(self, world, pilots_locations_filename, num=20):
+    def __init__(self, world, pilots_locations_filename, num=None, context=None):
+        """
+        :param world: Esper world object
+        :param pilots_locations_filename: GeoJSON file of the pilots waiting locations
+        :param num: number of pilots, randomly allocated to the waiting locations.
+            If None the pilots of every company and location are read from the file
+        :param context: the simulation context, defaults to SimulationContext.default()
+        """
+        context = context or SimulationContext.default()
+
         self.world = world
+        self.run_info = context.run_info
+        self.pilot_logger = context.pilot_event_logger
+        self.keep_position_history = context.keep_position_history
         self.pilots_locations_filename = pilots_locations_filename
         self.pilot_num = num
 
@@ -32,7 +44,10 @@ class PilotsInitializer:
         with open(self.pilots_locations_filename) as geo_file:
             geo_data = json.loads(geo_file.read())
 
-            self._create_pilots_geojson(geo_data)
+            if self.pilot_num is None:
+                self._create_pilots_geojson(geo_data)
+            else:
+                self._create_pilots_random_allocation(geo_data)
 
     def _create_pilots_geojson(self, geo_data):
         """For each waiting location in the GeoJSON file
@@ -81,17 +96,13 @@ class PilotsInitializer:
                 )
 
     def _pilot_fsm_transition_callback(self, ent, pilot_info, vel, event):
-        pilot_info_clone = copy.deepcopy(pilot_info)
-
         event = PilotEvent(
-            f"{event.src} → {event.dst}",
-            pilot_info_clone,
-            copy.deepcopy(vel),
-            RunInfo.get_instance().timestamp(),
+            transition_code(event.src, event.dst),
+            vel.velocity,
+            self.run_info.timestamp(),
         )
 
-        pilot_logger = PilotEventLogger.get_instance()
-        pilot_logger.log_event(ent, pilot_info_clone, event)
+        self.pilot_logger.log_event(ent, pilot_info, event)
 
     def _create_pilot(self, polygon, company_name, waiting_location_id):
         """Creates a pilot entity with the required components and adds it to the esper world."""
@@ -107,7 +118,11 @@ class PilotsInitializer:
         )
 
         self.world.add_component(
-            pilot, Position(shapes.random_point_in_polygon(polygon))
+            pilot,
+            Position(
+                shapes.random_point_in_polygon(polygon),
+                keep_history=self.keep_position_history,
+            ),
         )
 
         self.world.add_component(pilot, pilot_velocity)
@@ -132,4 +147,7 @@ class PilotsInitializer:
         )
         self.world.add_component(location, location_info)
 
+        # The resource queries must see the new location
+        ResourceIndex.invalidate(self.world)
+
         return location_info.id
@@ -1,4 +1,3 @@
-import copy
 import json
 import random
 
@@ -7,9 +6,10 @@ from shapely.geometry import Polygon
 from components import (Course, FrameCounter, LocationInfo, LocationType,
                         Position, Shape, TugInfo, Velocity, VesselPath)
 from components.fsm import TugStateMachine
-from environment import RunInfo
+from environment.context import SimulationContext
+from environment.queries import ResourceIndex
+from log.events.codes import transition_code
 from log.events.tug import TugEvent
-from log.tug import TugEventLogger
 from utils import shapes
 
 
@@ -22,6 +22,7 @@ class TugsInitializer:
         tugboats_locations_filename,
         tugs_count=20,
         companies_from_data=False,
+        context=None,
     ):
         """Initializes a tug initializer.
 
@@ -29,8 +30,16 @@ class TugsInitializer:
         be allocated randomly between the waiting locations or the tugs count and allocations
         (along with tug company member vessel) should be retrieved from the data (in the latter
         case, tugs_count is ignored and the number of tugs is retrieved from the GeoJSON file)
+
+        The tug events are logged to the tug event logger of the simulation context
+        (SimulationContext.default() if no context is given).
         """
+        context = context or SimulationContext.default()
+
         self.world = world
+        self.run_info = context.run_info
+        self.tug_logger = context.tug_event_logger
+        self.keep_position_history = context.keep_position_history
         self.tugs_count = tugs_count
         self.tugboats_locations_filename = tugboats_locations_filename
         self.tug_company_names = None
@@ -103,7 +112,13 @@ class TugsInitializer:
         """Creates a tugboat entity with the required components and adds it to the world."""
         tug = self.world.create_entity()
 
-        self.world.add_component(tug, Position(shapes.random_point_in_polygon(polygon)))
+        self.world.add_component(
+            tug,
+            Position(
+                shapes.random_point_in_polygon(polygon),
+                keep_history=self.keep_position_history,
+            ),
+        )
 
         tug_info = TugInfo(company_name=company_name)
         tug_velocity = Velocity(self.DEFAULT_TUG_SPEED)
@@ -138,17 +153,16 @@ class TugsInitializer:
         )
         self.world.add_component(location, location_info)
 
+        # The resource queries must see the new location
+        ResourceIndex.invalidate(self.world)
+
         return location_info.id
 
     def _tug_fsm_transition_callback(self, ent, tug_info, vel, event):
-        cloned_tug_info = copy.deepcopy(tug_info)
-
         event = TugEvent(
-            f"{event.src} → {event.dst}",
-            cloned_tug_info,
-            copy.deepcopy(vel),
-            RunInfo.get_instance().timestamp(),
+            transition_code(event.src, event.dst),
+            vel.velocity,
+            self.run_info.timestamp(),
         )
 
-        tug_logger = TugEventLogger.get_instance()
-        tug_logger.log_event(ent, cloned_tug_info, event)
+        self.tug_logger.log_event(ent, tug_info, event)
@@ -1,39 +1,81 @@
+from .message import SimulationMessage
+
+
 class MessageBroker:
-    """Singleton class that can be used to send messages between entities."""
+    """Class that can be used to send messages between entities.
+
+    The pending messages of each receiver are indexed by message id, in the
+    order they were sent, so that single messages can be removed in constant
+    time and whole queues can be drained at once.
+
+    Status messages, i.e. the ones repeated by an entity at every step, are
+    coalesced: only the latest status of each sender is kept in the queue
+    and a single message object per sender and receiver is reused.
+    """
 
     __instance = None
 
     @staticmethod
     def get_instance():
-        if MessageBroker.__instance == None:
-            MessageBroker()
+        """Returns the default instance, used when no SimulationContext is given"""
+        if MessageBroker.__instance is None:
+            MessageBroker.__instance = MessageBroker()
 
         return MessageBroker.__instance
 
     def __init__(self):
-        """Private constructor."""
-
-        if MessageBroker.__instance != None:
-            raise Exception("This class is a singleton!")
-        else:
-            MessageBroker.__instance = self
-            self._messages = {}
+        self._messages = {}
+        self._status_messages = {}
 
     def send_message(self, message):
         if message.destination not in self._messages:
-            self._messages[message.destination] = []
+            self._messages[message.destination] = {}
 
-        self._messages[message.destination].append(message)
+        self._messages[message.destination][message.id] = message
 
-    def remove_message(self, message_id, destination_queue):
-        filtered_messages = list(
-            filter(lambda x: x.id != message_id, self._messages[destination_queue])
-        )
+    def send_status(self, sender, destination, status, data=None):
+        """Sends the status of an entity, replacing its pending status (if any).
+
+        The delivered message object is reused by the following statuses of
+        the same sender, thus receivers should not keep it after handling it.
 
-        self._messages[destination_queue] = filtered_messages
+        :param sender: the status sender, formatted as in SimulationMessage
+        :param destination: the status receiver
+        :param status: the status message type
+        :param data: extra data attached to the status
+        """
+        message = self._status_messages.get((sender, destination))
+
+        if message is None:
+            message = SimulationMessage(sender, destination, status, data)
+            self._status_messages[(sender, destination)] = message
+        else:
+            message.message = status
+            message.data = data
+
+        # A pending status keeps its position in the queue
+        self.send_message(message)
+
+    def remove_message(self, message_id, destination_queue):
+        self._messages[destination_queue].pop(message_id, None)
 
     def get_messages(self, receiver):
-        return self._messages.get(receiver, [])
+        return list(self._messages.get(receiver, {}).values())
+
+    def has_messages(self, receiver):
+        return len(self._messages.get(receiver, {})) > 0
+
+    def drain(self, receiver):
+        """Returns the pending messages of a receiver, in the order they were
+        sent, and empties its queue. Messages sent while the returned messages
+        are handled are kept for the next drain.
+
+        :param receiver: the destination of the messages
+        """
+        queue = self._messages.pop(receiver, {})
+
+        return queue.values()
 
     def clear(self):
         self._messages = {}
+        self._status_messages = {}
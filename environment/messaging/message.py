@@ -1,4 +1,4 @@
-import uuid
+import itertools
 
 
 class SimulationMessage:
@@ -10,8 +10,13 @@ class SimulationMessage:
     data is a dictionary holding any extra data attached to the message
     """
 
+    __slots__ = ["id", "sender", "message", "destination", "data"]
+
+    # Messages are numbered in the order they are created
+    _ids = itertools.count()
+
     def __init__(self, sender, destination, message, data=None):
-        self.id = str(uuid.uuid4())
+        self.id = next(SimulationMessage._ids)
         self.sender = sender
         self.message = message
         self.destination = destination
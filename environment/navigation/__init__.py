@@ -1 +1,5 @@
 from .path_finder import PathFinder
+from .route_table import RouteTable
+from .trace import CompositePath, Trace, TraceView
+from .trace_cache import TraceCache
+from .trace_loader import TraceLoader
@@ -1,6 +1,4 @@
-import copy
 import json
-import math
 import os
 import random
 from collections import defaultdict
@@ -9,30 +7,133 @@ import geojson
 import numpy as np
 from shapely.geometry import Point
 
+from environment.navigation.route_table import RouteTable
 from environment.navigation.sections import SectionManager
+from environment.navigation.trace import CompositePath, Trace, as_trace_view
+from environment.navigation.trace_loader import TraceLoader
 from exceptions import NoPathException
 
+# Attributes holding the traces loaded from each folder, in the order of the
+# load_traces arguments
+TRACE_GROUPS = (
+    "berth_traces",
+    "ocean_tugs_rv_traces",
+    "ocean_pilots_rv_traces",
+    "pilots_rv_berth_traces",
+    "tugs_rv_berth_traces",
+    "pilots_rv_tugs_rv_traces",
+    "tugs_wl_tugs_rv_traces",
+    "pilots_wl_pilot_rv_traces_dict",
+    "pilots_wl_berth_traces_dict",
+    "ocean_tug_wl_traces",
+)
+
+
+def _group_by_path(paths_coords):
+    """Returns the concatenated waypoints of several paths, the index of the
+    first waypoint of every path and the path of every waypoint"""
+    lengths = np.array([len(coords) for coords in paths_coords])
+
+    assert np.all(lengths > 0), "Paths should have at least one waypoint"
+
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    owners = np.repeat(np.arange(len(lengths)), lengths)
+
+    return np.concatenate(paths_coords), starts, owners
+
+
+def _first_minimum(values, starts, owners):
+    """Returns the index (within its group) of the first minimum of every
+    group of values, the groups start at the given indices"""
+    minimum = np.minimum.reduceat(values, starts)
+    indices = np.arange(len(values))
+    candidates = np.where(values == minimum[owners], indices, len(values))
+
+    return np.minimum.reduceat(candidates, starts) - starts
+
+
+def nearest_waypoints(points, paths_coords):
+    """Returns, for every path, the index of its waypoint closest to a point.
+
+    :param points: the (lon, lat) point of every path
+    :param paths_coords: the (n, 2) waypoints array of every path
+    :return: integer array with the index of the closest waypoint of every
+        path, the first one in case of ties
+    """
+    coords, starts, owners = _group_by_path(paths_coords)
+    points = np.asarray(points, dtype=float).reshape(-1, 2)[owners]
+
+    delta = points - coords
+    distances = np.sqrt(delta[:, 0] * delta[:, 0] + delta[:, 1] * delta[:, 1])
+
+    return _first_minimum(distances, starts, owners)
+
+
+def project_on_paths(points, paths_coords):
+    """Projects points on the closest segment of their paths.
+
+    :param points: the (lon, lat) point of every path
+    :param paths_coords: the (n, 2) waypoints array of every path
+    :return: for every path, the index of its closest segment (from waypoint
+        i to i + 1), the position of the projection along the segment (from 0
+        to 1) and the projected point. Paths with a single waypoint project
+        on it (segment 0, position 0)
+    """
+    coords, starts, owners = _group_by_path(paths_coords)
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    count = len(coords)
+
+    # Segment i goes from waypoint i to the next one, the last waypoint of
+    # every path starts a degenerate segment (of length 0)
+    ends = np.minimum(np.arange(1, count + 1), count - 1)
+    ends[starts[1:] - 1] = starts[1:] - 1
+    ends[-1] = count - 1
+
+    direction = coords[ends] - coords
+    relative = points[owners] - coords
+    squared_lengths = np.einsum("ij,ij->i", direction, direction)
+
+    ratios = np.divide(
+        np.einsum("ij,ij->i", relative, direction),
+        squared_lengths,
+        out=np.zeros(count),
+        where=squared_lengths > 0,
+    )
+    ratios = np.clip(ratios, 0, 1)
+
+    projections = coords + ratios[:, None] * direction
+    offsets = points[owners] - projections
+    distances = np.einsum("ij,ij->i", offsets, offsets)
+
+    segments = _first_minimum(distances, starts, owners)
+    closest = starts + segments
+
+    return segments, ratios[closest], projections[closest]
+
 
 class PathFinder:
-    """Singleton class that handles path finding in the port."""
+    """Class that handles path finding in the port."""
 
     __instance = None
 
     @staticmethod
     def get_instance():
+        """Returns the default instance, used when no SimulationContext is given"""
         if PathFinder.__instance is None:
-            PathFinder()
+            PathFinder.__instance = PathFinder()
 
         return PathFinder.__instance
 
-    def __init__(self):
-        """Private constructor."""
+    def __init__(self, sections_manager=None):
+        """
+        :param sections_manager: the sections of the port, defaults to the
+            default SectionManager instance
+        """
+        if sections_manager is None:
+            sections_manager = SectionManager.get_instance()
 
-        if PathFinder.__instance != None:
-            raise Exception("This class is a singleton!")
-        else:
-            PathFinder.__instance = self
-            self.sections_manager = SectionManager.get_instance()
+        self.sections_manager = sections_manager
+        self.routes = RouteTable()
 
     def load_traces(
         self,
@@ -47,66 +148,24 @@ class PathFinder:
         pilots_wl_berth_traces_folder=None,
         ocean_tug_wl_traces_folder=None,
         ocean_spawn_ids: list = None,
+        cache=None,
+        loader=None,
     ):
         """Replaces the known traces with the ones loaded
         from all GeoJSON files in a given folder. Each
         file might contain multiple traces.
+
+        :param cache: the TraceCache the traces are loaded from, if it is
+            valid, and written to otherwise (optional)
+        :param loader: the TraceLoader that reads the trace files, defaults
+            to a loader with a worker per CPU. Its timings are kept in
+            `load_timings`
         """
         assert (
             ocean_spawn_ids is not None and len(ocean_spawn_ids) > 0
         ), "No ocean spawn IDs provided!"
         self.ocean_spawn_ids = ocean_spawn_ids
 
-        if ocean_tugs_folder is not None:
-            rendezvous_dict, rendezvous = self._extract_traces_from_file(
-                ocean_tugs_folder
-            )
-            self.tugs_rv, self.ocean_tugs_rv_traces = list(rendezvous), rendezvous_dict
-
-        if ocean_pilots_folder is not None:
-            rendezvous_dict, rendezvous = self._extract_traces_from_file(
-                ocean_pilots_folder
-            )
-            self.pilots_rv, self.ocean_pilots_rv_traces = (
-                list(rendezvous),
-                rendezvous_dict,
-            )
-
-        if pilots_rv_berth_traces_folder is not None:
-            self.pilots_rv_berth_traces, _ = self._extract_traces_from_file(
-                pilots_rv_berth_traces_folder
-            )
-
-        if tugs_rv_berth_traces_folder is not None:
-            self.tugs_rv_berth_traces, _ = self._extract_traces_from_file(
-                tugs_rv_berth_traces_folder
-            )
-
-        if pilots_rv_tugs_rv_traces_folder is not None:
-            self.pilots_rv_tugs_rv_traces, _ = self._extract_traces_from_file(
-                pilots_rv_tugs_rv_traces_folder
-            )
-
-        if tugs_wl_tugs_rv_traces_folder is not None:
-            self.tugs_wl_tugs_rv_traces, _ = self._extract_traces_from_file(
-                tugs_wl_tugs_rv_traces_folder
-            )
-
-        if pilots_wl_pilots_rv_traces_folder is not None:
-            self.pilots_wl_pilot_rv_traces_dict, _ = self._extract_traces_from_file(
-                pilots_wl_pilots_rv_traces_folder
-            )
-
-        if pilots_wl_berth_traces_folder is not None:
-            self.pilots_wl_berth_traces_dict, _ = self._extract_traces_from_file(
-                pilots_wl_berth_traces_folder
-            )
-
-        if ocean_tug_wl_traces_folder is not None:
-            self.ocean_tug_wl_traces, _ = self._extract_traces_from_file(
-                ocean_tug_wl_traces_folder
-            )
-
         assert os.path.isdir(
             ocean_berth_folder
         ), f"Ocean -> Berth Traces folder {ocean_berth_folder} does not exist"
@@ -114,63 +173,108 @@ class PathFinder:
             len(os.listdir(ocean_berth_folder)) > 0
         ), f"No traces data in {ocean_berth_folder}"
 
-        traces_dict, berths = self._extract_traces_from_file(ocean_berth_folder)
-
-        self.berths = list(berths)
-        self.berth_traces = traces_dict
-
-    def _get_trace_dict(self, path_json):
-        x, y = [], []
-        point_sections = []
-        waypoints = path_json["geometry"]["coordinates"]
+        folders = {
+            group: folder
+            for group, folder in zip(
+                TRACE_GROUPS,
+                [
+                    ocean_berth_folder,
+                    ocean_tugs_folder,
+                    ocean_pilots_folder,
+                    pilots_rv_berth_traces_folder,
+                    tugs_rv_berth_traces_folder,
+                    pilots_rv_tugs_rv_traces_folder,
+                    tugs_wl_tugs_rv_traces_folder,
+                    pilots_wl_pilots_rv_traces_folder,
+                    pilots_wl_berth_traces_folder,
+                    ocean_tug_wl_traces_folder,
+                ],
+            )
+            if folder is not None
+        }
 
-        for w in waypoints:
-            x.append(w[0])
-            y.append(w[1])
+        section_names = [section.name for section in self.sections_manager.sections]
+        groups = cache.load(section_names) if cache is not None else None
+        self.load_timings = {}
 
-            point_sections.append(self.sections_manager.section_for_point(w))
+        if groups is None:
+            loader = loader or TraceLoader()
+            groups = {
+                group: self._classify_traces(traces)
+                for group, traces in loader.load(folders).items()
+            }
+            self.load_timings = loader.timings
+
+            if cache is not None:
+                cache.store(groups, section_names)
+
+        for group, (routes, destinations) in groups.items():
+            setattr(self, group, self._build_traces(routes))
+
+            if group == "ocean_tugs_rv_traces":
+                self.tugs_rv = list(destinations)
+            elif group == "ocean_pilots_rv_traces":
+                self.pilots_rv = list(destinations)
+            elif group == "berth_traces":
+                self.berths = list(destinations)
+
+        self.routes = RouteTable(
+            [
+                getattr(self, group)
+                for group in TRACE_GROUPS
+                if getattr(self, group, None) is not None
+            ]
+        )
 
-        # Extract the unique sections that this path crosses
-        crossed_sections = set(point_sections)
-        # Remove the non-section entries (e.g. Ocean, open-sea)
-        crossed_sections.discard(None)
+    def _build_traces(self, routes):
+        """Creates the traces of the routes read by _classify_traces"""
+        # The ocean index (-1) selects the last entry
+        sections = [
+            *self.sections_manager.sections,
+            self.sections_manager.ocean_section,
+        ]
 
         return {
-            "x": x,
-            "y": y,
-            "point_sections": point_sections,
-            "crossed_sections": crossed_sections,
+            route_id: [
+                Trace(coords, [sections[index] for index in point_sections.tolist()])
+                for coords, point_sections in traces
+            ]
+            for route_id, traces in routes.items()
         }
 
-    def _extract_traces_from_file(self, traces_folder, origin_name="ocean"):
-        assert os.path.isdir(traces_folder), f"{traces_folder} does not exist"
-        assert len(os.listdir(traces_folder)) > 0, f"No traces data in {traces_folder}"
+    def _classify_traces(self, traces, origin_name="ocean"):
+        """Classifies the waypoints of the traces read by the TraceLoader.
 
-        traces_files = os.listdir(traces_folder)
-        traces_dict = {}
+        :return: the routes, mapping each "origin-destination" route id to the
+            list of (coords, section indices) of its traces, and the set of
+            destinations reached from the ocean
+        """
+        routes = {}
         destinations = set()
 
-        for file in traces_files:
-            trace_data = self._get_geojson_data(f"{traces_folder}/{file}")
+        if len(traces) == 0:
+            return routes, destinations
 
-            for feature in trace_data["features"]:
-                origin = feature["properties"]["origin"]
-                destination = feature["properties"]["destination"]
-
-                if origin_name in origin:
-                    destinations.add(destination)
+        # Classify all the waypoints of the folder in a single query
+        lengths = [len(waypoints) for _, _, waypoints in traces]
+        point_sections = np.split(
+            self.sections_manager.section_indices_for_points(
+                np.concatenate([waypoints for _, _, waypoints in traces])
+            ),
+            np.cumsum(lengths)[:-1],
+        )
 
-                trace_id = f"{origin}-{destination}"
-                trace_dict = self._get_trace_dict(feature)
+        for (origin, destination, waypoints), sections in zip(traces, point_sections):
+            if origin_name in origin:
+                destinations.add(destination)
 
-                if trace_id in traces_dict:
-                    # Append to the list of the ocean-berth:id traces if other
-                    # traces for that route exist
-                    traces_dict[f"{origin}-{destination}"].append(trace_dict)
-                else:
-                    traces_dict[f"{origin}-{destination}"] = [trace_dict]
+            # Append to the list of the ocean-berth:id traces if other
+            # traces for that route exist
+            routes.setdefault(f"{origin}-{destination}", []).append(
+                (waypoints, sections)
+            )
 
-        return traces_dict, destinations
+        return routes, destinations
 
     def load_tugs_rendezvous_locations(self, path):
         tugs_rendezvous_mapping = {}
@@ -238,24 +342,9 @@ class PathFinder:
 
         ocean_id = random.choice(self.ocean_spawn_ids)
 
-        trace_ids = self._ocean_tug_rendezvous_trace_ids(ocean_id, rendezvous_id)
-        paths = []
-
-        for trace_id in trace_ids:
-            if trace_id in self.ocean_tugs_rv_traces:
-                paths.extend(self.ocean_tugs_rv_traces[trace_id])
-
-        if len(paths) == 0:
-            raise NoPathException(f"There does not exist a {trace_id} trace")
-
-        # Create a copy of the original path
-        paths = [copy.deepcopy(p) for p in paths]
-
-        # Add the vessel position as the origin. This creates an additional
-        # straight line between the vessel position and the path origin
-        if vessel_position is not None:
-            for path in paths:
-                self.prefix_path(vessel_position, path)
+        paths = self._route_paths(
+            ("ocean", ocean_id), ("tug_rendezvous", rendezvous_id), vessel_position
+        )
 
         return paths, rendezvous_id
 
@@ -273,24 +362,9 @@ class PathFinder:
             self.pilots_arrival_rendezvous_mapping[vessel_class]
         )
 
-        trace_ids = self._ocean_pilot_rendezvous_trace_ids(ocean_id, rendezvous_id)
-        paths = []
-
-        for trace_id in trace_ids:
-            if trace_id in self.ocean_pilots_rv_traces:
-                paths.extend(self.ocean_pilots_rv_traces[trace_id])
-
-        if len(paths) == 0:
-            raise NoPathException(f"There does not exist a {trace_id} trace")
-
-        # Create a copy of the original path
-        paths = [copy.deepcopy(p) for p in paths]
-
-        # Add the vessel position as the origin. This creates an additional
-        # straight line between the vessel position and the path origin
-        if vessel_position is not None:
-            for path in paths:
-                self.prefix_path(vessel_position, path)
+        paths = self._route_paths(
+            ("ocean", ocean_id), ("pilot_rendezvous", rendezvous_id), vessel_position
+        )
 
         return paths, rendezvous_id
 
@@ -310,26 +384,9 @@ class PathFinder:
         rendezvous_info = self.tugs_rendezvous_mapping[str(final_section)]
         rendezvous_id = rendezvous_info[1]
 
-        trace_ids = self._tug_rendezvous_berth_trace_ids(rendezvous_id, berth_id)
-        paths = []
-
-        for trace_id in trace_ids:
-            if trace_id in self.tugs_rv_berth_traces:
-                paths.extend(self.tugs_rv_berth_traces[trace_id])
-
-        if len(paths) == 0:
-            raise NoPathException(
-                f"There does not exist a tug rendezvous {rendezvous_id} -> berth {berth_id} trace"
-            )
-
-        # Create a copy of the original paths
-        paths = [copy.deepcopy(p) for p in paths]
-
-        # Add the vessel position as the origin. This creates an additional
-        # straight line between the vessel position and the path origin
-        if vessel_position is not None:
-            for path in paths:
-                self.prefix_path(vessel_position, path)
+        paths = self._route_paths(
+            ("tug_rendezvous", rendezvous_id), ("berth", berth_id), vessel_position
+        )
 
         return paths, rendezvous_id
 
@@ -354,28 +411,29 @@ class PathFinder:
             self.pilots_arrival_rendezvous_mapping[vessel_class]
         )
 
-        trace_ids = self._pilot_rendezvous_berth_trace_ids(rendezvous_id, berth_id)
-        paths = []
+        return self._route_paths(
+            ("pilot_rendezvous", rendezvous_id), ("berth", berth_id), vessel_position
+        )
 
-        for trace_id in trace_ids:
-            if trace_id in self.pilots_rv_berth_traces:
-                paths.extend(self.pilots_rv_berth_traces[trace_id])
+    def ocean_berth_routes(self, berth_ids):
+        """Returns the paths from the ocean to several berths in one call.
 
-        if len(paths) == 0:
-            raise NoPathException(
-                f"There does not exist a pilot rendezvous -> {berth_id} trace"
-            )
+        :param berth_ids: the ids of the candidate berths
+        :return: dictionary mapping the id of every berth reachable from the
+            ocean to the (tuple of the) views of its paths
+        """
+        routes = {}
 
-        # Create a copy of the original paths
-        paths = [copy.deepcopy(p) for p in paths]
+        # FIXME: fix this as now it sort of means that vessels coming
+        #        from specific places go to specific berths
+        for ocean_id in self.ocean_spawn_ids:
+            berths = [("berth", berth_id) for berth_id in berth_ids]
+            ocean_routes = self.routes.routes_for(("ocean", ocean_id), berths)
 
-        # Add the vessel position as the origin. This creates an additional
-        # straight line between the vessel position and the path origin
-        if vessel_position is not None:
-            for path in paths:
-                self.prefix_path(vessel_position, path)
+            for (_, berth_id), paths in ocean_routes.items():
+                routes.setdefault(berth_id, paths)
 
-        return paths
+        return routes
 
     def ocean_berth_paths(self, vessel_position=None, berth_id=None):
         """Computes a path from the ocean to a berth.
@@ -385,44 +443,19 @@ class PathFinder:
         """
         assert berth_id is not None, "A berth id is required!"
 
-        trace_ids = []
-
-        # FIXME: fix this as now it sort of means that vessels coming
-        #        from specific places go to specific berths
-        for ocean_id in self.ocean_spawn_ids:
-            trace_id = self._ocean_id_berth_trace_ids(ocean_id, berth_id)
-            trace_ids.extend(trace_id)
-
-        paths = []
-
-        for trace_id in trace_ids:
-            if trace_id in self.berth_traces:
-                paths = self.berth_traces[trace_id]
+        paths = self.ocean_berth_routes([berth_id]).get(berth_id)
 
-                # FIXME: Unclear (this checks if it's a berth -> ocean path)
-                if trace_id == trace_ids[1]:
-                    reversed_paths = []
-
-                    for p in paths:
-                        reversed_paths.append(self.reverse_path(p))
-
-                    paths = reversed_paths
-
-                break
-
-        if len(paths) == 0:
-            raise ValueError(f"There does not exist a {trace_id} trace")
-
-        # Create a copy of the original path
-        paths = [copy.deepcopy(p) for p in paths]
+        if paths is None:
+            raise NoPathException(
+                f"There does not exist an ocean -> berth:{berth_id} trace"
+            )
 
         # Add the vessel position as the origin. This creates an additional
         # straight line between the vessel position and the path origin
         if vessel_position is not None:
-            for path in paths:
-                self.prefix_path(vessel_position, path)
+            return [self.prefix_path(vessel_position, path) for path in paths]
 
-        return paths
+        return list(paths)
 
     def pilot_rendezvous_tug_rendezvous_paths(self, pilot_rv_id, tug_rv_id):
         """Computes a path from the ocean to a tug rendezvous.
@@ -433,53 +466,28 @@ class PathFinder:
         assert pilot_rv_id is not None, "Pilot rendezvous id is required!"
         assert tug_rv_id is not None, "Tug rendezvous id is required!"
 
-        trace_ids = self._pilot_rendezvous_tug_rendezvous_trace_ids(
-            pilot_rv_id, tug_rv_id
+        return self._route_paths(
+            ("pilot_rendezvous", pilot_rv_id), ("tug_rendezvous", tug_rv_id)
         )
-        paths = []
-
-        for trace_id in trace_ids:
-            if trace_id in self.pilots_rv_tugs_rv_traces:
-                paths.extend(self.pilots_rv_tugs_rv_traces[trace_id])
-
-        if len(paths) == 0:
-            raise NoPathException(f"There does not exist a {trace_id} trace")
-
-        # Create a copy of the original path
-        paths = [copy.deepcopy(p) for p in paths]
-
-        return paths
 
     def prefix_path(self, point: list, path):
-        """Prefix a given path with a point"""
-        path["x"] = [point[0]] + path["x"]
-        path["y"] = [point[1]] + path["y"]
-
-        path["point_sections"] = [self.sections_manager.ocean_section] + path[
-            "point_sections"
-        ]
+        """Returns a view of the given path prefixed with a point"""
+        return as_trace_view(path).with_prefix(
+            point, self.sections_manager.ocean_section
+        )
 
     def anchorage_path(self, vessel_position: list, anchorage_center: Point):
         # FIXME: this generates a straight mock path
-        return {
-            "x": [vessel_position[0], anchorage_center.x],
-            "y": [vessel_position[1], anchorage_center.y],
+        return Trace(
+            [vessel_position[:2], [anchorage_center.x, anchorage_center.y]],
             # FIXME: The second section should be anchorage x?
-            "point_sections": [self.sections_manager.ocean_section] * 2,
-        }
+            [self.sections_manager.ocean_section] * 2,
+        ).view()
 
     def tugs_ocean_waiting_location_path(self, tug_position: list, waiting_location_id):
-        trace = random.choice(
-            self.ocean_tug_wl_traces[
-                f"ocean-tug_waiting_location:{waiting_location_id}"
-            ]
+        return self._random_route_path(
+            ("ocean",), ("tug_waiting_location", waiting_location_id), tug_position
         )
-        trace = copy.deepcopy(trace)
-
-        if tug_position is not None:
-            self.prefix_path(tug_position, trace)
-
-        return trace
 
     def tugs_current_location_waiting_location_path(
         self, tug_position: list, waiting_location_id
@@ -487,45 +495,33 @@ class PathFinder:
         paths = []
 
         for ocean_id in self.ocean_spawn_ids:
-            trace_id = f"ocean:{ocean_id}-tug_waiting_location:{waiting_location_id}"
-            if trace_id in self.ocean_tug_wl_traces:
-                paths.extend(self.ocean_tug_wl_traces[trace_id])
+            paths.extend(
+                self.routes.paths(
+                    ("ocean", ocean_id), ("tug_waiting_location", waiting_location_id)
+                )
+            )
 
-        try:
-            trace = random.choice(paths)
-        except KeyError:
+        if len(paths) == 0:
             raise NoPathException(
                 f"There does not exist an ocean -> tug waiting location {waiting_location_id} trace"
             )
 
-        trace = copy.deepcopy(trace)
+        trace = random.choice(paths)
 
         trace = self.trim_trace_to_current_position(tug_position, trace)
 
-        self.prefix_path(tug_position, trace)
+        trace = self.prefix_path(tug_position, trace)
 
         return trace
 
     def tugs_waiting_location_rendezvous_path(
         self, tug_position: list, waiting_location_id, rendezvous_id
     ):
-        try:
-            trace = random.choice(
-                self.tugs_wl_tugs_rv_traces[
-                    f"tug_waiting_location:{waiting_location_id}-tug_rendezvous:{rendezvous_id}"
-                ]
-            )
-        except KeyError:
-            raise NoPathException(
-                f"There does not exist a waiting location {waiting_location_id} -> rendezvous {rendezvous_id} trace"
-            )
-
-        trace = copy.deepcopy(trace)
-
-        if tug_position is not None:
-            self.prefix_path(tug_position, trace)
-
-        return trace
+        return self._random_route_path(
+            ("tug_waiting_location", waiting_location_id),
+            ("tug_rendezvous", rendezvous_id),
+            tug_position,
+        )
 
     def tugs_berth_waiting_location_path(
         self, tug_position: list, berth_info, waiting_location_id
@@ -549,106 +545,77 @@ class PathFinder:
     def pilot_rendezvous_pilot_waiting_location_path(
         self, pilot_position: list, rendezvous_id, waiting_location_id
     ):
-        trace = random.choice(
-            self.pilots_wl_pilot_rv_traces_dict[
-                f"pilot_waiting_location:{waiting_location_id}-pilot_rendezvous:{rendezvous_id}"
-            ]
+        return self._random_route_path(
+            ("pilot_rendezvous", rendezvous_id),
+            ("pilot_waiting_location", waiting_location_id),
+            pilot_position,
         )
-        trace = copy.deepcopy(trace)
-
-        trace = self.reverse_path(trace)
-
-        if pilot_position is not None:
-            self.prefix_path(pilot_position, trace)
-
-        return trace
 
     def pilot_waiting_location_pilot_rendezvous_path(
         self, pilot_position: list, rendezvous_id, waiting_location_id
     ):
-        trace = random.choice(
-            self.pilots_wl_pilot_rv_traces_dict[
-                f"pilot_waiting_location:{waiting_location_id}-pilot_rendezvous:{rendezvous_id}"
-            ]
+        return self._random_route_path(
+            ("pilot_waiting_location", waiting_location_id),
+            ("pilot_rendezvous", rendezvous_id),
+            pilot_position,
         )
-        trace = copy.deepcopy(trace)
-
-        if pilot_position is not None:
-            self.prefix_path(pilot_position, trace)
-
-        return trace
 
     def pilot_waiting_location_berth_path(
         self, pilot_position: list, berth_id, waiting_location_id
     ):
-        trace = random.choice(
-            self.pilots_wl_berth_traces_dict[
-                f"pilot_waiting_location:{waiting_location_id}-berth:{berth_id}"
-            ]
+        return self._random_route_path(
+            ("pilot_waiting_location", waiting_location_id),
+            ("berth", berth_id),
+            pilot_position,
         )
-        trace = copy.deepcopy(trace)
-
-        if pilot_position is not None:
-            self.prefix_path(pilot_position, trace)
-
-        return trace
 
     def berth_pilot_waiting_location_path(
         self, pilot_position: list, berth_id, waiting_location_id
     ):
-        trace = random.choice(
-            self.pilots_wl_berth_traces_dict[
-                f"pilot_waiting_location:{waiting_location_id}-berth:{berth_id}"
-            ]
+        return self._random_route_path(
+            ("berth", berth_id),
+            ("pilot_waiting_location", waiting_location_id),
+            pilot_position,
         )
-        trace = copy.deepcopy(trace)
-
-        trace = self.reverse_path(trace)
-
-        if pilot_position is not None:
-            self.prefix_path(pilot_position, trace)
-
-        return trace
 
     def merge_paths(self, a, b):
-        return {
-            "x": a["x"] + b["x"],
-            "y": a["y"] + b["y"],
-            "point_sections": a["point_sections"] + b["point_sections"],
-        }
+        """Returns a path that follows path a and then path b, without copying them"""
+        return CompositePath([a, b])
 
     def reverse_path(self, path):
-        temp_path = copy.deepcopy(path)
-
-        temp_path["x"] = list(reversed(temp_path["x"]))
-        temp_path["y"] = list(reversed(temp_path["y"]))
-        temp_path["point_sections"] = list(reversed(temp_path["point_sections"]))
+        """Returns a view of the given path in the opposite direction"""
+        return as_trace_view(path).reversed()
 
-        return temp_path
+    def _random_route_path(self, origin, destination, position=None):
+        """Returns the view of a random path of a route, prefixed with the
+        position if it is specified"""
+        path = random.choice(self._route_paths(origin, destination))
 
-    def _ocean_berth_trace_ids(self, berth_id):
-        return [f"ocean-berth:{berth_id}", f"berth:{berth_id}-ocean"]
+        if position is not None:
+            path = self.prefix_path(position, path)
 
-    def _ocean_id_berth_trace_ids(self, ocean_id, berth_id):
-        return [
-            f"ocean:{ocean_id}-berth:{berth_id}",
-            f"berth:{berth_id}-ocean:{ocean_id}",
-        ]
+        return path
 
-    def _ocean_tug_rendezvous_trace_ids(self, ocean_id, rendezvous_id):
-        return [f"ocean:{ocean_id}-tug_rendezvous:{rendezvous_id}"]
+    def _route_paths(self, origin, destination, position=None):
+        """Returns the views of the paths of a route, see RouteTable.paths.
 
-    def _ocean_pilot_rendezvous_trace_ids(self, ocean_id, rendezvous_id):
-        return [f"ocean:{ocean_id}-pilot_rendezvous:{rendezvous_id}"]
+        If the position is specified it is connected to the
+        first node of every path.
+        """
+        paths = self.routes.paths(origin, destination)
 
-    def _pilot_rendezvous_tug_rendezvous_trace_ids(self, pilot_rv_id, tug_rv_id):
-        return [f"pilot_rendezvous:{pilot_rv_id}-tug_rendezvous:{tug_rv_id}"]
+        if len(paths) == 0:
+            raise NoPathException(
+                f"There does not exist a {':'.join(map(str, origin))} -> "
+                f"{':'.join(map(str, destination))} trace"
+            )
 
-    def _pilot_rendezvous_berth_trace_ids(self, pilot_rv_id, berth_id):
-        return [f"pilot_rendezvous:{pilot_rv_id}-berth:{berth_id}"]
+        # Add the position as the origin. This creates an additional
+        # straight line between the position and the path origin
+        if position is not None:
+            return [self.prefix_path(position, path) for path in paths]
 
-    def _tug_rendezvous_berth_trace_ids(self, rendezvous_id, berth_id):
-        return [f"tug_rendezvous:{rendezvous_id}-berth:{berth_id}"]
+        return list(paths)
 
     def _get_geojson_data(self, path):
         geo_file = open(path, "r")
@@ -685,36 +652,59 @@ class PathFinder:
         self.pilots_wl_pilot_rv_traces_dict = None
         self.pilots_wl_berth_traces_dict = None
         self.ocean_tug_wl_traces = None
+        self.routes = RouteTable()
 
         self.ocean_spawn_ids = None
 
-    def trim_trace_to_current_position(self, vessel_position, trace):
-        distances = []
+    def trim_trace_to_current_position(self, vessel_position, trace, project=False):
+        """Returns a view of the trace starting from its waypoint
+        closest to the given position, see trim_traces_to_current_positions"""
+        return self.trim_traces_to_current_positions(
+            [vessel_position], [trace], project=project
+        )[0]
+
+    def trim_traces_to_current_positions(self, positions, traces, project=False):
+        """Trims several traces (e.g. of several tugs) at once.
+
+        :param positions: the (lon, lat) position of each trace
+        :param traces: the traces (or views) to trim
+        :param project: if False every trace starts from its waypoint closest
+            to its position. If True the position is projected on the closest
+            segment of the trace, which then starts from the projected point
+        :return: the list of the trimmed views, their waypoints are not copied
+        """
+        views = [as_trace_view(trace) for trace in traces]
+        paths_coords = [view.coords for view in views]
 
-        xs = trace["x"]
-        ys = trace["y"]
+        if not project:
+            starts = nearest_waypoints(positions, paths_coords)
 
-        # Compute euclidean distance to each point
-        for x, y in zip(xs, ys):
-            distance = math.sqrt(
-                math.pow(vessel_position[0] - x, 2)
-                + math.pow(vessel_position[1] - y, 2)
-            )
-            distances.append(distance)
+            return [view.tail(int(start)) for view, start in zip(views, starts)]
 
-        # Return min distance id
-        idx = np.where(distances == np.amin(distances))[0][0]
+        trimmed = []
+        segments, ratios, projections = project_on_paths(positions, paths_coords)
 
-        trace["x"] = trace["x"][idx:]
-        trace["y"] = trace["y"][idx:]
-        trace["point_sections"] = trace["point_sections"][idx:]
+        for view, segment, ratio, projection in zip(
+            views, segments, ratios, projections
+        ):
+            segment = int(segment)
 
-        return trace
+            if ratio <= 0:
+                trimmed.append(view.tail(segment))
+            elif ratio >= 1:
+                trimmed.append(view.tail(segment + 1))
+            else:
+                view = view.tail(segment + 1).with_prefix(
+                    projection, view.section(segment)
+                )
+                trimmed.append(view)
+
+        return trimmed
 
     def path_to_geojson(self, path, output_filename):
         out_coords = []
 
-        for x, y in zip(path["x"], path["y"]):
+        for x, y in as_trace_view(path).coords.tolist():
             out_coords.append([x, y])
 
         with open(output_filename, "w") as out_file:
@@ -0,0 +1,104 @@
+def endpoint(kind, location_id=None):
+    """Returns the key of a route endpoint, e.g. endpoint("berth", 3)
+
+    :param kind: the kind of location, e.g. "ocean", "berth" or "tug_rendezvous"
+    :param location_id: the id of the location, None for locations without an
+        id (e.g. the generic "ocean" endpoint of some traces)
+    """
+    return kind, None if location_id is None else str(location_id)
+
+
+def parse_endpoint(name):
+    """Parses an endpoint of a trace id, e.g. "berth:3" -> ("berth", "3")"""
+    kind, separator, location_id = name.partition(":")
+
+    return endpoint(kind, location_id if separator else None)
+
+
+def parse_route_id(route_id):
+    """Parses a trace id, e.g. "ocean:1-berth:3" -> (("ocean", "1"), ("berth", "3"))"""
+    origin, separator, destination = route_id.partition("-")
+
+    assert separator and "-" not in destination, f"Invalid route id {route_id}"
+
+    return parse_endpoint(origin), parse_endpoint(destination)
+
+
+class RouteTable:
+    """Table of the routes between the locations of the port.
+
+    The routes are keyed by (origin kind, origin id, destination kind,
+    destination id) tuples, see endpoint(), and map to the views of their
+    traces. Every route can also be followed in the opposite direction: if
+    no trace exists from B to A, the traces from A to B are registered,
+    reversed, as the B -> A route when the table is built.
+    """
+
+    def __init__(self, traces_dicts=()):
+        """
+        :param traces_dicts: the dictionaries mapping each trace id (e.g.
+            "ocean:1-berth:3") to the list of its traces, as loaded by the
+            path finder
+        """
+        routes = {}
+
+        for traces_dict in traces_dicts:
+            for route_id, traces in traces_dict.items():
+                (origin_kind, origin_id), (destination_kind, destination_id) = (
+                    parse_route_id(route_id)
+                )
+                key = (origin_kind, origin_id, destination_kind, destination_id)
+
+                routes.setdefault(key, []).extend(trace.view() for trace in traces)
+
+        self._routes = {key: tuple(views) for key, views in routes.items()}
+
+        # Resolve the reverse routes once, instead of on every query
+        for key, views in routes.items():
+            origin_kind, origin_id, destination_kind, destination_id = key
+            reverse_key = (destination_kind, destination_id, origin_kind, origin_id)
+
+            if reverse_key not in routes:
+                self._routes[reverse_key] = tuple(view.reversed() for view in views)
+
+    def __len__(self):
+        return len(self._routes)
+
+    def __contains__(self, key):
+        return key in self._routes
+
+    def paths(self, origin, destination):
+        """Returns the trace views of the route between two endpoints
+
+        :param origin: the origin endpoint, e.g. ("ocean", 1)
+        :param destination: the destination endpoint, e.g. ("berth", 3)
+        :return: tuple of the views of the route, empty if there is no route
+        """
+        origin_kind, origin_id = endpoint(*origin)
+        destination_kind, destination_id = endpoint(*destination)
+
+        return self._routes.get(
+            (origin_kind, origin_id, destination_kind, destination_id), ()
+        )
+
+    def routes_for(self, origin, destinations):
+        """Returns the routes from an origin to several destinations at once
+
+        :param origin: the origin endpoint, e.g. ("ocean", 1)
+        :param destinations: the candidate destination endpoints
+        :return: dictionary mapping each destination with at least one
+            route to the views of its route, in the order of the destinations
+        """
+        origin_kind, origin_id = endpoint(*origin)
+        routes = {}
+
+        for destination in destinations:
+            destination_kind, destination_id = endpoint(*destination)
+            views = self._routes.get(
+                (origin_kind, origin_id, destination_kind, destination_id)
+            )
+
+            if views:
+                routes[destination] = views
+
+        return routes
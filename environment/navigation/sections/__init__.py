@@ -1,2 +1,2 @@
-from .manager import SectionManager
+from .manager import OCEAN_SECTION_INDEX, SectionManager
 from .section import Section
@@ -1,36 +1,38 @@
 import json
 import math
 
-from shapely.geometry import Point, Polygon
+import numpy as np
+import shapely
+from shapely import STRtree
+from shapely.geometry import Polygon
 
 from exceptions import NoSectionException
 
 from .section import Section
 
+# Index returned by the batched lookups for points that do not belong to any section
+OCEAN_SECTION_INDEX = -1
+
 
 class SectionManager:
-    """Singleton class that handles the creation and retrieval of section in the port"""
+    """Class that handles the creation and retrieval of section in the port"""
 
     __instance = None
 
     @staticmethod
     def get_instance():
+        """Returns the default instance, used when no SimulationContext is given"""
         if SectionManager.__instance is None:
-            SectionManager()
+            SectionManager.__instance = SectionManager()
 
         return SectionManager.__instance
 
     def __init__(self):
-        """Private constructor."""
-
-        if SectionManager.__instance != None:
-            raise Exception("This class is a singleton!")
-        else:
-            SectionManager.__instance = self
-            self.sections = []
-            self.ocean_section = Section(
-                name="ocean", shape=None, is_ocean=True, vessel_speeds=None
-            )
+        self.sections = []
+        self._spatial_index = None
+        self.ocean_section = Section(
+            name="ocean", shape=None, is_ocean=True, vessel_speeds=None
+        )
 
     def create_sections(
         self,
@@ -49,6 +51,7 @@ class SectionManager:
             )
 
         self.sections = sections
+        self._build_spatial_index()
 
     def _create_section(self, section_json, default_vessel_speed, vessel_classes):
         properties = section_json["properties"]
@@ -72,14 +75,54 @@ class SectionManager:
 
         return vessel_speeds
 
-    def section_for_point(self, in_point):
-        point = Point(in_point[0], in_point[1])
+    def _build_spatial_index(self):
+        """Builds an STRtree over the (prepared) section polygons."""
+        shapes = [section.shape for section in self.sections]
+        shapely.prepare(shapes)
 
-        for section in self.sections:
-            if section.shape.contains(point):
-                return section
+        self._spatial_index = STRtree(shapes)
+
+    def section_indices_for_points(self, points):
+        """Classifies a batch of points against the port sections.
+
+        :param points: array-like of shape (n, 2) with [lon, lat] rows.
+        :return: integer numpy array of length n holding, for each point, the index
+                 of its section in `self.sections` or OCEAN_SECTION_INDEX if the
+                 point does not belong to any section.
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        indices = np.full(len(points), OCEAN_SECTION_INDEX, dtype=np.int64)
 
-        return self.ocean_section
+        if len(points) == 0 or len(self.sections) == 0:
+            return indices
+
+        if self._spatial_index is None:
+            self._build_spatial_index()
+
+        point_ids, section_ids = self._spatial_index.query(
+            shapely.points(points), predicate="within"
+        )
+
+        # Sections may overlap: keep the first section (in file order) that
+        # contains the point, like a linear scan over the sections would
+        order = np.lexsort((section_ids, point_ids))
+        point_ids, section_ids = point_ids[order], section_ids[order]
+        first = np.ones(len(point_ids), dtype=bool)
+        first[1:] = point_ids[1:] != point_ids[:-1]
+
+        indices[point_ids[first]] = section_ids[first]
+
+        return indices
+
+    def sections_for_points(self, points):
+        """Returns the list of sections the given points (array of [lon, lat]) belong to."""
+        return [
+            self.ocean_section if idx == OCEAN_SECTION_INDEX else self.sections[idx]
+            for idx in self.section_indices_for_points(points)
+        ]
+
+    def section_for_point(self, in_point):
+        return self.sections_for_points([in_point[:2]])[0]
 
     def get_section(self, section_name):
         if section_name == self.ocean_section.name:
@@ -93,3 +136,4 @@ class SectionManager:
 
     def clear(self):
         self.sections = []
+        self._spatial_index = None
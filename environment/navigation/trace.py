@@ -0,0 +1,603 @@
+from bisect import bisect_right
+from itertools import accumulate
+from math import acos, degrees
+
+import numpy as np
+from haversine import Unit, haversine, haversine_vector
+
+
+def turn_angle(prev, cur, nex):
+    """Returns the positive turn angle (degrees) of a path at the waypoint
+    cur, given its previous and next (lon, lat) waypoints. The angle is 0 if
+    the path goes straight on and 90 if it turns left or right.
+    """
+    prev = tuple(prev[::-1])
+    cur = tuple(cur[::-1])
+    nex = tuple(nex[::-1])
+
+    d_B = abs(haversine(cur, prev))
+    d_A = abs(haversine(cur, nex))
+    d_C = abs(haversine(nex, prev))
+
+    if d_B == 0 or d_A == 0:
+        return 0
+
+    return 180 - degrees(
+        acos(round((d_A * d_A + d_B * d_B - d_C * d_C) / (2.0 * d_A * d_B), 5))
+    )
+
+
+def geodesic_distance(a, b):
+    """Returns the distance in metres between two (lon, lat) points"""
+    return haversine((a[1], a[0]), (b[1], b[0]), unit=Unit.METERS)
+
+
+class Trace:
+    """Immutable, array-backed trace loaded by the path finder.
+
+    The waypoints are stored as a read-only (n, 2) array of lon/lat
+    coordinates, together with the section of every waypoint and the
+    set of sections crossed by the trace. A trace is shared by all the
+    paths built on top of it, so it must never be modified.
+    """
+
+    __slots__ = (
+        "coords",
+        "point_sections",
+        "crossed_sections",
+        "_turn_angles",
+        "_distances",
+        "_speed_limits",
+    )
+
+    def __init__(self, coords, point_sections, crossed_sections=None):
+        """
+        :param coords: the (lon, lat) waypoints of the trace
+        :param point_sections: the section of each waypoint
+        :param crossed_sections: the sections crossed by the trace. If
+            not specified they are extracted from the point sections
+        """
+        coords = np.asarray(coords, dtype=float).reshape(-1, 2)
+
+        # Read-only arrays (e.g. memory mapped from the traces cache) are
+        # shared as they are, the others are copied
+        if coords.flags.writeable:
+            coords = coords.copy()
+            coords.flags.writeable = False
+
+        assert len(point_sections) == len(
+            coords
+        ), "Each waypoint of the trace requires a section!"
+
+        if crossed_sections is None:
+            # Remove the non-section entries (e.g. Ocean, open-sea)
+            crossed_sections = set(point_sections)
+            crossed_sections.discard(None)
+
+        self.coords = coords
+        self.point_sections = tuple(point_sections)
+        self.crossed_sections = frozenset(crossed_sections)
+        self._turn_angles = None
+        self._distances = None
+        self._speed_limits = {}
+
+    @property
+    def turn_angles(self):
+        """The turn angle (degrees) at every waypoint, see turn_angle. The
+        angle is the same in both directions, and 0 at the first and last
+        waypoints. Computed once, the first time it is used.
+        """
+        if self._turn_angles is None:
+            angles = np.zeros(len(self.coords))
+
+            if len(self.coords) > 2:
+                latlon = self.coords[:, ::-1]
+                prev, cur, nex = latlon[:-2], latlon[1:-1], latlon[2:]
+
+                d_B = haversine_vector(cur, prev)
+                d_A = haversine_vector(cur, nex)
+                d_C = haversine_vector(nex, prev)
+
+                # See turn_angle, the angle is 0 at the repeated waypoints
+                turning = (d_A != 0) & (d_B != 0)
+                d_A, d_B, d_C = d_A[turning], d_B[turning], d_C[turning]
+
+                cosines = np.round(
+                    (d_A * d_A + d_B * d_B - d_C * d_C) / (2.0 * d_A * d_B), 5
+                )
+                # math.acos as numpy's arccos may differ from it in the last
+                # bit, the angles must be the same as the ones of turn_angle
+                angles[1:-1][turning] = [
+                    180 - degrees(acos(cosine)) for cosine in cosines.tolist()
+                ]
+
+            angles.flags.writeable = False
+            self._turn_angles = angles
+
+        return self._turn_angles
+
+    @property
+    def distances(self):
+        """The distance (metres) from the first waypoint to every waypoint,
+        along the trace. Computed once, the first time it is used.
+        """
+        if self._distances is None:
+            distances = np.zeros(len(self.coords))
+
+            if len(self.coords) > 1:
+                latlon = self.coords[:, ::-1]
+                segment_lengths = haversine_vector(
+                    latlon[:-1], latlon[1:], unit=Unit.METERS
+                )
+                distances[1:] = np.cumsum(segment_lengths)
+
+            distances.flags.writeable = False
+            self._distances = distances
+
+        return self._distances
+
+    def speed_limits(self, vessel_class):
+        """Returns the (n, 2) array of the [min, max] speed limits of a vessel
+        class at every waypoint, given by the sections of the waypoints (see
+        Section.speeds_for_class). Computed once per class.
+        """
+        limits = self._speed_limits.get(vessel_class)
+
+        if limits is None:
+            section_limits = {}
+
+            for section in set(self.point_sections):
+                speeds = section.speeds_for_class(vessel_class)
+                section_limits[section] = (speeds["min"], speeds["max"])
+
+            limits = np.array(
+                [section_limits[section] for section in self.point_sections],
+                dtype=float,
+            ).reshape(-1, 2)
+            limits.flags.writeable = False
+            self._speed_limits[vessel_class] = limits
+
+        return limits
+
+    @property
+    def segment_lengths(self):
+        """The length (metres) of the segment ending at every waypoint, 0 for
+        the first waypoint"""
+        return np.diff(self.distances, prepend=0.0)
+
+    @staticmethod
+    def from_dict(path):
+        """Creates a trace from a {"x", "y", "point_sections"} dictionary"""
+        return Trace(
+            np.column_stack((path["x"], path["y"])),
+            path["point_sections"],
+            path.get("crossed_sections"),
+        )
+
+    @staticmethod
+    def concat(*paths):
+        """Creates a new trace with the waypoints of the given paths, in order"""
+        views = [as_trace_view(path) for path in paths]
+
+        return Trace(
+            np.concatenate([view.coords for view in views]),
+            [section for view in views for section in view.point_sections],
+            frozenset().union(*[view.crossed_sections for view in views]),
+        )
+
+    def view(self, reverse=False):
+        """Returns a view over the whole trace"""
+        return TraceView(self, reverse=reverse)
+
+    def __len__(self):
+        return len(self.coords)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        # Traces are immutable, copies can share them
+        return self
+
+    def __getstate__(self):
+        return self.coords, self.point_sections, self.crossed_sections
+
+    def __setstate__(self, state):
+        coords, point_sections, crossed_sections = state
+        coords.flags.writeable = False
+
+        self.coords = coords
+        self.point_sections = point_sections
+        self.crossed_sections = crossed_sections
+        self._turn_angles = None
+        self._distances = None
+        self._speed_limits = {}
+
+
+class PathData:
+    """Dictionary-like access to the data of a path, e.g. path["x"], shared
+    by the path views. The paths must have coords, point_sections and
+    crossed_sections attributes.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if key == "x":
+            return self.coords[:, 0].tolist()
+        elif key == "y":
+            return self.coords[:, 1].tolist()
+        elif key == "point_sections":
+            return self.point_sections
+        elif key == "crossed_sections":
+            return self.crossed_sections
+
+        raise KeyError(key)
+
+
+class TraceView(PathData):
+    """Lightweight read-only view over a trace.
+
+    A view references a base trace and describes the path that is
+    followed on it: the base trace can be traversed in reverse, only a
+    window of its waypoints can be used and an additional point can be
+    prepended as the origin of the path. None of the view operations
+    copy the waypoints of the base trace.
+    """
+
+    __slots__ = ("trace", "reverse", "start", "stop", "prefix", "prefix_section")
+
+    def __init__(
+        self,
+        trace,
+        reverse=False,
+        start=0,
+        stop=None,
+        prefix=None,
+        prefix_section=None,
+    ):
+        """
+        :param trace: the base trace
+        :param reverse: whether the base trace is traversed in reverse
+        :param start: first waypoint of the (oriented) base trace to use
+        :param stop: waypoint at which the (oriented) base trace is cut
+        :param prefix: optional point prepended to the waypoints
+        :param prefix_section: the section of the prefix point
+        """
+        stop = len(trace) if stop is None else stop
+        assert 0 <= start <= stop <= len(trace), "Invalid trace view window!"
+
+        self.trace = trace
+        self.reverse = reverse
+        self.start = start
+        self.stop = stop
+        self.prefix = None if prefix is None else (float(prefix[0]), float(prefix[1]))
+        self.prefix_section = prefix_section
+
+    def __len__(self):
+        return (self.stop - self.start) + (self.prefix is not None)
+
+    def _base_index(self, i):
+        """Maps the i-th waypoint of the window to an index of the base trace"""
+        i += self.start
+
+        if self.reverse:
+            return len(self.trace) - 1 - i
+
+        return i
+
+    def _window(self, values):
+        """Returns the windowed (and oriented) portion of a base trace sequence"""
+        if self.reverse:
+            n = len(self.trace)
+            return values[n - self.stop : n - self.start][::-1]
+
+        return values[self.start : self.stop]
+
+    def point(self, i):
+        """Returns the i-th waypoint of the path as a numpy array"""
+        if i < 0 or i >= len(self):
+            raise IndexError(f"Waypoint {i} is out of the path")
+
+        if self.prefix is not None:
+            if i == 0:
+                return np.array(self.prefix)
+
+            i -= 1
+
+        return self.trace.coords[self._base_index(i)].copy()
+
+    def section(self, i):
+        """Returns the section of the i-th waypoint of the path"""
+        if i < 0 or i >= len(self):
+            raise IndexError(f"Waypoint {i} is out of the path")
+
+        if self.prefix is not None:
+            if i == 0:
+                return self.prefix_section
+
+            i -= 1
+
+        return self.trace.point_sections[self._base_index(i)]
+
+    def speed_limits(self, vessel_class, i):
+        """Returns the [min, max] speed limits of a vessel class at the i-th
+        waypoint of the path, see Trace.speed_limits"""
+        if i < 0 or i >= len(self):
+            raise IndexError(f"Waypoint {i} is out of the path")
+
+        if self.prefix is not None:
+            if i == 0:
+                speeds = self.prefix_section.speeds_for_class(vessel_class)
+                return np.array([speeds["min"], speeds["max"]], dtype=float)
+
+            i -= 1
+
+        return self.trace.speed_limits(vessel_class)[self._base_index(i)]
+
+    def turn_angle(self, i):
+        """Returns the turn angle (degrees) of the path at its i-th waypoint,
+        which must have a previous and a next waypoint, see turn_angle"""
+        if i < 1 or i >= len(self) - 1:
+            raise IndexError(f"Waypoint {i} is not an inner waypoint of the path")
+
+        if self.prefix is not None:
+            if i == 1:
+                return turn_angle(self.prefix, self.point(1), self.point(2))
+
+            i -= 1
+
+        # The angles of the trace are the same in both directions
+        return float(self.trace.turn_angles[self._base_index(i)])
+
+    def distance(self, i):
+        """Returns the distance (metres) from the first waypoint of the path
+        to its i-th waypoint, along the path"""
+        if i == 0:
+            return 0.0
+
+        offset = 0.0
+
+        if self.prefix is not None:
+            offset = geodesic_distance(self.prefix, self.point(1))
+            i -= 1
+
+        distances = self.trace.distances
+
+        return offset + abs(
+            float(distances[self._base_index(i)] - distances[self._base_index(0)])
+        )
+
+    @property
+    def coords(self):
+        """The (n, 2) array of waypoints of the path"""
+        coords = self._window(self.trace.coords)
+
+        if self.prefix is not None:
+            coords = np.concatenate(([self.prefix], coords))
+
+        return coords
+
+    @property
+    def point_sections(self):
+        """The list of sections of the waypoints of the path"""
+        point_sections = list(self._window(self.trace.point_sections))
+
+        if self.prefix is not None:
+            point_sections.insert(0, self.prefix_section)
+
+        return point_sections
+
+    @property
+    def crossed_sections(self):
+        return self.trace.crossed_sections
+
+    def with_prefix(self, point, section):
+        """Returns a view of the path that starts from the given point"""
+        if self.prefix is not None:
+            # Only one prefix point can be referenced, chain the existing one
+            return CompositePath([point_view(point, section), self])
+
+        return TraceView(
+            self.trace, self.reverse, self.start, self.stop, point, section
+        )
+
+    def tail(self, start):
+        """Returns a view of the path without its first 'start' waypoints"""
+        assert 0 <= start <= len(self), "Invalid trace view window!"
+
+        prefix, prefix_section = self.prefix, self.prefix_section
+
+        if prefix is not None and start > 0:
+            prefix, prefix_section = None, None
+            start -= 1
+
+        return TraceView(
+            self.trace,
+            self.reverse,
+            self.start + start,
+            self.stop,
+            prefix,
+            prefix_section,
+        )
+
+    def reversed(self):
+        """Returns a view of the path traversed in the opposite direction"""
+        n = len(self.trace)
+        view = TraceView(self.trace, not self.reverse, n - self.stop, n - self.start)
+
+        if self.prefix is not None:
+            # The prefix point becomes the last waypoint of the path
+            return CompositePath([view, point_view(self.prefix, self.prefix_section)])
+
+        return view
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        # Views are immutable, copies can share them
+        return self
+
+
+class CompositePath(PathData):
+    """Read-only path made of several paths followed one after the other.
+
+    The segments (trace views) are only referenced: the waypoints of the
+    path are looked up in its segments when they are accessed, so chaining
+    paths, e.g. a prefix point, a trace and another reversed trace, never
+    copies their waypoints. The path has the same interface as TraceView.
+    """
+
+    __slots__ = ("segments", "offsets", "crossed_sections", "_start_distances")
+
+    def __init__(self, paths):
+        """
+        :param paths: the paths to follow, in order. Composite paths are
+            flattened and empty paths are skipped
+        """
+        segments = []
+
+        for path in paths:
+            path = as_trace_view(path)
+
+            if isinstance(path, CompositePath):
+                segments.extend(path.segments)
+            elif len(path) > 0:
+                segments.append(path)
+
+        self.segments = tuple(segments)
+        # Index of the first waypoint of every segment, and the path length
+        self.offsets = list(
+            accumulate([len(segment) for segment in segments], initial=0)
+        )
+        self.crossed_sections = frozenset().union(
+            *[segment.crossed_sections for segment in segments]
+        )
+        self._start_distances = None
+
+    def __len__(self):
+        return self.offsets[-1]
+
+    def _locate(self, i):
+        """Returns the index of the segment of the i-th waypoint and the
+        index of the waypoint in it"""
+        if i < 0 or i >= len(self):
+            raise IndexError(f"Waypoint {i} is out of the path")
+
+        segment_idx = bisect_right(self.offsets, i) - 1
+
+        return segment_idx, i - self.offsets[segment_idx]
+
+    def point(self, i):
+        """Returns the i-th waypoint of the path as a numpy array"""
+        segment_idx, i = self._locate(i)
+
+        return self.segments[segment_idx].point(i)
+
+    def section(self, i):
+        """Returns the section of the i-th waypoint of the path"""
+        segment_idx, i = self._locate(i)
+
+        return self.segments[segment_idx].section(i)
+
+    def speed_limits(self, vessel_class, i):
+        """Returns the [min, max] speed limits of a vessel class at the i-th
+        waypoint of the path, see Trace.speed_limits"""
+        segment_idx, i = self._locate(i)
+
+        return self.segments[segment_idx].speed_limits(vessel_class, i)
+
+    def turn_angle(self, i):
+        """Returns the turn angle (degrees) of the path at its i-th waypoint,
+        which must have a previous and a next waypoint, see turn_angle"""
+        if i < 1 or i >= len(self) - 1:
+            raise IndexError(f"Waypoint {i} is not an inner waypoint of the path")
+
+        segment_idx, j = self._locate(i)
+        segment = self.segments[segment_idx]
+
+        if 0 < j < len(segment) - 1:
+            return segment.turn_angle(j)
+
+        # The waypoint joins two segments
+        return turn_angle(self.point(i - 1), self.point(i), self.point(i + 1))
+
+    def distance(self, i):
+        """Returns the distance (metres) from the first waypoint of the path
+        to its i-th waypoint, along the path"""
+        segment_idx, j = self._locate(i)
+
+        if self._start_distances is None:
+            start_distances = [0.0]
+
+            for previous, segment in zip(self.segments, self.segments[1:]):
+                last = len(previous) - 1
+                start_distances.append(
+                    start_distances[-1]
+                    + previous.distance(last)
+                    + geodesic_distance(previous.point(last), segment.point(0))
+                )
+
+            self._start_distances = start_distances
+
+        return self._start_distances[segment_idx] + self.segments[segment_idx].distance(
+            j
+        )
+
+    @property
+    def coords(self):
+        """The (n, 2) array of waypoints of the path"""
+        if len(self.segments) == 0:
+            return np.empty((0, 2))
+
+        return np.concatenate([segment.coords for segment in self.segments])
+
+    @property
+    def point_sections(self):
+        """The list of sections of the waypoints of the path"""
+        return [
+            section for segment in self.segments for section in segment.point_sections
+        ]
+
+    def with_prefix(self, point, section):
+        """Returns a view of the path that starts from the given point"""
+        return CompositePath([point_view(point, section), self])
+
+    def tail(self, start):
+        """Returns a view of the path without its first 'start' waypoints"""
+        assert 0 <= start <= len(self), "Invalid trace view window!"
+
+        if start == len(self):
+            return CompositePath([])
+
+        segment_idx = bisect_right(self.offsets, start) - 1
+        first = self.segments[segment_idx].tail(start - self.offsets[segment_idx])
+
+        return CompositePath([first, *self.segments[segment_idx + 1 :]])
+
+    def reversed(self):
+        """Returns a view of the path traversed in the opposite direction"""
+        return CompositePath([segment.reversed() for segment in self.segments[::-1]])
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        # Composite paths are immutable, copies can share them
+        return self
+
+
+def point_view(point, section):
+    """Returns a view of a path made of a single waypoint"""
+    return Trace([point[:2]], [section], crossed_sections=()).view()
+
+
+def as_trace_view(path):
+    """Returns the given path (a view, a trace or a dictionary) as a trace view"""
+    if isinstance(path, (TraceView, CompositePath)):
+        return path
+    elif isinstance(path, Trace):
+        return path.view()
+
+    return Trace.from_dict(path).view()
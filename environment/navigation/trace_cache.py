@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+# Version of the cache layout, increase it when the stored data changes
+CACHE_VERSION = 1
+
+CACHE_PREFIX = "traces-v"
+COORDS_FILENAME = "coords.npy"
+SECTIONS_FILENAME = "sections.npy"
+INDEX_FILENAME = "index.json"
+
+
+class TraceCache:
+    """On-disk cache of the traces loaded by the path finder.
+
+    The waypoints of all the traces are stored in two flat arrays, their
+    (lon, lat) coordinates and the index of their section, which are
+    memory mapped when the cache is loaded. A JSON index maps each route
+    of each trace group to the [start, stop) ranges of its traces in the
+    arrays.
+
+    The cache is keyed on a hash of the cache version and of the content
+    of all the input files (the traces folders and the sections file): when
+    any of them changes, or when the cache cannot be read, it is rebuilt.
+    """
+
+    def __init__(self, cache_dir, input_paths):
+        """
+        :param cache_dir: the directory the cache is stored in
+        :param input_paths: the files and folders the traces are loaded from
+        """
+        self.cache_dir = cache_dir
+        self.input_paths = list(input_paths)
+        self.key = self._compute_key()
+        self.path = os.path.join(cache_dir, f"{CACHE_PREFIX}{CACHE_VERSION}-{self.key}")
+
+    def _input_files(self):
+        for path in self.input_paths:
+            if os.path.isdir(path):
+                for filename in sorted(os.listdir(path)):
+                    yield os.path.join(path, filename)
+            else:
+                yield path
+
+    def _compute_key(self):
+        digest = hashlib.sha256(f"{CACHE_PREFIX}{CACHE_VERSION}".encode())
+
+        for filename in self._input_files():
+            with open(filename, "rb") as input_file:
+                content = input_file.read()
+
+            digest.update(f"{filename}:{len(content)}:".encode())
+            digest.update(content)
+
+        return digest.hexdigest()[:32]
+
+    def load(self, section_names):
+        """Loads the cached trace groups.
+
+        :param section_names: the names of the sections of the port, in order
+        :return: dictionary mapping each trace group to its (routes,
+            destinations), where the routes map each route id to the list of
+            (coords, section indices) of its traces. None if the cache does
+            not exist or is invalid
+        """
+        if not os.path.isdir(self.path):
+            return None
+
+        try:
+            return self._read(section_names)
+        except Exception as e:
+            print(f"Invalid traces cache {self.path}, rebuilding it: {e}")
+            return None
+
+    def _read(self, section_names):
+        with open(os.path.join(self.path, INDEX_FILENAME), "r") as index_file:
+            index = json.load(index_file)
+
+        assert index["version"] == CACHE_VERSION, "Outdated cache version"
+        assert index["key"] == self.key, "The input files changed"
+        assert index["sections"] == list(section_names), "The sections changed"
+
+        coords = np.load(os.path.join(self.path, COORDS_FILENAME), mmap_mode="r")
+        sections = np.load(os.path.join(self.path, SECTIONS_FILENAME), mmap_mode="r")
+
+        assert coords.ndim == 2 and coords.shape[1] == 2, "Invalid coordinates"
+        assert sections.shape == (len(coords),), "Invalid sections"
+
+        groups = {}
+
+        for group, data in index["groups"].items():
+            routes = {}
+
+            for route_id, ranges in data["routes"].items():
+                for start, stop in ranges:
+                    assert 0 <= start < stop <= len(coords), "Invalid trace range"
+
+                routes[route_id] = [
+                    (coords[start:stop], sections[start:stop]) for start, stop in ranges
+                ]
+
+            groups[group] = (routes, set(data["destinations"]))
+
+        return groups
+
+    def store(self, groups, section_names):
+        """Replaces the cache with the given trace groups, see load"""
+        coords = []
+        sections = []
+        index = {
+            "version": CACHE_VERSION,
+            "key": self.key,
+            "sections": list(section_names),
+            "groups": {},
+        }
+        size = 0
+
+        for group, (routes, destinations) in groups.items():
+            ranges = {}
+
+            for route_id, traces in routes.items():
+                ranges[route_id] = []
+
+                for trace_coords, trace_sections in traces:
+                    coords.append(np.asarray(trace_coords, dtype=np.float64))
+                    sections.append(np.asarray(trace_sections, dtype=np.int32))
+                    ranges[route_id].append([size, size + len(trace_coords)])
+                    size += len(trace_coords)
+
+            index["groups"][group] = {
+                "routes": ranges,
+                "destinations": sorted(destinations),
+            }
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Write the cache to a temporary directory first, so that an
+        # interrupted write never leaves a partial cache behind
+        tmp_path = tempfile.mkdtemp(prefix=".tmp-", dir=self.cache_dir)
+
+        try:
+            np.save(
+                os.path.join(tmp_path, COORDS_FILENAME),
+                np.concatenate(coords) if coords else np.empty((0, 2)),
+            )
+            np.save(
+                os.path.join(tmp_path, SECTIONS_FILENAME),
+                np.concatenate(sections) if sections else np.empty(0, dtype=np.int32),
+            )
+
+            with open(os.path.join(tmp_path, INDEX_FILENAME), "w") as index_file:
+                json.dump(index, index_file)
+
+            shutil.rmtree(self.path, ignore_errors=True)
+            os.replace(tmp_path, self.path)
+        finally:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+        self._remove_stale()
+
+    def _remove_stale(self):
+        """Removes the caches of older versions or of other input files"""
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+
+            if name.startswith(CACHE_PREFIX) and path != self.path:
+                shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,184 @@
+import json
+import multiprocessing
+import os
+import re
+import time
+
+import geojson
+import numpy as np
+
+# Opening of the features array of a GeoJSON FeatureCollection
+FEATURES_PATTERN = re.compile(r'"features"\s*:\s*\[')
+WHITESPACE_PATTERN = re.compile(r"[\s,]*")
+
+# Minimum total size (bytes) of the trace files parsed by a pool of processes,
+# smaller corpora are parsed faster than the pool starts
+PARALLEL_MIN_SIZE = 1 << 20
+
+
+def iter_features(path, chunk_size=1 << 16):
+    """Yields the features of a GeoJSON FeatureCollection file one at a time,
+    reading the file in chunks instead of loading it whole.
+
+    :param path: path of the GeoJSON file
+    :param chunk_size: number of characters read at a time
+    """
+    # Decode the features as geojson.loads does (e.g. rounding the coordinates)
+    decoder = json.JSONDecoder(object_hook=geojson.GeoJSON.to_instance)
+
+    with open(path, "r") as geo_file:
+        buffer = ""
+        match = None
+
+        while match is None:
+            chunk = geo_file.read(chunk_size)
+
+            if not chunk:
+                raise Exception(f"File {path} has invalid data: no features found")
+
+            buffer += chunk
+            match = FEATURES_PATTERN.search(buffer)
+
+        position = match.end()
+        end_of_file = False
+
+        while True:
+            position = WHITESPACE_PATTERN.match(buffer, position).end()
+
+            if position < len(buffer) and buffer[position] == "]":
+                return
+
+            try:
+                if position == len(buffer):
+                    raise ValueError("Incomplete feature")
+
+                feature, position = decoder.raw_decode(buffer, position)
+            except ValueError as e:
+                if end_of_file:
+                    raise Exception(f"File {path} has invalid data: {e}")
+
+                # The feature is not complete yet: drop the features already
+                # decoded from the buffer and read (at least) as much again
+                buffer = buffer[position:]
+                position = 0
+                chunk = geo_file.read(max(chunk_size, len(buffer)))
+                end_of_file = not chunk
+                buffer += chunk
+                continue
+
+            yield feature
+
+
+def read_traces_file(path):
+    """Reads the traces of a GeoJSON file.
+
+    :param path: path of the GeoJSON file
+    :return: list of the (origin, destination, (n, 2) waypoints array) of
+        every trace in the file
+    """
+    traces = []
+
+    for feature in iter_features(path):
+        properties = feature["properties"]
+        waypoints = np.asarray(feature["geometry"]["coordinates"], dtype=float)
+        waypoints = waypoints.reshape(-1, waypoints.shape[-1])[:, :2]
+
+        traces.append((properties["origin"], properties["destination"], waypoints))
+
+    return traces
+
+
+def print_progress(folder, loaded_files, total_files, elapsed):
+    """Progress callback that prints the loading progress of every folder"""
+    end = "\n" if loaded_files == total_files else "\r"
+
+    print(
+        f"Loading traces from {folder}: {loaded_files}/{total_files} files "
+        f"({elapsed:.2f}s)",
+        end=end,
+        flush=True,
+    )
+
+
+class TraceLoader:
+    """Reads the GeoJSON trace files of several folders.
+
+    The files are parsed in parallel by a pool of processes, each file is
+    streamed one feature at a time. The time spent loading each folder
+    is kept in `timings`.
+    """
+
+    def __init__(self, workers=None, progress=None):
+        """
+        :param workers: number of processes parsing the files, defaults to
+            the number of CPUs. With a single worker, from a daemonic process
+            (e.g. an experiment worker) or when the files are smaller than
+            PARALLEL_MIN_SIZE, the files are parsed in this process
+        :param progress: function f(folder, loaded files, total files,
+            elapsed seconds) called after every parsed file (optional),
+            e.g. print_progress
+        """
+        assert workers is None or workers > 0, "The number of workers should be > 0"
+
+        self.workers = workers or os.cpu_count() or 1
+        self.progress = progress
+        self.timings = {}
+
+    def load(self, folders):
+        """Reads the trace files of the given folders.
+
+        :param folders: dictionary mapping a name to the path of each folder
+        :return: dictionary mapping every name to the list of (origin,
+            destination, waypoints) of the traces of its folder, in the
+            order of the files
+        """
+        paths = {}
+
+        for name, folder in folders.items():
+            assert os.path.isdir(folder), f"{folder} does not exist"
+            assert len(os.listdir(folder)) > 0, f"No traces data in {folder}"
+
+            paths[name] = [f"{folder}/{file}" for file in os.listdir(folder)]
+
+        all_paths = [path for folder_paths in paths.values() for path in folder_paths]
+        parallel = (
+            self.workers > 1
+            and len(all_paths) > 1
+            and sum(os.path.getsize(path) for path in all_paths) >= PARALLEL_MIN_SIZE
+            and not multiprocessing.current_process().daemon
+        )
+
+        if not parallel:
+            return self._collect(folders, paths, map(read_traces_file, all_paths))
+
+        with multiprocessing.Pool(min(self.workers, len(all_paths))) as pool:
+            return self._collect(folders, paths, pool.imap(read_traces_file, all_paths))
+
+    def _collect(self, folders, paths, files_traces):
+        """Groups the traces of the parsed files (in the order of the paths)
+        by folder. The time of a folder is measured from the end of the
+        previous one, as the files are parsed concurrently.
+        """
+        traces = {}
+        start = time.perf_counter()
+
+        for name, folder_paths in paths.items():
+            folder = folders[name]
+            traces[name] = []
+
+            for loaded_files in range(1, len(folder_paths) + 1):
+                traces[name].extend(next(files_traces))
+
+                if self.progress is not None:
+                    self.progress(
+                        folder,
+                        loaded_files,
+                        len(folder_paths),
+                        time.perf_counter() - start,
+                    )
+
+            end = time.perf_counter()
+            self.timings[folder] = end - start
+            start = end
+
+        return traces
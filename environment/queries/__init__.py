@@ -7,17 +7,14 @@ from components import (Course, FrameCounter, PilotInfo, Position, TugInfo,
                         Velocity, VesselInfo, VesselPath)
 from components.fsm import (PilotStateMachine, TugStateMachine,
                             VesselStateMachine)
-from utils.timer import SimulationTimer
 
 from .anchorage_list import AnchorageList
 from .berth_list import BerthList
+from .resource_index import ResourceIndex
+from .vessel_index import VesselIndex
 from .waiting_locations import WaitingLocationList
 
 
-def fetch_timers(world):
-    return world.get_components(SimulationTimer)
-
-
 def fetch_vessels(world):
     return world.get_components(
         Position,
@@ -1,7 +1,7 @@
-from components import AnchorageInfo, Shape
-from components.fsm import AnchorageStateMachine
 from components.fsm.states import AnchorageState
 
+from .resource_index import ResourceIndex
+
 
 class AnchorageList:
     """Class that handles the retrieval of Anchorage entities with different sorting methods."""
@@ -12,11 +12,13 @@ class AnchorageList:
 
         self.index = 0
 
+        # Queries on all the anchorages of a world are answered by its index
+        self.resources = None
+
         if data is None:
             self.world = world
-            self.anchorages = world.get_components(
-                AnchorageInfo, AnchorageStateMachine, Shape
-            )
+            self.resources = ResourceIndex.for_world(world)
+            self.anchorages = self.resources.anchorages
         else:
             self.anchorages = data
 
@@ -42,6 +44,9 @@ class AnchorageList:
         if available is None:
             raise ValueError("Availability must be non null!")
 
+        if self.resources is not None:
+            return AnchorageList(data=self.resources.anchorages_by_state(available))
+
         available_anchorages = []
 
         for d, (anchorage_info, fsm, shape) in self.anchorages:
@@ -54,6 +59,9 @@ class AnchorageList:
         if name is None:
             raise ValueError("The anchorage name cannot be None!")
 
+        if self.resources is not None:
+            return self.resources.anchorage_by_name(name)
+
         for d, (anchorage_info, fsm, shape) in self.anchorages:
             if anchorage_info.name == name:
                 return [d, (anchorage_info, fsm, shape)]
@@ -1,7 +1,7 @@
-from components import BerthInfo, Position
-from components.fsm import BerthStateMachine
 from components.fsm.states import BerthState
 
+from .resource_index import ResourceIndex
+
 
 class BerthList:
     """Class that handles the retrieval of Berth entities with different sorting methods."""
@@ -12,9 +12,13 @@ class BerthList:
 
         self.index = 0
 
+        # Queries on all the berths of a world are answered by its index
+        self.resources = None
+
         if data is None:
             self.world = world
-            self.berths = world.get_components(Position, BerthInfo, BerthStateMachine)
+            self.resources = ResourceIndex.for_world(world)
+            self.berths = self.resources.berths
         else:
             self.berths = data
 
@@ -40,6 +44,9 @@ class BerthList:
         if available is None:
             raise ValueError("Availability must be non null!")
 
+        if self.resources is not None:
+            return BerthList(data=self.resources.berths_by_state(available))
+
         available_berths = []
 
         for d, (pos, berth_info, fsm) in self.berths:
@@ -52,6 +59,15 @@ class BerthList:
         if vessel_types is None:
             raise ValueError("Vessel types must be a list")
 
+        if self.resources is not None:
+            allowed_berths = [
+                berth
+                for vessel_type in set(vessel_types)
+                for berth in self.resources.berths_by_content_type(vessel_type)
+            ]
+
+            return BerthList(data=self.resources.in_world_order(allowed_berths))
+
         allowed_berths = []
 
         for d, (pos, berth_info, fsm) in self.berths:
@@ -67,6 +83,10 @@ class BerthList:
         if len(ids) == 0:
             return BerthList(data=[])
 
+        if self.resources is not None:
+            return BerthList(data=self.resources.berths_by_ids(ids))
+
+        ids = set(ids)
         out_berths = []
 
         for d, (pos, berth_info, fsm) in self.berths:
@@ -74,3 +94,18 @@ class BerthList:
                 out_berths.append([d, (pos, berth_info, fsm)])
 
         return BerthList(data=out_berths)
+
+    def filter_by_vessel_class(self, vessel_class):
+        if vessel_class is None:
+            raise ValueError("The vessel class cannot be None!")
+
+        if self.resources is not None:
+            return BerthList(data=self.resources.berths_by_vessel_class(vessel_class))
+
+        allowed_berths = []
+
+        for d, (pos, berth_info, fsm) in self.berths:
+            if vessel_class in berth_info.allowed_vessel_classes:
+                allowed_berths.append([d, (pos, berth_info, fsm)])
+
+        return BerthList(data=allowed_berths)
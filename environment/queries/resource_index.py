@@ -0,0 +1,162 @@
+import weakref
+
+from components import (AnchorageInfo, BerthInfo, LocationInfo, Position,
+                        Shape)
+from components.fsm import AnchorageStateMachine, BerthStateMachine
+
+
+class ResourceIndex:
+    """Persistent indexes of the port resources (berths, waiting locations
+    and anchorages) of a simulation world.
+
+    The indexes are built from the world on first use, and the state indexes
+    are kept up to date by the berths and anchorages state machines, through
+    their state listeners. The
+    entries are the same as the ones returned by world.get_components, and
+    are always returned in the world order.
+
+    The initializers must call invalidate() whenever they add resources.
+    """
+
+    __indexes = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def for_world(world):
+        """Returns the resource index of a world, building it if needed."""
+        index = ResourceIndex.__indexes.get(world)
+
+        if index is None:
+            index = ResourceIndex(world)
+            ResourceIndex.__indexes[world] = index
+
+        return index
+
+    @staticmethod
+    def invalidate(world):
+        """Drops the resource index of a world, it is rebuilt on next use."""
+        index = ResourceIndex.__indexes.pop(world, None)
+
+        if index is not None:
+            index._detach()
+
+    def __init__(self, world):
+        self.berths = world.get_components(Position, BerthInfo, BerthStateMachine)
+        self.locations = world.get_components(LocationInfo, Shape)
+        self.anchorages = world.get_components(
+            AnchorageInfo, AnchorageStateMachine, Shape
+        )
+
+        # Rank of each resource entity in the world order
+        self._rank = {}
+
+        # The (state machine, listener) pairs keeping the state indexes updated
+        self._listeners = []
+
+        self._berths_by_id = {}
+        self._berths_by_state = {}
+        self._berths_by_content_type = {}
+        self._berths_by_vessel_class = {}
+
+        for rank, berth in enumerate(self.berths):
+            ent, (_, berth_info, fsm) = berth
+            self._rank[ent] = rank
+
+            self._berths_by_id.setdefault(berth_info.id, []).append(berth)
+            self._berths_by_state.setdefault(fsm.current(), {})[ent] = berth
+            self._berths_by_content_type.setdefault(
+                berth_info.allowed_vessel_content_type(), []
+            ).append(berth)
+
+            for vessel_class in berth_info.allowed_vessel_classes:
+                self._berths_by_vessel_class.setdefault(vessel_class, []).append(berth)
+
+            self._listen(
+                fsm,
+                lambda event, berth=berth: self._move(
+                    self._berths_by_state, berth, event
+                ),
+            )
+
+        self._locations_by_id = {}
+        self._locations_by_type = {}
+
+        for rank, location in enumerate(self.locations):
+            ent, (location_info, _) = location
+            self._rank[ent] = rank
+
+            self._locations_by_id.setdefault(location_info.id, []).append(location)
+            self._locations_by_type.setdefault(location_info.type, []).append(
+                location
+            )
+
+        self._anchorages_by_name = {}
+        self._anchorages_by_state = {}
+
+        for rank, anchorage in enumerate(self.anchorages):
+            ent, (anchorage_info, fsm, _) = anchorage
+            self._rank[ent] = rank
+
+            self._anchorages_by_name.setdefault(anchorage_info.name, anchorage)
+            self._anchorages_by_state.setdefault(fsm.current(), {})[ent] = anchorage
+
+            self._listen(
+                fsm,
+                lambda event, anchorage=anchorage: self._move(
+                    self._anchorages_by_state, anchorage, event
+                ),
+            )
+
+    def berths_by_ids(self, ids):
+        return self.in_world_order(
+            berth
+            for berth_id in set(ids)
+            for berth in self._berths_by_id.get(berth_id, [])
+        )
+
+    def berths_by_state(self, state):
+        return self.in_world_order(self._berths_by_state.get(state, {}).values())
+
+    def berths_by_content_type(self, content_type):
+        return list(self._berths_by_content_type.get(content_type, []))
+
+    def berths_by_vessel_class(self, vessel_class):
+        return list(self._berths_by_vessel_class.get(vessel_class, []))
+
+    def locations_by_ids(self, ids):
+        return self.in_world_order(
+            location
+            for location_id in set(ids)
+            for location in self._locations_by_id.get(location_id, [])
+        )
+
+    def locations_by_type(self, location_type):
+        return list(self._locations_by_type.get(location_type, []))
+
+    def anchorage_by_name(self, name):
+        return self._anchorages_by_name.get(name)
+
+    def anchorages_by_state(self, state):
+        return self.in_world_order(
+            self._anchorages_by_state.get(state, {}).values()
+        )
+
+    def in_world_order(self, entries):
+        """Sorts resource entries in the world order"""
+        return sorted(entries, key=lambda entry: self._rank[entry[0]])
+
+    def _listen(self, fsm, listener):
+        fsm.state_listeners.append(listener)
+        self._listeners.append((fsm, listener))
+
+    def _detach(self):
+        """Stops updating the state indexes"""
+        for fsm, listener in self._listeners:
+            fsm.state_listeners.remove(listener)
+
+        self._listeners = []
+
+    def _move(self, index, entry, event):
+        ent = entry[0]
+
+        index.get(event.src, {}).pop(ent, None)
+        index.setdefault(event.dst, {})[ent] = entry
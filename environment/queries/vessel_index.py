@@ -0,0 +1,103 @@
+import bisect
+import heapq
+import weakref
+
+from components import (Course, FrameCounter, Position, Velocity, VesselInfo,
+                        VesselPath)
+from components.fsm import VesselStateMachine
+from components.fsm.states import VesselState
+
+# The components of the vessels, in the order of fetch_vessels
+VESSEL_COMPONENTS = (
+    Position,
+    FrameCounter,
+    Course,
+    Velocity,
+    VesselPath,
+    VesselStateMachine,
+    VesselInfo,
+)
+
+
+class VesselIndex:
+    """Persistent index of the vessels of a simulation world by state.
+
+    The index is built from the world on first use, the vessel generators
+    must call add() for every vessel they add to the world afterwards. The
+    states are kept up to date by the vessel state machines, and the vessels
+    are dropped once they left the port. The entries are the same as the
+    ones returned by fetch_vessels, and are always returned by entity id.
+    """
+
+    __indexes = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def for_world(world):
+        """Returns the vessel index of a world, building it if needed."""
+        index = VesselIndex.__indexes.get(world)
+
+        if index is None:
+            index = VesselIndex(world)
+            VesselIndex.__indexes[world] = index
+
+        return index
+
+    @staticmethod
+    def invalidate(world):
+        """Drops the vessel index of a world, it is rebuilt on next use."""
+        VesselIndex.__indexes.pop(world, None)
+
+    def __init__(self, world):
+        self._world = weakref.ref(world)
+
+        self._vessels = {}
+        # Sorted entity ids of the vessels in every state
+        self._entities_by_state = {}
+
+        for vessel in world.get_components(*VESSEL_COMPONENTS):
+            self._add(vessel)
+
+    def __len__(self):
+        return len(self._vessels)
+
+    def add(self, ent):
+        """Adds a vessel to the index, its components must be in the world"""
+        if ent not in self._vessels:
+            components = self._world().try_components(ent, *VESSEL_COMPONENTS)
+
+            assert components is not None, "The vessel is missing components"
+
+            self._add((ent, components))
+
+    def vessels_by_state(self, state):
+        return [self._vessels[ent] for ent in self._entities_by_state.get(state, [])]
+
+    def vessels_by_states(self, states):
+        """Returns the vessels in any of the given states, by entity id"""
+        return [
+            self._vessels[ent]
+            for ent in heapq.merge(
+                *(self._entities_by_state.get(state, []) for state in states)
+            )
+        ]
+
+    def _add(self, vessel):
+        ent, (_, _, _, _, _, fsm, _) = vessel
+
+        self._vessels[ent] = vessel
+        self._insert(ent, fsm.current())
+
+        fsm.state_listeners.append(lambda event, ent=ent: self._move(ent, event))
+
+    def _insert(self, ent, state):
+        bisect.insort(self._entities_by_state.setdefault(state, []), ent)
+
+    def _move(self, ent, event):
+        entities = self._entities_by_state[event.src]
+        del entities[bisect.bisect_left(entities, ent)]
+
+        if event.dst == VesselState.LEFT:
+            # The vessels are removed from the world once they left
+            self._vessels.pop(ent)
+        else:
+            self._insert(ent, event.dst)
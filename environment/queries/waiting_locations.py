@@ -2,7 +2,7 @@ import random
 
 from shapely.geometry import Point
 
-from components import LocationInfo, Shape
+from .resource_index import ResourceIndex
 
 
 class WaitingLocationList:
@@ -14,9 +14,13 @@ class WaitingLocationList:
 
         self.index = 0
 
+        # Queries on all the locations of a world are answered by its index
+        self.resources = None
+
         if data is None:
             self.world = world
-            self.locations = world.get_components(LocationInfo, Shape)
+            self.resources = ResourceIndex.for_world(world)
+            self.locations = self.resources.locations
         else:
             self.locations = data
 
@@ -45,6 +49,10 @@ class WaitingLocationList:
         if len(ids) == 0:
             return WaitingLocationList(data=[])
 
+        if self.resources is not None:
+            return WaitingLocationList(data=self.resources.locations_by_ids(ids))
+
+        ids = set(ids)
         out_locations = []
 
         for d, (location_info, shape) in self.locations:
@@ -57,6 +65,11 @@ class WaitingLocationList:
         if location_type is None:
             raise ValueError("Location type must exist")
 
+        if self.resources is not None:
+            return WaitingLocationList(
+                data=self.resources.locations_by_type(location_type)
+            )
+
         out_locations = []
 
         for d, (location_info, shape) in self.locations:
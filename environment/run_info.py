@@ -1,27 +1,24 @@
+import math
+
+
 class RunInfo:
-    """Singleton containing information of the simulation run."""
+    """Information of a simulation run, in particular its clock."""
 
     __instance = None
 
     @staticmethod
     def get_instance():
-        if RunInfo.__instance == None:
-            RunInfo()
+        """Returns the default instance, used when no SimulationContext is given"""
+        if RunInfo.__instance is None:
+            RunInfo.__instance = RunInfo()
 
         return RunInfo.__instance
 
     def __init__(self):
-        """Private constructor."""
-
-        if RunInfo.__instance != None:
-            raise Exception("This class is a singleton!")
-        else:
-            RunInfo.__instance = self
-
-            self.simulation_start_time = None
-            self.simulation_end_time = None
-            self.simulation_timestamp = None
-            self.step_size_seconds = 0
+        self.simulation_start_time = None
+        self.simulation_end_time = None
+        self.simulation_timestamp = None
+        self.step_size_seconds = 0
 
     def set_simulation_start_time(self, simulation_start_time):
         """Set the simulation start time
@@ -42,9 +39,51 @@ class RunInfo:
     def set_simulation_time(self, time):
         self.simulation_timestamp = time
 
-    def update_time(self):
+    def update_time(self, steps=1):
+        """Advances the simulation time by a number of steps
+
+        :param steps: the number of steps
+        """
         assert self.simulation_timestamp is not None, "Simulation time not set up"
-        self.set_simulation_time(self.simulation_timestamp + self.step_size_seconds)
+
+        timestamp = self.simulation_timestamp
+
+        # The steps are added one by one, as the rounding of the accumulated
+        # time must not depend on how many steps are advanced at once
+        for _ in range(steps):
+            timestamp += self.step_size_seconds
+
+        self.set_simulation_time(timestamp)
+
+    def simulation_times(self, steps):
+        """Returns the simulation times of the next steps, starting with the
+        current one, as they would be returned by simulation_time()
+
+        :param steps: the number of steps
+        """
+        start = self.start_timestamp()
+        timestamp = self.timestamp()
+        times = []
+
+        for _ in range(steps):
+            times.append(timestamp - start)
+            timestamp += self.step_size_seconds
+
+        return times
+
+    def steps_until(self, simulation_time):
+        """Returns a conservative number of the next steps during which the
+        simulation time is still lower than simulation_time
+
+        :param simulation_time: the simulation time (in seconds) to reach
+        """
+        remaining_seconds = simulation_time - self.simulation_time()
+
+        if remaining_seconds <= 0:
+            return 0
+
+        # Keep a step of margin for the rounding of the accumulated time
+        return max(0, math.ceil(remaining_seconds / self.step_size_seconds) - 1)
 
     def start_timestamp(self):
         assert (
@@ -8,21 +8,14 @@ from exceptions import NotEnoughAvailableTugsException
 
 
 class DefaultTugCompanyStrategy:
-    __instance = None
-
-    @staticmethod
-    def get_instance():
-        if DefaultTugCompanyStrategy.__instance is None:
-            DefaultTugCompanyStrategy()
-
-        return DefaultTugCompanyStrategy.__instance
-
-    def __init__(self):
-        """Private constructor"""
-        if DefaultTugCompanyStrategy.__instance != None:
-            raise Exception("This class is a singleton!")
-        else:
-            DefaultTugCompanyStrategy.__instance = self
+    def __init__(self, world=None, tug_companies=None):
+        """
+        :param world: the simulation world (can also be set with set_world)
+        :param tug_companies: the tugboat companies (can also be set with
+            set_tug_companies)
+        """
+        self.world = world
+        self.tug_companies = tug_companies
 
     def set_world(self, world):
         self.world = world
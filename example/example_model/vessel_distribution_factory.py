@@ -9,7 +9,14 @@ SECONDS_IN_HOUR = 60 * 60
 
 
 class VesselDistributionFactory:
-    def __init__(self):
+    def __init__(self, arrival_rate=1.0):
+        """
+        :param arrival_rate: factor applied to the arrival rate of every vessel
+            type, e.g. 2 for twice as many arrivals
+        """
+        assert arrival_rate > 0, "The arrival rate should be positive"
+
+        self.arrival_rate = arrival_rate
         self._inter_arrival_means = self._build_vessel_inter_arrival_mean_dict()
         self._vessel_properties = self._build_vessel_info_dict()
 
@@ -18,7 +25,9 @@ class VesselDistributionFactory:
 
     def inter_arrival_time_sampler(self, vessel_type):
         return (
-            lambda: np.random.exponential(scale=self._inter_arrival_means[vessel_type])
+            lambda: np.random.exponential(
+                scale=self._inter_arrival_means[vessel_type] / self.arrival_rate
+            )
             * SECONDS_IN_HOUR
         )
 
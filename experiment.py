@@ -0,0 +1,117 @@
+"""
+    Experiment runner: runs the example simulation for every combination
+    of a parameter grid with several seeds, over a pool of processes, and
+    writes the aggregated key performance indicators to a JSON file.
+
+    For example, to compare 2 and 3 tugs with and without berth checks
+    over 10 seeds:
+
+    python experiment.py --max-time 200000 --seeds 10 --results results.json \\
+        --grid tugs_count=2,3 --grid berth_check_prob=0,0.1
+"""
+
+import argparse
+import json
+import sys
+
+from simulation import DEFAULT_CONFIG, run_experiment
+
+
+def parse_value(value):
+    """Parses a configuration value, e.g. 3, 0.1, true or csv"""
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def parse_assignment(assignment):
+    key, separator, value = assignment.partition("=")
+
+    if not separator or key not in DEFAULT_CONFIG:
+        print(f"Invalid parameter {assignment}, expected <key>=<value>!")
+        print(f"Valid keys: {', '.join(DEFAULT_CONFIG)}")
+        sys.exit(-1)
+
+    return key, value
+
+
+def init_parser():
+    parser = argparse.ArgumentParser(
+        description="PySeidon - run experiments over seeds and parameter grids"
+    )
+
+    parser.add_argument(
+        "--max-time", required=True, help="Maximum simulation time", type=int
+    )
+    parser.add_argument(
+        "--out",
+        default=None,
+        help="Output directory of the logs of every run (optional)",
+        type=str,
+    )
+    parser.add_argument(
+        "--results",
+        default="results.json",
+        help="File the aggregated results are written to",
+        type=str,
+    )
+    parser.add_argument(
+        "--seeds", default=10, help="Number of seeds of every grid point", type=int
+    )
+    parser.add_argument(
+        "--workers",
+        default=None,
+        help="Number of processes (defaults to the number of CPUs)",
+        type=int,
+    )
+    parser.add_argument(
+        "--grid",
+        default=[],
+        action="append",
+        help="Values of a parameter, e.g. tugs_count=2,3 (can be repeated)",
+        type=str,
+    )
+    parser.add_argument(
+        "--set",
+        default=[],
+        action="append",
+        help="Value of a parameter shared by all the runs, e.g. step=5 (can be repeated)",
+        type=str,
+    )
+
+    return parser
+
+
+def main():
+    args = init_parser().parse_args()
+
+    base_config = {"max_time": args.max_time, "out": args.out}
+    grid = {}
+
+    for assignment in args.set:
+        key, value = parse_assignment(assignment)
+        base_config[key] = parse_value(value)
+
+    for assignment in args.grid:
+        key, values = parse_assignment(assignment)
+        grid[key] = [parse_value(value) for value in values.split(",")]
+
+    experiment = run_experiment(
+        base_config, grid=grid, seeds=range(args.seeds), workers=args.workers
+    )
+
+    with open(args.results, "w") as results_file:
+        json.dump(experiment, results_file, indent=2)
+
+    for point in experiment:
+        print(point["parameters"] or "default")
+
+        for key, kpi in point["kpis"].items():
+            print(f"  {key}: {kpi['mean']:.2f} ± {kpi['ci']:.2f}")
+
+    print(f"Written the results to {args.results}")
+
+
+if __name__ == "__main__":
+    main()
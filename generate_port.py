@@ -0,0 +1,77 @@
+"""
+    Synthetic port generator: writes the dataset of a port of a configurable
+    size (sections, berths, terminals, anchorages, tug and pilot locations
+    and the traces between them) in the layout of example_data, to measure
+    how the simulation scales with the size of the port.
+
+    For example, to simulate a port with 2000 berths:
+
+    python generate_port.py --out ports/port_2000 --berths 2000 --tugs 40
+    python main.py --data-dir ports/port_2000 --out out --graphics n --tugs-count 40
+"""
+
+import argparse
+import json
+
+from simulation.synthetic_port import SyntheticPort
+
+
+def init_parser():
+    parser = argparse.ArgumentParser(
+        description="PySeidon - generate the dataset of a synthetic port"
+    )
+
+    parser.add_argument(
+        "--out", required=True, help="Directory of the dataset", type=str
+    )
+    parser.add_argument("--berths", default=100, help="Number of berths", type=int)
+    parser.add_argument(
+        "--berths-per-section", default=20, help="Berths in every section", type=int
+    )
+    parser.add_argument(
+        "--tug-waiting-locations",
+        default=2,
+        help="Number of tug waiting locations",
+        type=int,
+    )
+    parser.add_argument("--tugs", default=10, help="Number of tugboats", type=int)
+    parser.add_argument("--pilots", default=10, help="Number of pilots", type=int)
+    parser.add_argument(
+        "--traces-per-route",
+        default=2,
+        help="Traces between every origin and destination",
+        type=int,
+    )
+    parser.add_argument(
+        "--traces-per-file",
+        default=1000,
+        help="Maximum number of traces in a GeoJSON file",
+        type=int,
+    )
+    parser.add_argument(
+        "--seed", default=0, help="Seed of the jitter of the traces", type=int
+    )
+
+    return parser
+
+
+def main():
+    args = init_parser().parse_args()
+
+    port = SyntheticPort(
+        berths=args.berths,
+        berths_per_section=args.berths_per_section,
+        tug_waiting_locations=args.tug_waiting_locations,
+        pilots=args.pilots,
+        tugs=args.tugs,
+        traces_per_route=args.traces_per_route,
+        traces_per_file=args.traces_per_file,
+        seed=args.seed,
+    )
+
+    print(json.dumps(port.generate(args.out), indent=2))
+    print(f"Written the port dataset to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
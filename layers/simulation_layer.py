@@ -13,16 +13,17 @@ class SimulationLayer(BaseLayer):
     It is based on geoplotlib's BaseLayer class.
     """
 
-    def __init__(self, world, bounding_box=[0, 0, 0, 0], max_time=None):
+    def __init__(self, world, bounding_box=[0, 0, 0, 0], max_time=None, run_info=None):
         """Initializes a Simulation Layer
 
         :param world: Esper world object
         :param bounding_box: array containing the positions of the initial view bounds in format [north, west, south, east]
         :param max_time: maximum time the simulation has to run (defaul None). If None, the simulation will never stop
+        :param run_info: the run information of the simulation, defaults to the default RunInfo instance
         """
         self.world = world
         self.renderers = []
-        self.run_info = RunInfo.get_instance()
+        self.run_info = RunInfo.get_instance() if run_info is None else run_info
         self.end_time = max_time
 
         self.bounding_box = BoundingBox(
@@ -0,0 +1,157 @@
+import logging
+import sys
+import threading
+import time
+from collections import deque
+
+# Levels of the console messages, the ones of the logging module
+LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+}
+
+
+class ConsoleLogger:
+    """Writes the verbose output of the simulation from a background thread.
+
+    Logging a message only appends a record to a bounded buffer: the
+    message is formatted and written by a writer thread, which wakes up
+    every flush_interval seconds and writes the pending messages in
+    batches. The messages below the level of the logger are ignored, the
+    ones logged while the buffer is full or above the rate limit are
+    dropped, and their number is written once the writer catches up.
+    """
+
+    def __init__(
+        self,
+        level=logging.DEBUG,
+        max_rate=None,
+        capacity=100000,
+        batch_size=1000,
+        flush_interval=0.1,
+        output=None,
+    ):
+        """
+        :param level: minimum level of the written messages, see LEVELS
+        :param max_rate: maximum number of messages written per second,
+            None for no limit
+        :param capacity: maximum number of messages waiting to be written
+        :param batch_size: maximum number of messages written at once
+        :param flush_interval: seconds between two wake-ups of the writer
+        :param output: the stream the messages are written to, defaults to
+            sys.stdout
+        """
+        assert max_rate is None or max_rate > 0, "The rate limit should be > 0"
+        assert capacity > 0, "The capacity should be > 0"
+        assert batch_size > 0, "The batch size should be > 0"
+
+        self.level = level
+        self.max_rate = max_rate
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.output = sys.stdout if output is None else output
+
+        # Number of messages dropped since the last ones were reported
+        self.dropped = 0
+        self._overflow = 0
+        self._reported_overflow = 0
+
+        # Messages allowed by the rate limit before refilling it
+        self._allowance = max_rate
+        self._last_refill = time.monotonic()
+
+        self._records = deque()
+        self._closing = threading.Event()
+        self._writer = threading.Thread(
+            target=self._run, name="console-logger", daemon=True
+        )
+        self._writer.start()
+
+    @property
+    def closed(self):
+        return self._closing.is_set()
+
+    def log(self, level, formatter, *args):
+        """Logs a message, it is written later by the writer thread
+
+        :param level: the level of the message, see LEVELS
+        :param formatter: function f(timestamp, *args) returning the message,
+            with the wall time at which the message was logged
+        :param args: the arguments of the formatter, they should not change
+            until the message is written
+        """
+        if level < self.level:
+            return
+
+        if len(self._records) >= self.capacity:
+            self._overflow += 1
+            return
+
+        self._records.append((time.time(), formatter, args))
+
+    def close(self):
+        """Writes the pending messages and stops the writer thread"""
+        if self.closed:
+            return
+
+        self._closing.set()
+        self._writer.join()
+
+    def _run(self):
+        while True:
+            closing = self._closing.wait(self.flush_interval)
+
+            self._write_pending()
+
+            if closing:
+                return
+
+    def _write_pending(self):
+        while True:
+            batch = []
+
+            while self._records and len(batch) < self.batch_size:
+                timestamp, formatter, args = self._records.popleft()
+
+                if self._allow():
+                    batch.append(formatter(timestamp, *args))
+                else:
+                    self.dropped += 1
+
+            overflow = self._overflow - self._reported_overflow
+
+            if overflow > 0:
+                self._reported_overflow += overflow
+                self.dropped += overflow
+
+            # The dropped messages are reported once the buffer is drained
+            if self.dropped > 0 and not self._records:
+                batch.append(f"[{self.dropped} console messages dropped]")
+                self.dropped = 0
+
+            if batch:
+                self.output.write("\n".join(batch) + "\n")
+                self.output.flush()
+
+            if not self._records:
+                return
+
+    def _allow(self):
+        if self.max_rate is None:
+            return True
+
+        now = time.monotonic()
+        self._allowance = min(
+            self.max_rate,
+            self._allowance + (now - self._last_refill) * self.max_rate,
+        )
+        self._last_refill = now
+
+        if self._allowance < 1:
+            return False
+
+        self._allowance -= 1
+
+        return True
@@ -0,0 +1,158 @@
+import copy
+import csv
+import logging
+import time
+from datetime import datetime
+
+from colored import attr, fg
+
+from environment import RunInfo
+
+
+class EventLogger:
+    """Base class of the loggers of the vessel, tug and pilot events.
+
+    The logs map the id of every entity to its name, its static information
+    (e.g. its VesselInfo, copied once when its first event is logged) and
+    its events. The events are kept until log_to_csv writes them, or, after
+    stream_to, written to the csv file as soon as they are logged, so that
+    the memory of long runs does not grow with their events.
+    """
+
+    # The class of the events, the entity id column and the labels of the
+    # entities and of the verbose output, set by the subclasses
+    event_class = None
+    id_column = None
+    entity_label = None
+    label = None
+
+    # Level of the verbose output of the events, see log.console.LEVELS
+    level = logging.INFO
+
+    def __init__(self, run_info=None):
+        """
+        :param run_info: the run information the events are timed with,
+            defaults to the default RunInfo instance
+        """
+        if run_info is None:
+            run_info = RunInfo.get_instance()
+
+        self.run_info = run_info
+        self._verbose = False
+        self.logs = {}
+
+        # The ConsoleLogger writing the verbose output, if None the events
+        # are printed as they are logged
+        self.console = None
+
+        # Functions f(entity id, event) called with every logged event
+        self.listeners = []
+
+        self._stream_file = None
+        self._stream_writer = None
+
+    def clear(self):
+        """Removes all the logged events"""
+        self.logs = {}
+
+    @property
+    def verbose(self):
+        return self._verbose
+
+    @verbose.setter
+    def verbose(self, verbose):
+        self._verbose = verbose
+
+    @property
+    def streaming(self):
+        return self._stream_writer is not None
+
+    def entity_name(self, ent, info):
+        return f"{self.entity_label} {ent}"
+
+    def _print_name(self, ent, info):
+        return self.entity_name(ent, info)
+
+    def log_event(self, ent, info, event):
+        entity_id = str(ent)
+        entity_log = self.logs.get(entity_id)
+
+        if entity_log is None:
+            entity_log = self.logs[entity_id] = {
+                "name": self.entity_name(ent, info),
+                "info": copy.copy(info),
+                "events": [],
+            }
+
+        if self._stream_writer is None:
+            entity_log["events"].append(event)
+        else:
+            self._stream_writer.writerow(
+                [entity_id]
+                + event.to_list(entity_log["info"], self.run_info.start_timestamp())
+            )
+
+        for listener in self.listeners:
+            listener(entity_id, event)
+
+        if self.verbose:
+            if self.console is None:
+                self._print_event(ent, info, event)
+            else:
+                self.console.log(self.level, self._format_event, ent, info, event)
+
+    def _print_event(self, ent, info, event):
+        print(self._format_event(time.time(), ent, info, event))
+
+    def _format_event(self, timestamp, ent, info, event):
+        out_name = self._print_name(ent, info)
+
+        if len(out_name) < 32:
+            out_name = out_name + " " * (32 - len(out_name))
+
+        event_log = event.to_log_string(self.run_info.start_timestamp(), colored=True)
+
+        formatted_date = datetime.fromtimestamp(timestamp).strftime(
+            "%m/%d/%Y, %H:%M:%S"
+        )
+        event_string = f"[{formatted_date} : {self.label}] "
+        event_string += f"{fg(45)}{out_name}{attr(0)}\t{event_log}"
+
+        return event_string
+
+    def _csv_writer(self, out_file):
+        csv_writer = csv.writer(out_file, delimiter=";", quoting=csv.QUOTE_MINIMAL)
+
+        # Add header
+        csv_writer.writerow([self.id_column] + self.event_class.csv_header())
+
+        return csv_writer
+
+    def stream_to(self, out_filename):
+        """Writes the events to a csv file as they are logged, instead of
+        keeping them until log_to_csv. The file is complete once
+        close_stream is called."""
+        assert not self.streaming, "The events are already streamed"
+
+        self._stream_file = open(out_filename, "w")
+        self._stream_writer = self._csv_writer(self._stream_file)
+
+    def close_stream(self):
+        """Closes the csv file the events are streamed to"""
+        if self._stream_file is not None:
+            self._stream_file.close()
+
+        self._stream_file = None
+        self._stream_writer = None
+
+    def log_to_csv(self, out_filename):
+        """Exports the logged events as a csv file."""
+        with open(out_filename, "w") as out_file:
+            csv_writer = self._csv_writer(out_file)
+
+            for entity_id, entity_log in self.logs.items():
+                for e in entity_log["events"]:
+                    csv_writer.writerow(
+                        [entity_id]
+                        + e.to_list(entity_log["info"], self.run_info.start_timestamp())
+                    )
@@ -0,0 +1,33 @@
+# Interned event types: every event stores the small integer code of its type
+# instead of its own copy of the type string
+_codes = {}
+_event_types = []
+_transition_codes = {}
+
+
+def event_code(event_type):
+    """Returns the code of an event type, e.g. "incoming → going_to_berth",
+    registering the type on its first use"""
+    code = _codes.get(event_type)
+
+    if code is None:
+        code = _codes[event_type] = len(_event_types)
+        _event_types.append(event_type)
+
+    return code
+
+
+def transition_code(src, dst):
+    """Returns the code of the event type of a state change, without
+    formatting its type string after the first time"""
+    code = _transition_codes.get((src, dst))
+
+    if code is None:
+        code = _transition_codes[(src, dst)] = event_code(f"{src} → {dst}")
+
+    return code
+
+
+def event_type(code):
+    """Returns the event type of a code"""
+    return _event_types[code]
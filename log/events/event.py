@@ -0,0 +1,85 @@
+from datetime import datetime
+
+from colored import attr, fg
+
+from .codes import event_code, event_type
+
+
+class Event:
+    """Base class of the events of the vessels, tugs and pilots.
+
+    An event only holds what may change between two events of an entity:
+    the static information of the entity (e.g. its VesselInfo) is kept
+    once per entity by the event logger, and the type of the event is an
+    interned code (see log.events.codes).
+    """
+
+    __slots__ = ("code", "speed", "timestamp")
+
+    def __init__(self, event_type, speed, timestamp):
+        """
+        :param event_type: the type of the event, or its code
+        :param speed: the speed of the entity
+        :param timestamp: the time of the event
+        """
+        if timestamp is None:
+            raise ValueError("The timestamp cannot be null!")
+
+        self.code = (
+            event_type if isinstance(event_type, int) else event_code(event_type)
+        )
+        self.speed = speed
+        self.timestamp = timestamp
+
+    @property
+    def event_type(self):
+        return event_type(self.code)
+
+    @property
+    def date(self):
+        return datetime.fromtimestamp(self.timestamp)
+
+    def simulation_time(self, simulation_start_timestamp):
+        return self.date - datetime.fromtimestamp(simulation_start_timestamp)
+
+    def __repr__(self):
+        return f"<{type(self).__name__}: {self.event_type} | {self.date}>"
+
+    def to_log_string(self, simulation_start_timestamp, colored=False):
+        event_type = self.event_type.upper()
+        sim_time = self.simulation_time(simulation_start_timestamp)
+
+        if colored:
+            return f"{fg(178)}{event_type}{attr(0)} @ {sim_time}"
+
+        return f"{event_type}, {sim_time}"
+
+    def to_list(self, info, simulation_start_timestamp):
+        """Returns the csv row of the event
+
+        :param info: the static information of the entity, e.g. its TugInfo
+        :param simulation_start_timestamp: the start time of the simulation
+        """
+        return [
+            self.timestamp,
+            self.simulation_time(simulation_start_timestamp).total_seconds(),
+            info.length,
+            info.width,
+            info.max_draught,
+            info.actual_draught,
+            self.speed,
+            self.event_type.upper(),
+        ]
+
+    @classmethod
+    def csv_header(cls):
+        return [
+            "timestamp",
+            "simulation_timestamp",
+            "length",
+            "width",
+            "max_draught",
+            "actual_draught",
+            "speed",
+            "event",
+        ]
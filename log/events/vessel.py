@@ -1,41 +1,28 @@
-from datetime import datetime
+from .event import Event
 
-from colored import attr, fg
 
+class VesselEvent(Event):
+    __slots__ = ("pilot", "tugs", "berth", "anchorage")
 
-class VesselEvent:
-    def __init__(
-        self, event_type, vessel_info, velocity, pilot, tug, berth, anchorage, timestamp
-    ):
-        if timestamp is None:
-            raise ValueError("The timestamp cannot be null!")
+    def __init__(self, event_type, speed, pilot, tugs, berth, anchorage, timestamp):
+        """
+        :param event_type: the type of the event, or its code
+        :param speed: the speed of the vessel
+        :param pilot: the pilot of the vessel, if any
+        :param tugs: the tuple of the tugs of the vessel, if any
+        :param berth: the id of the destination berth, if any
+        :param anchorage: the id of the destination anchorage, if any
+        :param timestamp: the time of the event
+        """
+        super().__init__(event_type, speed, timestamp)
 
-        self.vessel_info = vessel_info
-        self.velocity = velocity
         self.pilot = pilot
-        self.tug = tug
+        self.tugs = tugs
         self.berth = berth
         self.anchorage = anchorage
-        self.event_type = event_type
-        self.timestamp = timestamp
-
-    @property
-    def date(self):
-        return datetime.fromtimestamp(self.timestamp)
-
-    def __repr__(self):
-        return f"<Vessel Event: {self.event_type} | {self.date}>"
 
     def to_log_string(self, simulation_start_timestamp, colored=False):
-        event_type = self.event_type.upper()
-        sim_time = self.date - datetime.fromtimestamp(simulation_start_timestamp)
-
-        out_string = ""
-
-        if colored:
-            out_string = f"{fg(178)}{event_type}{attr(0)} @ {sim_time}"
-        else:
-            out_string = f"{event_type}, {sim_time}"
+        out_string = super().to_log_string(simulation_start_timestamp, colored)
 
         if self.pilot is not None:
             out_string = f"{out_string} | Pilot: {self.pilot}"
@@ -48,27 +35,29 @@ class VesselEvent:
 
         return out_string
 
-    def to_list(self, simulation_start_timestamp):
-        event_type = self.event_type.upper()
-        sim_time = self.date - datetime.fromtimestamp(simulation_start_timestamp)
+    def to_list(self, info, simulation_start_timestamp):
+        """Returns the csv row of the event
 
+        :param info: the VesselInfo of the vessel
+        :param simulation_start_timestamp: the start time of the simulation
+        """
         return [
             self.timestamp,
-            sim_time.total_seconds(),
-            self.vessel_info.length,
-            self.vessel_info.width,
-            self.vessel_info.max_draught,
-            self.vessel_info.actual_draught,
-            self.vessel_info.vessel_class.value,
-            self.vessel_info.vessel_type.value,
-            self.velocity.velocity,
-            self.vessel_info.pilot_required,
-            self.vessel_info.number_of_tugboats,
+            self.simulation_time(simulation_start_timestamp).total_seconds(),
+            info.length,
+            info.width,
+            info.max_draught,
+            info.actual_draught,
+            info.vessel_class.value,
+            info.vessel_type.value,
+            self.speed,
+            info.pilot_required,
+            info.number_of_tugboats,
             self.pilot,
-            self.tug,
+            None if self.tugs is None else list(self.tugs),
             self.berth,
             self.anchorage,
-            event_type,
+            self.event_type.upper(),
         ]
 
     @classmethod
@@ -1,73 +1,41 @@
-import csv
-from datetime import datetime
-
 from colored import attr, fg
 
-from environment import RunInfo
+from log.event_logger import EventLogger
 from log.events.vessel import VesselEvent
 
 
-class VesselEventLogger:
+class VesselEventLogger(EventLogger):
     __instance = None
 
+    event_class = VesselEvent
+    id_column = "vessel_id"
+    label = "Vessels"
+
     @staticmethod
     def get_instance():
+        """Returns the default instance, used when no SimulationContext is given"""
         if VesselEventLogger.__instance is None:
-            VesselEventLogger()
+            VesselEventLogger.__instance = VesselEventLogger()
 
         return VesselEventLogger.__instance
 
-    def __init__(self):
-        """Private constructor."""
-        if VesselEventLogger.__instance != None:
-            raise Exception("This class is a singleton!")
-        else:
-            VesselEventLogger.__instance = self
-
-            self._verbose = False
-            self.vessel_logs = {}
-
     @property
-    def verbose(self):
-        return self._verbose
-
-    @verbose.setter
-    def verbose(self, verbose):
-        self._verbose = verbose
-
-    def log_event(self, ent, vessel_info, event: VesselEvent):
-        if str(ent) not in self.vessel_logs:
-            self.vessel_logs[str(ent)] = {"name": vessel_info.name, "events": []}
-
-        self.vessel_logs[str(ent)]["events"].append(event)
-
-        if self.verbose:
-            self._print_event(ent, vessel_info, event)
+    def vessel_logs(self):
+        return self.logs
 
-    def _print_event(self, ent, vessel_info, event):
-        out_name = f"{vessel_info.name} ({ent})"
+    def entity_name(self, ent, vessel_info):
+        return vessel_info.name
 
-        if len(out_name) < 32:
-            out_name = out_name + " " * (32 - len(out_name))
-
-        event_log = event.to_log_string(
-            RunInfo.get_instance().start_timestamp(), colored=True
-        )
-
-        formatted_date = datetime.now().strftime("%m/%d/%Y, %H:%M:%S")
-        event_string = f"[{formatted_date} : Vessels] "
-        event_string += f"{fg(45)}{out_name}{attr(0)}\t{event_log}"
-
-        print(event_string)
+    def _print_name(self, ent, vessel_info):
+        return f"{vessel_info.name} ({ent})"
 
     def log_to_string(self, colored=False):
         """Write out the logged files to a string."""
 
         out_string = ""
 
-        for vessel_id in self.vessel_logs.keys():
-            vessel_data = self.vessel_logs[vessel_id]
-            vessel_info = self.vessel_logs[vessel_id]["events"][0].vessel_info
+        for vessel_id, vessel_data in self.vessel_logs.items():
+            vessel_info = vessel_data["info"]
 
             if colored:
                 out_string = f"{out_string}{fg(45)}{vessel_data['name']}{attr(0)} ({vessel_id}):\n"
@@ -78,27 +46,10 @@ class VesselEventLogger:
 
             for event in vessel_data["events"]:
                 event_log = event.to_log_string(
-                    RunInfo.get_instance().start_timestamp(), colored=colored
+                    self.run_info.start_timestamp(), colored=colored
                 )
                 out_string = f"{out_string}  - {event_log}\n"
 
             out_string = f"{out_string}\n"
 
         return out_string
-
-    def log_to_csv(self, out_filename):
-        """Exports the logged events as a csv file."""
-
-        with open(out_filename, "w") as out_file:
-            csv_writer = csv.writer(out_file, delimiter=";", quoting=csv.QUOTE_MINIMAL)
-
-            # Add header
-            csv_writer.writerow(["vessel_id"] + VesselEvent.csv_header())
-
-            for ent in self.vessel_logs.keys():
-                events = self.vessel_logs[ent]["events"]
-
-                for e in events:
-                    csv_writer.writerow(
-                        [ent] + e.to_list(RunInfo.get_instance().start_timestamp())
-                    )
@@ -1,17 +1,76 @@
+import math
+
+import numpy as np
+
 from components import Velocity
 from components.fsm import SpeedStateMachine
-from environment import RunInfo
+from environment.context import SimulationContext
 from environment.queries import fetch_vessels
 from processors.ais.model.ais_log import AISPositionLogger
 from processors.base_processor import BaseProcessor
 
 
 class AISVesselLogProcessor(BaseProcessor):
-    def __init__(self):
-        self.logger = AISPositionLogger()
+    def __init__(self, logger=None, context=None):
+        """
+        :param logger: the AIS position logger to use, by default the
+            logs are kept in memory by an AISPositionLogger
+        :param context: the simulation context, defaults to SimulationContext.default()
+        """
+        context = context or SimulationContext.default()
+
+        self.logger = AISPositionLogger() if logger is None else logger
+        self.run_info = context.run_info
+        self.idle_speeds = context.idle_speeds
+
+    def idle_steps(self, dt):
+        # Logging positions does not change the simulation state
+        return math.inf
+
+    def _process_idle(self, dt, steps):
+        # The vessels do not move, but the speed of the vessels without a
+        # route changes in every step, see IdleSpeeds
+        smoothed_speeds = self.idle_speeds.history(steps)
+
+        entities, lonlats, velocities, courses = [], [], [], []
+        speed_fsm_states, states = [], []
 
-    def _process(self, dt):
         for ent, (pos, _, cs, vel, _, fsm, _) in fetch_vessels(self.world):
+            if ent in smoothed_speeds:
+                step_velocities = smoothed_speeds[ent][:steps]
+            else:
+                step_velocities = np.full(steps, vel.velocity, dtype=float)
+
+            speed_fsm = self.world.try_component(ent, SpeedStateMachine)
+
+            if speed_fsm is not None:
+                # Update the velocities to match the speed FSM state
+                step_velocities = speed_fsm.update_input_velocity(step_velocities)
+
+            entities.append(ent)
+            lonlats.append(pos.lonlat)
+            velocities.append(step_velocities)
+            courses.append(cs.course)
+            speed_fsm_states.append(None if speed_fsm is None else speed_fsm.current())
+            states.append(fsm.current())
+
+        self.processed_entities = len(entities)
+
+        self.logger.add_logs(
+            entities,
+            np.array(lonlats),
+            np.array(velocities).T,
+            courses,
+            speed_fsm_states,
+            self.run_info.simulation_times(steps),
+            states,
+        )
+
+    def _process(self, dt):
+        vessels = fetch_vessels(self.world)
+        self.processed_entities = len(vessels)
+
+        for ent, (pos, _, cs, vel, _, fsm, _) in vessels:
             try:
                 speed_fsm = self.world.component_for_entity(ent, SpeedStateMachine)
                 speed_fsm_state = speed_fsm.current()
@@ -27,6 +86,6 @@ class AISVesselLogProcessor(BaseProcessor):
                 vel,
                 cs,
                 speed_fsm_state,
-                RunInfo.get_instance().simulation_time(),
+                self.run_info.simulation_time(),
                 state=fsm.current(),
             )
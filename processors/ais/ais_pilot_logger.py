@@ -1,21 +1,61 @@
-from environment import RunInfo
+import math
+
+import numpy as np
+
+from environment.context import SimulationContext
 from environment.queries import fetch_pilots
 from processors.ais.model.ais_log import AISPositionLogger
 from processors.base_processor import BaseProcessor
 
 
 class AISPilotLogProcessor(BaseProcessor):
-    def __init__(self):
-        self.logger = AISPositionLogger()
+    def __init__(self, logger=None, context=None):
+        """
+        :param logger: the AIS position logger to use, by default the
+            logs are kept in memory by an AISPositionLogger
+        :param context: the simulation context, defaults to SimulationContext.default()
+        """
+        self.logger = AISPositionLogger() if logger is None else logger
+        self.run_info = (context or SimulationContext.default()).run_info
+
+    def idle_steps(self, dt):
+        # Logging positions does not change the simulation state
+        return math.inf
+
+    def _process_idle(self, dt, steps):
+        # The pilots do not move while idle, their logs are added at once
+        entities, lonlats, velocities, courses, states = [], [], [], [], []
 
-    def _process(self, dt):
         for ent, (pos, cs, vel, _, fsm, _) in fetch_pilots(self.world):
+            entities.append(ent)
+            lonlats.append(pos.lonlat)
+            velocities.append(vel.velocity)
+            courses.append(cs.course)
+            states.append(fsm.current())
+
+        self.processed_entities = len(entities)
+
+        self.logger.add_logs(
+            entities,
+            np.array(lonlats),
+            np.tile(velocities, (steps, 1)),
+            courses,
+            [None] * len(entities),
+            self.run_info.simulation_times(steps),
+            states,
+        )
+
+    def _process(self, dt):
+        pilots = fetch_pilots(self.world)
+        self.processed_entities = len(pilots)
+
+        for ent, (pos, cs, vel, _, fsm, _) in pilots:
             self.logger.add_log(
                 ent,
                 pos,
                 vel,
                 cs,
                 None,
-                RunInfo.get_instance().simulation_time(),
+                self.run_info.simulation_time(),
                 state=fsm.current(),
             )
@@ -1,2 +1,2 @@
-from .ais_log import AISPositionLogger
+from .ais_log import AISPositionLogger, ColumnarAISPositionLogger
 from .section_log import SectionLogger
@@ -1,3 +1,8 @@
+import csv
+
+import numpy as np
+
+
 class AISPositionLogger:
     """Class that is used to log AIS-like simulator output data."""
 
@@ -18,6 +23,48 @@ class AISPositionLogger:
             ]
         )
 
+    def add_logs(
+        self,
+        entities,
+        lonlats,
+        velocities,
+        courses,
+        speed_fsm_states,
+        timestamps,
+        states,
+    ):
+        """Logs the same entities at several timestamps, one log per entity
+        and timestamp, in timestamp order
+
+        :param entities: the ids of the n logged entities
+        :param lonlats: (n, 2) array of their positions
+        :param velocities: (len(timestamps), n) array of their velocity at
+            every timestamp
+        :param courses: their n courses
+        :param speed_fsm_states: their n speed states
+        :param timestamps: the timestamps
+        :param states: their n states
+        """
+        if len(entities) == 0:
+            return
+
+        lons = lonlats[:, 0].tolist()
+        lats = lonlats[:, 1].tolist()
+
+        for timestamp, step_velocities in zip(timestamps, velocities.tolist()):
+            self.logs.extend(
+                [ent, lon, lat, velocity, course, speed_fsm_state, timestamp, state]
+                for ent, lon, lat, velocity, course, speed_fsm_state, state in zip(
+                    entities,
+                    lons,
+                    lats,
+                    step_velocities,
+                    courses,
+                    speed_fsm_states,
+                    states,
+                )
+            )
+
     def header(self):
         return [
             [
@@ -34,3 +81,182 @@ class AISPositionLogger:
 
     def clear(self):
         self.logs = []
+
+
+class ColumnarAISPositionLogger(AISPositionLogger):
+    """AIS-like simulator output logger with bounded memory.
+
+    The logs are stored in preallocated column buffers that are
+    flushed to disk every time they are full, either appended to a
+    CSV file or written as compressed NumPy (.npz) column chunks.
+    It can be used in place of an AISPositionLogger by the AIS
+    log processors.
+    """
+
+    FORMATS = ["csv", "npz"]
+
+    def __init__(self, filename, chunk_size=100000, output_format="csv"):
+        """
+        :param filename: the CSV file to write, or the prefix of the
+            chunk files (<filename>.<chunk id>.npz) for the npz format
+        :param chunk_size: number of logs kept in memory before flushing
+        :param output_format: the output format, either csv or npz
+        """
+        assert chunk_size > 0, "The chunk size must be positive!"
+        assert (
+            output_format in self.FORMATS
+        ), f"Unknown output format {output_format}, expected one of {self.FORMATS}"
+
+        self.filename = filename
+        self.chunk_size = chunk_size
+        self.output_format = output_format
+
+        self.entity = np.empty(chunk_size, dtype=np.int64)
+        self.lon = np.empty(chunk_size, dtype=float)
+        self.lat = np.empty(chunk_size, dtype=float)
+        self.velocity = np.empty(chunk_size, dtype=float)
+        self.course = np.empty(chunk_size, dtype=float)
+        self.timestamp = np.empty(chunk_size, dtype=float)
+
+        # States are stored as codes of the (few) distinct state names
+        self.speed_fsm_state = np.empty(chunk_size, dtype=np.int32)
+        self.state = np.empty(chunk_size, dtype=np.int32)
+        self._state_codes = {None: 0}
+        self._state_names = [None]
+
+        self.size = 0
+        self.chunks_count = 0
+
+        if self.output_format == "csv":
+            # Start from an empty file with just the header
+            with open(self.filename, "w") as out_file:
+                csv.writer(out_file).writerows(self.header())
+
+    @property
+    def logs(self):
+        """The logs that were not flushed to disk yet"""
+        return [list(row) for row in self._rows()]
+
+    def add_log(self, ent, pos, vel, course, speed_fsm_state, timestamp, state=None):
+        if self.size == self.chunk_size:
+            self.flush()
+
+        i = self.size
+
+        self.entity[i] = ent
+        self.lon[i] = pos.lonlat[0]
+        self.lat[i] = pos.lonlat[1]
+        self.velocity[i] = vel.velocity
+        self.course[i] = course.course
+        self.speed_fsm_state[i] = self._state_code(speed_fsm_state)
+        self.timestamp[i] = timestamp
+        self.state[i] = self._state_code(state)
+
+        self.size += 1
+
+    def add_logs(
+        self,
+        entities,
+        lonlats,
+        velocities,
+        courses,
+        speed_fsm_states,
+        timestamps,
+        states,
+    ):
+        n = len(entities)
+        steps = len(timestamps)
+
+        if n == 0 or steps == 0:
+            return
+
+        # The columns of the logs, by timestamp and then by entity
+        columns = [
+            (self.entity, np.tile(entities, steps)),
+            (self.lon, np.tile(lonlats[:, 0], steps)),
+            (self.lat, np.tile(lonlats[:, 1], steps)),
+            (self.velocity, np.asarray(velocities, dtype=float).ravel()),
+            (self.course, np.tile(courses, steps)),
+            (
+                self.speed_fsm_state,
+                np.tile([self._state_code(s) for s in speed_fsm_states], steps),
+            ),
+            (self.timestamp, np.repeat(timestamps, n)),
+            (self.state, np.tile([self._state_code(s) for s in states], steps)),
+        ]
+
+        logged = 0
+
+        # The buffers are filled and flushed as by add_log
+        while logged < n * steps:
+            if self.size == self.chunk_size:
+                self.flush()
+
+            count = min(n * steps - logged, self.chunk_size - self.size)
+
+            for buffer, values in columns:
+                buffer[self.size : self.size + count] = values[logged : logged + count]
+
+            self.size += count
+            logged += count
+
+    def flush(self):
+        """Writes the buffered logs to disk and empties the buffers"""
+        if self.size == 0:
+            return
+
+        if self.output_format == "csv":
+            with open(self.filename, "a") as out_file:
+                csv.writer(out_file).writerows(self._rows())
+        else:
+            names = np.array(
+                ["" if name is None else name for name in self._state_names]
+            )
+
+            np.savez_compressed(
+                f"{self.filename}.{self.chunks_count:05d}.npz",
+                entity=self.entity[: self.size],
+                lon=self.lon[: self.size],
+                lat=self.lat[: self.size],
+                velocity=self.velocity[: self.size],
+                course=self.course[: self.size],
+                speed_fsm_state=names[self.speed_fsm_state[: self.size]],
+                timestamp=self.timestamp[: self.size],
+                state=names[self.state[: self.size]],
+            )
+
+        self.chunks_count += 1
+        self.size = 0
+
+    def close(self):
+        """Writes the remaining logs to disk"""
+        self.flush()
+
+    def clear(self):
+        self.size = 0
+
+    def _state_code(self, name):
+        code = self._state_codes.get(name)
+
+        if code is None:
+            code = len(self._state_names)
+
+            self._state_codes[name] = code
+            self._state_names.append(name)
+
+        return code
+
+    def _rows(self):
+        n = self.size
+        names = self._state_names
+
+        return zip(
+            self.entity[:n].tolist(),
+            self.lon[:n].tolist(),
+            self.lat[:n].tolist(),
+            self.velocity[:n].tolist(),
+            self.course[:n].tolist(),
+            [names[code] for code in self.speed_fsm_state[:n].tolist()],
+            self.timestamp[:n].tolist(),
+            [names[code] for code in self.state[:n].tolist()],
+        )
@@ -7,6 +7,14 @@ class SectionLogger:
     def add_log(self, section, timestamp):
         self.logs.append([section.name, timestamp])
 
+    def add_logs(self, sections, timestamps):
+        """Logs the same sections at several timestamps, in timestamp order"""
+        self.logs.extend(
+            [section.name, timestamp]
+            for timestamp in timestamps
+            for section in sections
+        )
+
     def header(self):
         return [["name", "timestamp"]]
 
@@ -1,13 +1,34 @@
-from environment import RunInfo
-from environment.navigation.sections import SectionManager
+import math
+
+from environment.context import SimulationContext
 from processors.ais.model import SectionLogger
 from processors.base_processor import BaseProcessor
 
 
 class SectionsLogProcessor(BaseProcessor):
-    def __init__(self):
+    def __init__(self, context=None):
+        """
+        :param context: the simulation context, defaults to SimulationContext.default()
+        """
+        context = context or SimulationContext.default()
+
         self.logger = SectionLogger()
+        self.run_info = context.run_info
+        self.section_manager = context.section_manager
+
+    def idle_steps(self, dt):
+        # Logging sections does not change the simulation state
+        return math.inf
+
+    def _process_idle(self, dt, steps):
+        self.processed_entities = len(self.section_manager.sections)
+
+        self.logger.add_logs(
+            self.section_manager.sections, self.run_info.simulation_times(steps)
+        )
 
     def _process(self, dt):
-        for section in SectionManager.get_instance().sections:
-            self.logger.add_log(section, RunInfo.get_instance().simulation_time())
+        self.processed_entities = len(self.section_manager.sections)
+
+        for section in self.section_manager.sections:
+            self.logger.add_log(section, self.run_info.simulation_time())
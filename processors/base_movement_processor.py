@@ -1,22 +1,36 @@
 import numpy as np
 
 from processors.base_processor import BaseProcessor
-from processors.utils import knots_to_coords_sec, smooth_course
+from processors.utils import advance_positions, smooth_course
 
 
 class BaseMovementProcessor(BaseProcessor):
-    def update_position(self, vessel_path, pos, vel, course, dt):
-        # Calculate direction
-        target = vessel_path.get_current_destination()
-        direction = np.array([target[0] - pos.lon(), target[1] - pos.lat()])
+    def update_positions(self, moving, dt):
+        """Moves a batch of entities towards their current destination in a
+        single vectorized step, updating their position and course
 
-        direction = direction / np.linalg.norm(direction)
-        velocity = knots_to_coords_sec(vel.velocity)
+        :param moving: list of (destination, position, velocity, course) tuples
+        :param dt: the elapsed seconds
+        :return: the (n, 2) array of the unit directions of the entities
+        """
+        self.processed_entities = len(moving)
 
-        # Move the vessel
-        pos.update_position(pos.lonlat + direction * velocity * dt)
+        if len(moving) == 0:
+            return np.empty((0, 2))
 
-        course.prev_course = course.course
-        course.course = smooth_course(direction, course.course)
+        targets = np.array([target for target, _, _, _ in moving])
+        positions = np.array([pos.lonlat for _, pos, _, _ in moving])
+        speeds = np.array([vel.velocity for _, _, vel, _ in moving], dtype=float)
 
-        return direction
+        positions, directions = advance_positions(positions, targets, speeds, dt)
+
+        for (_, pos, _, course), lonlat, direction in zip(
+            moving, positions, directions.tolist()
+        ):
+            # Move the entity
+            pos.update_position(lonlat)
+
+            course.prev_course = course.course
+            course.course = smooth_course(direction, course.course)
+
+        return directions
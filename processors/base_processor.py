@@ -1,27 +1,70 @@
 import sys
+import time
 
 import esper
 
 
 class BaseProcessor(esper.Processor):
-    def process(self, dt):
+    # The TickProfiler recording the steps of the processor, if any
+    profiler = None
+
+    # Number of entities handled in the last step, reported to the profiler.
+    # None if the processor does not count them
+    processed_entities = None
+
+    def process(self, dt, idle_steps=0):
         """
         This method, called by world.process(), is just a wrapper that
         catches exceptions before they are propagated to a container
         layer, thus we can see the actual error instead of a 'GLException'.
         Do NOT override this method in your subclasses, override _process()
-        instead
+        instead.
+
+        If idle_steps > 0 the next idle_steps steps are processed at once
+        with _process_idle(), this is only allowed within the number of
+        steps returned by idle_steps()
+
+        If a profiler is set, the wall time of the step is recorded.
         """
+        if self.profiler is not None:
+            start = time.perf_counter()
+
         try:
-            self._process(dt)
+            if idle_steps > 0:
+                self._process_idle(dt, idle_steps)
+            else:
+                self._process(dt)
         except Exception as ex:
             print(ex)
             raise ex
             sys.exit(-1)
 
+        if self.profiler is not None:
+            self.profiler.record(self, time.perf_counter() - start)
+
     def _process(self, dt):
         """
         This method will be called by the real process function, override
         this method with your processor specific code
         """
         raise NotImplementedError()
+
+    def idle_steps(self, dt):
+        """
+        Returns for how many of the next steps of dt seconds the processor
+        is idle, assuming that all the other processors are idle as well.
+        During an idle step the processor does not change the simulation
+        state, other than in the way _process_idle() reproduces. Processors
+        that do not override this method are never idle.
+        """
+        return 0
+
+    def _process_idle(self, dt, steps):
+        """
+        This method processes the next steps idle steps at once, it must
+        have the same effect as steps regular steps. By default it processes
+        the regular steps one by one, override it with a cheaper equivalent
+        if possible
+        """
+        for _ in range(steps):
+            self._process(dt)
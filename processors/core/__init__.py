@@ -1 +1,2 @@
+from .profiler import ProfilerProcessor, TickProfiler
 from .timer import TimerProcessor
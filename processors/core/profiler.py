@@ -0,0 +1,249 @@
+import json
+import math
+import time
+from collections import deque
+
+import numpy as np
+
+from environment.context import SimulationContext
+from processors.base_processor import BaseProcessor
+
+# Upper edges (seconds) of the buckets of the tick time histograms, the
+# last bucket holds the ticks longer than the last edge
+HISTOGRAM_EDGES = (1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0)
+HISTOGRAM_LABELS = ("<10us", "<100us", "<1ms", "<10ms", "<100ms", "<1s", ">=1s")
+
+
+class ProcessorStats:
+    """Tick timings of the processors of a class"""
+
+    __slots__ = (
+        "name",
+        "ticks",
+        "calls",
+        "total_time",
+        "total_entities",
+        "tick_times",
+        "tick_entities",
+        "_pending_time",
+        "_pending_calls",
+        "_pending_entities",
+    )
+
+    def __init__(self, name, window):
+        """
+        :param name: the name of the processors
+        :param window: number of recent ticks kept for the histograms
+        """
+        self.name = name
+        self.ticks = 0
+        self.calls = 0
+        self.total_time = 0.0
+        self.total_entities = 0
+
+        # Rolling window of the most recent ticks
+        self.tick_times = deque(maxlen=window)
+        self.tick_entities = deque(maxlen=window)
+
+        self._pending_time = 0.0
+        self._pending_calls = 0
+        self._pending_entities = None
+
+    def record(self, elapsed, entities=None):
+        """Records a call in the current tick"""
+        self._pending_time += elapsed
+        self._pending_calls += 1
+
+        if entities is not None:
+            self._pending_entities = (self._pending_entities or 0) + entities
+
+    def end_tick(self):
+        """Closes the current tick, if the processors were called in it"""
+        if self._pending_calls == 0:
+            return
+
+        self.ticks += 1
+        self.calls += self._pending_calls
+        self.total_time += self._pending_time
+        self.tick_times.append(self._pending_time)
+
+        if self._pending_entities is not None:
+            self.total_entities += self._pending_entities
+            self.tick_entities.append(self._pending_entities)
+
+        self._pending_time = 0.0
+        self._pending_calls = 0
+        self._pending_entities = None
+
+    def histogram(self):
+        """Returns the number of recent ticks in every bucket, see HISTOGRAM_EDGES"""
+        buckets = np.searchsorted(HISTOGRAM_EDGES, list(self.tick_times), side="right")
+
+        return np.bincount(buckets, minlength=len(HISTOGRAM_LABELS)).tolist()
+
+    def as_dict(self):
+        tick_times = np.array(self.tick_times)
+        has_times = len(tick_times) > 0
+
+        return {
+            "ticks": self.ticks,
+            "calls": self.calls,
+            "total_time": self.total_time,
+            "mean_time": self.total_time / self.ticks if self.ticks else 0.0,
+            "median_time": float(np.median(tick_times)) if has_times else 0.0,
+            "p95_time": float(np.percentile(tick_times, 95)) if has_times else 0.0,
+            "max_time": float(tick_times.max()) if has_times else 0.0,
+            "mean_entities": (
+                float(np.mean(self.tick_entities)) if self.tick_entities else None
+            ),
+            "histogram": dict(zip(HISTOGRAM_LABELS, self.histogram())),
+        }
+
+
+class TickProfiler:
+    """Opt-in instrumentation of the simulation processors.
+
+    The instrumented processors report the wall time of each of their
+    steps, and the number of entities they handled (if they count them,
+    see BaseProcessor.processed_entities). The timings are aggregated per
+    processor class and per tick, the recent ticks are kept in rolling
+    histograms. A ProfilerProcessor closes every tick, and can print a
+    summary every report_interval simulated seconds.
+    """
+
+    def __init__(self, window=1000, report_interval=None, output=print):
+        """
+        :param window: number of recent ticks kept for the histograms
+        :param report_interval: simulated seconds between two printed
+            summaries, None to never print them
+        :param output: function called with every periodic summary
+        """
+        assert window > 0, "The histograms window should be > 0"
+        assert (
+            report_interval is None or report_interval > 0
+        ), "The report interval should be > 0"
+
+        self.window = window
+        self.report_interval = report_interval
+        self.output = output
+
+        self.stats = {}
+        self.ticks = 0
+        self.simulation_time = 0
+        self.start_time = time.perf_counter()
+        self._next_report = report_interval
+
+    def instrument(self, processors):
+        """Starts recording the steps of the given processors"""
+        for processor in processors:
+            if processor is not None:
+                processor.profiler = self
+
+    def record(self, processor, elapsed):
+        """Records a step of a processor, called by BaseProcessor.process
+
+        :param processor: the processor
+        :param elapsed: the wall time of the step in seconds
+        """
+        name = type(processor).__name__
+        stats = self.stats.get(name)
+
+        if stats is None:
+            stats = self.stats[name] = ProcessorStats(name, self.window)
+
+        stats.record(elapsed, processor.processed_entities)
+
+    def end_tick(self, simulation_time):
+        """Closes the current tick
+
+        :param simulation_time: the simulated seconds at the end of the tick
+        """
+        for stats in self.stats.values():
+            stats.end_tick()
+
+        self.ticks += 1
+        self.simulation_time = simulation_time
+
+        if self._next_report is not None and simulation_time >= self._next_report:
+            self.output(self.summary())
+
+            while self._next_report <= simulation_time:
+                self._next_report += self.report_interval
+
+    def as_dict(self):
+        """Returns the statistics of every processor class, by total time"""
+        stats = sorted(self.stats.values(), key=lambda s: s.total_time, reverse=True)
+
+        return {
+            "ticks": self.ticks,
+            "simulation_time": self.simulation_time,
+            "wall_time": time.perf_counter() - self.start_time,
+            "histogram_edges": list(HISTOGRAM_EDGES),
+            "processors": {s.name: s.as_dict() for s in stats},
+        }
+
+    def summary(self):
+        """Returns a printable table of the statistics of every processor class"""
+        profile = self.as_dict()
+        total_time = sum(s["total_time"] for s in profile["processors"].values())
+
+        lines = [
+            f"Processors timing: {profile['ticks']} ticks, "
+            f"{profile['simulation_time'] / 3600:.1f} simulated hours, "
+            f"{profile['wall_time']:.2f}s",
+            f"{'processor':<32}{'calls':>9}{'total(s)':>10}{'share':>7}"
+            f"{'mean(ms)':>10}{'p95(ms)':>9}{'max(ms)':>9}{'entities':>10}",
+        ]
+
+        for name, stats in profile["processors"].items():
+            share = stats["total_time"] / total_time if total_time > 0 else 0
+            entities = (
+                "-"
+                if stats["mean_entities"] is None
+                else f"{stats['mean_entities']:.1f}"
+            )
+
+            lines.append(
+                f"{name:<32}{stats['calls']:>9}{stats['total_time']:>10.3f}"
+                f"{share:>7.1%}{stats['mean_time'] * 1000:>10.3f}"
+                f"{stats['p95_time'] * 1000:>9.3f}{stats['max_time'] * 1000:>9.3f}"
+                f"{entities:>10}"
+            )
+            lines.append(
+                " " * 4
+                + " ".join(
+                    f"{label}:{count}" for label, count in stats["histogram"].items()
+                )
+            )
+
+        return "\n".join(lines)
+
+    def write_json(self, filename):
+        """Writes the statistics of every processor class to a JSON file"""
+        with open(filename, "w") as profile_file:
+            json.dump(self.as_dict(), profile_file, indent=2)
+
+
+class ProfilerProcessor(BaseProcessor):
+    """This processor closes the ticks of a TickProfiler, it must be the
+    last processor of the world"""
+
+    def __init__(self, profiler, context=None):
+        """
+        :param profiler: the TickProfiler
+        :param context: the simulation context, defaults to SimulationContext.default()
+        """
+        self.tick_profiler = profiler
+        self.run_info = (context or SimulationContext.default()).run_info
+
+    def idle_steps(self, dt):
+        # Profiling does not change the simulation state
+        return math.inf
+
+    def _process_idle(self, dt, steps):
+        # The idle steps skipped at once are profiled as a single tick
+        self.tick_profiler.end_tick(self.run_info.simulation_time() + steps * dt)
+
+    def _process(self, dt):
+        # The run time is updated after the step
+        self.tick_profiler.end_tick(self.run_info.simulation_time() + dt)
@@ -1,13 +1,21 @@
-from environment.queries import fetch_timers
+from environment.context import SimulationContext
 from processors.base_processor import BaseProcessor
 
 
 class TimerProcessor(BaseProcessor):
     """This processor advances the simulation timers"""
 
-    def _process(self, dt):
-        for ent, (timer,) in fetch_timers(self.world):
-            timer.update(dt)
+    def __init__(self, context=None):
+        """
+        :param context: the simulation context, defaults to SimulationContext.default()
+        """
+        self.timer_scheduler = (context or SimulationContext.default()).timer_scheduler
+
+    def idle_steps(self, dt):
+        return self.timer_scheduler.idle_steps(dt)
 
-            if timer.completed():
-                self.world.delete_entity(ent)
+    def _process_idle(self, dt, steps):
+        self.timer_scheduler.advance(dt, steps)
+
+    def _process(self, dt):
+        self.timer_scheduler.advance(dt)
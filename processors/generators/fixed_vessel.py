@@ -1,10 +1,14 @@
+import math
 import random
 from collections import namedtuple
 
 from components import Course, FrameCounter, Position, Velocity, VesselPath
 from components.fsm import (NULL_SPEED_MODEL, SpeedStateMachine,
                             VesselStateMachine)
-from processors.generators import VesselGeneratorProcessor
+from environment.context import SimulationContext
+from environment.queries import VesselIndex
+from log.events.codes import transition_code
+from processors.generators.vessel import VesselGeneratorProcessor
 from utils.shapes import random_point_in_polygon
 
 
@@ -26,19 +30,21 @@ class FixedVesselGeneratorProcessor(VesselGeneratorProcessor):
         default_speed_knots=15,
         speed_model_probabilities=NULL_SPEED_MODEL,
         anomalous_vessels_percent=0,
+        context=None,
     ):
         """
         :param world: Esper world object
         :param inter_arrival_time_sampler: a function that samples an inter-arrival time for vessels
         :param vessel_info_sampler: a function that samples vessel_info
         :param spawn_area_filename: the name of a geojson file that denotes a spawn area for vessels
-        :param run_info: RunInfo singleton object that gives access to the simulation clock
+        :param run_info: RunInfo object that gives access to the simulation clock
         :param tug_company_designator: a function that assigns tugboats based on some logic
-        :param vessel_logger: VesselEventLogger singleton that is logging events about vessels
+        :param vessel_logger: VesselEventLogger that is logging events about vessels
         :param default_speed_knots: The default velocity of a vessel in knots
         :param speed_model_probabilities: The Markov Model depicting state of vessels velocities
          (used for generating velocity anomalies)
         :param anomalous_vessels_percent: the percentage of vessels with the anomalous speed model
+        :param context: the simulation context, defaults to SimulationContext.default()
         """
         assert world is not None, "A world is required!"
         assert (
@@ -57,10 +63,24 @@ class FixedVesselGeneratorProcessor(VesselGeneratorProcessor):
         self.speed_model_probabilities = speed_model_probabilities
         self.anomalous_vessels_percent = anomalous_vessels_percent
 
+        context = context or SimulationContext.default()
+        self.timer_scheduler = context.timer_scheduler
+        self.keep_position_history = context.keep_position_history
+
         self.scheduled_vessels = self._generate_vessels_for_fixed_interval(
             run_info.end_timestamp()
         )
 
+    def idle_steps(self, dt):
+        if len(self.scheduled_vessels) == 0:
+            return math.inf
+
+        return self.run_info.steps_until(self.scheduled_vessels[0].time)
+
+    def _process_idle(self, dt, steps):
+        # No vessel is due
+        pass
+
     def _process(self, dt):
         generated_count = 0
 
@@ -100,6 +120,7 @@ class FixedVesselGeneratorProcessor(VesselGeneratorProcessor):
                     double_p=self.speed_model_probabilities["double"],
                     halve_p=self.speed_model_probabilities["half"],
                     normal_p=self.speed_model_probabilities["reset"],
+                    timer_scheduler=self.timer_scheduler,
                 )
             else:
                 speed_state_machine = None
@@ -132,18 +153,29 @@ class FixedVesselGeneratorProcessor(VesselGeneratorProcessor):
 
         self.world.add_component(vessel, Course())
         self.world.add_component(vessel, FrameCounter())
-        self.world.add_component(vessel, Position(lonlat=spawn_point))
+        self.world.add_component(
+            vessel,
+            Position(lonlat=spawn_point, keep_history=self.keep_position_history),
+        )
         self.world.add_component(vessel, velocity)
 
         if speed_fsm is not None:
             self.world.add_component(vessel, speed_fsm)
 
         vessel_state_machine.generate()
-        vessel_state_machine.fsm.onchangestate = lambda x: self._log_vessel_event(
-            vessel, vessel_info, vessel_state_machine, velocity, f"{x.src} → {x.dst}"
+        vessel_state_machine.on_state_change(
+            lambda x: self._log_vessel_event(
+                vessel,
+                vessel_info,
+                vessel_state_machine,
+                velocity,
+                transition_code(x.src, x.dst),
+            )
         )
 
         self.world.add_component(vessel, vessel_info)
         self.world.add_component(vessel, VesselPath())
 
         self.world.add_component(vessel, vessel_state_machine)
+
+        VesselIndex.for_world(self.world).add(vessel)
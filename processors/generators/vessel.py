@@ -1,5 +1,5 @@
-import copy
 import json
+import math
 import random
 
 from shapely.geometry import Polygon
@@ -7,11 +7,13 @@ from shapely.geometry import Polygon
 from components import Course, FrameCounter, Position, Velocity, VesselPath
 from components.fsm import (NULL_SPEED_MODEL, SpeedStateMachine,
                             VesselStateMachine)
-from environment import RunInfo
+from environment.context import SimulationContext
+from environment.queries import VesselIndex
+from log.events.codes import transition_code
 from log.events.vessel import VesselEvent
 from processors.base_processor import BaseProcessor
 from utils.shapes import random_point_in_polygon
-from utils.timer import SimulationTimer, TimerScheduler
+from utils.timer import SimulationTimer
 
 
 class VesselGeneratorProcessor(BaseProcessor):
@@ -30,18 +32,20 @@ class VesselGeneratorProcessor(BaseProcessor):
         default_speed_knots=15,
         speed_model_probabilities=NULL_SPEED_MODEL,
         anomalous_vessels_percent=0,
+        context=None,
     ):
         """
         :param world: Esper world object
         :param inter_arrival_time_sampler: a function that samples an inter-arrival time for vessels
         :param vessel_info_sampler: a function that samples vessel_info
         :param spawn_area_filename: the name of a geojson file that denotes a spawn area for vessels
-        :param vessel_logger: VesselEventLogger singleton that is logging events about vessels
+        :param vessel_logger: VesselEventLogger that is logging events about vessels
         :param default_speed_knots: The default velocity of a vessel in knots
         :param speed_model_probabilities: The Markov Model depicting state of vessels velocities
          (used for generating velocity anomalies)
         :param anomalous_vessels_percent: the percentage of all vessels having the anomalous velocity
         markov model attached
+        :param context: the simulation context, defaults to SimulationContext.default()
         """
         assert world is not None, "A world is required!"
         assert (
@@ -61,6 +65,11 @@ class VesselGeneratorProcessor(BaseProcessor):
         self.speed_model_probabilities = speed_model_probabilities
         self.anomalous_vessels_percent = anomalous_vessels_percent
 
+        context = context or SimulationContext.default()
+        self.run_info = context.run_info
+        self.timer_scheduler = context.timer_scheduler
+        self.keep_position_history = context.keep_position_history
+
         self._create_vessel_generation_timer()
 
     def _load_spawn_area(self, spawn_area_filename):
@@ -72,6 +81,14 @@ class VesselGeneratorProcessor(BaseProcessor):
             spawn_area_json["features"][0]["geometry"]["coordinates"]
         )
 
+    def idle_steps(self, dt):
+        # A new timer is created only once the current one is fired
+        return 0 if self.generation_timer.completed() else math.inf
+
+    def _process_idle(self, dt, steps):
+        # The generation timer is still pending
+        pass
+
     def _process(self, dt):
         if self.generation_timer.completed():
             self._create_vessel_generation_timer()
@@ -84,7 +101,7 @@ class VesselGeneratorProcessor(BaseProcessor):
         self.generation_timer = SimulationTimer(
             duration=inter_arrival_time, target_function=self.generate_vessel
         )
-        TimerScheduler.get_instance().schedule(self.generation_timer)
+        self.timer_scheduler.schedule(self.generation_timer)
 
     def generate_vessel(self):
         """Initialize the vessel and its components and add them to the world."""
@@ -98,7 +115,10 @@ class VesselGeneratorProcessor(BaseProcessor):
         vessel_info = self.vessel_info_sampler()
         velocity = Velocity(velocity=vessel_velocity)
 
-        self.world.add_component(vessel, Position(lonlat=spawn_point))
+        self.world.add_component(
+            vessel,
+            Position(lonlat=spawn_point, keep_history=self.keep_position_history),
+        )
         self.world.add_component(vessel, FrameCounter())
         self.world.add_component(vessel, Course())
         self.world.add_component(vessel, velocity)
@@ -111,31 +131,39 @@ class VesselGeneratorProcessor(BaseProcessor):
                 double_p=self.speed_model_probabilities["double"],
                 halve_p=self.speed_model_probabilities["half"],
                 normal_p=self.speed_model_probabilities["reset"],
+                timer_scheduler=self.timer_scheduler,
             )
 
             self.world.add_component(vessel, speed_fsm)
 
         vessel_state_machine = VesselStateMachine()
         vessel_state_machine.generate()
-        vessel_state_machine.fsm.onchangestate = lambda x: self._log_vessel_event(
-            vessel, vessel_info, vessel_state_machine, velocity, f"{x.src} → {x.dst}"
+        vessel_state_machine.on_state_change(
+            lambda x: self._log_vessel_event(
+                vessel,
+                vessel_info,
+                vessel_state_machine,
+                velocity,
+                transition_code(x.src, x.dst),
+            )
         )
 
         self.world.add_component(vessel, vessel_state_machine)
 
+        VesselIndex.for_world(self.world).add(vessel)
+
     def _log_vessel_event(self, ent, vessel_info, fsm, velocity, event_type):
         if self.vessel_logger is None:
             return
 
         event = VesselEvent(
             event_type,
-            copy.deepcopy(vessel_info),
-            copy.deepcopy(velocity),
-            copy.deepcopy(fsm.pilot),
-            copy.deepcopy(fsm.tugboats),
+            velocity.velocity,
+            fsm.pilot,
+            None if fsm.tugboats is None else tuple(fsm.tugboats),
             fsm.destination_berth_id,
             fsm.destination_anchorage_id,
-            RunInfo.get_instance().timestamp(),
+            self.run_info.timestamp(),
         )
 
         self.vessel_logger.log_event(ent, vessel_info, event)
@@ -1,11 +1,9 @@
-import copy
+import math
 
 from components import TugInfo, Velocity, VesselInfo
 from components.fsm import VesselStateMachine
-from environment import RunInfo
-from environment.messaging import MessageBroker
+from environment.context import SimulationContext
 from environment.messaging.types import TugMessageType, VesselMessageType
-from environment.navigation import PathFinder
 from log.vessel import VesselEvent
 from processors.base_processor import BaseProcessor
 
@@ -15,17 +13,23 @@ class HarbourMasterProcessor(BaseProcessor):
     Receives requests from vessels and handles different situations.
     """
 
-    def __init__(self, world, vessel_strategy, tug_strategy=None, logger=None):
+    def __init__(
+        self, world, vessel_strategy, tug_strategy=None, logger=None, context=None
+    ):
         """Initializes a HarbourMasterProcessor
 
         :param world: Esper simulation world.
         :param vessel_strategy: VesselStrategy instance that send and handles requests with the harbour master
         :param tug_strategy: TugStrategy instance that handles tug requests
         :param logger: event logger to which sections events will be logged
+        :param context: the simulation context, defaults to SimulationContext.default()
         """
+        context = context or SimulationContext.default()
+
         self.world = world
-        self.message_broker = MessageBroker.get_instance()
-        self.path_finder = PathFinder.get_instance()
+        self.message_broker = context.message_broker
+        self.path_finder = context.path_finder
+        self.run_info = context.run_info
         self.logger = logger
 
         self.vessel_strategy = vessel_strategy
@@ -37,16 +41,27 @@ class HarbourMasterProcessor(BaseProcessor):
             TugMessageType: self._handle_tug_message,
         }
 
+    def idle_steps(self, dt):
+        if self.message_broker.has_messages("harbour-master"):
+            return 0
+
+        if self.tug_strategy is not None and not self.tug_strategy.is_idle():
+            return 0
+
+        return math.inf
+
+    def _process_idle(self, dt, steps):
+        # There are no messages to handle
+        self.processed_entities = 0
+
     def _process(self, dt):
-        pending_messages = self.message_broker.get_messages("harbour-master")
+        messages = self.message_broker.drain("harbour-master")
+        self.processed_entities = len(messages)
 
-        for message in pending_messages:
+        for message in messages:
             entity_id = message.sender_entity_id
 
             self.messsage_handlers[type(message.message)](message, entity_id)
-            self.message_broker.remove_message(
-                message_id=message.id, destination_queue="harbour-master"
-            )
 
     def _handle_vessel_message(self, message, entity_id):
         if message.message.is_section_message():
@@ -78,13 +93,12 @@ class HarbourMasterProcessor(BaseProcessor):
 
         event = VesselEvent(
             f"{message.message.value} ({from_section.name} → {to_section.name})",
-            copy.deepcopy(vessel_info),
-            copy.deepcopy(velocity),
-            copy.deepcopy(fsm.pilot),
-            copy.deepcopy(fsm.tugboats),
+            velocity.velocity,
+            fsm.pilot,
+            None if fsm.tugboats is None else tuple(fsm.tugboats),
             fsm.destination_berth_id,
             fsm.destination_anchorage_id,
-            RunInfo.get_instance().timestamp(),
+            self.run_info.timestamp(),
         )
 
         self.logger.log_event(entity_id, vessel_info, event)
@@ -40,6 +40,10 @@ class DefaultTugStrategy:
             TugMessageType.NOT_TUGGING: self.handle_not_tugging,
         }[message.message](message, entity_id, tug_info)
 
+    def is_idle(self):
+        """Returns whether handling not tugging messages has no effect"""
+        return self.tug_malfunction_anomaly is None
+
     def handle_not_tugging(self, message, entity_id, vessel_info):
         if self._verify_tug_anomaly(entity_id):
             return
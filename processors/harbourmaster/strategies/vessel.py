@@ -35,7 +35,7 @@ class DefaultVesselStrategy:
             world: the simulation world.
             anchorage_designator: function that returns an anchorage given a entity id and the world
             berth_designator: function that returns a suitable berth given the vessel info and a list of available berths
-            path_finder: PathFinder singleton object
+            path_finder: PathFinder object
             tug_designator: function(vessel_entity_id) that returns tug ids available for the given vessel
                             or raises a NotEnoughAvailableTugsException
         """
@@ -317,8 +317,7 @@ class DefaultVesselStrategy:
         if self.lock_arrival_resources(entity_id, vessel_info):
             # FIXME: "Spawn" the vessel at the beginning of the arrival path.
             #        This is a temporary solution that should be changed ASAP
-            path.path["x"], path.path["y"] = path.path["x"][1:], path.path["y"][1:]
-            path.path["point_sections"] = path.path["point_sections"][1:]
+            path.path = path.path.tail(1)
 
             # The offset is added to make sure the next
             # destination node has a distance != 0
@@ -755,18 +754,18 @@ class DefaultVesselStrategy:
         raise NoAvailablePilotException("No pilot available")
 
     def _select_path(self, berths_info, vessel_position, vessel_info):
+        # Look up the routes of all the candidate berths at once
+        ocean_berth_routes = self.path_finder.ocean_berth_routes(
+            [berth_info.id for berth_info in berths_info]
+        )
+
         for berth_info in berths_info:
-            if vessel_position is not None:
-                ocean_berth_paths = self.path_finder.ocean_berth_paths(
-                    vessel_position=vessel_position.lonlat, berth_id=berth_info.id
-                )
-            else:
-                ocean_berth_paths = self.path_finder.ocean_berth_paths(
-                    berth_id=berth_info.id
-                )
+            if berth_info.id in ocean_berth_routes:
+                path = ocean_berth_routes[berth_info.id][0]
+
+                if vessel_position is not None:
+                    path = self.path_finder.prefix_path(vessel_position.lonlat, path)
 
-            if len(ocean_berth_paths) > 0:
-                path = ocean_berth_paths[0]
                 return path, berth_info
 
         return None, None
@@ -777,8 +776,12 @@ class DefaultVesselStrategy:
         position.update_position(np.array(path.get_origin()) + VESSEL_ORIGIN_OFFSET)
 
     def _berths_for_vessel(self, vessel_info):
-        available_berths = BerthList(world=self.world).filter_by_available(
-            BerthState.AVAILABLE
+        # The berths of the vessel class are read from the resource index,
+        # the berth designator then checks the other requirements
+        available_berths = (
+            BerthList(world=self.world)
+            .filter_by_vessel_class(vessel_info.vessel_class)
+            .filter_by_available(BerthState.AVAILABLE)
         )
         available_berths = available_berths.filter_by_ids(
             self.path_finder.ocean_connected_berth_ids()
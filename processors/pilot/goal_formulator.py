@@ -1,3 +1,5 @@
+import math
+
 from components.fsm.states import PilotState
 from environment.queries import fetch_pilots
 from exceptions import NoPathException, PathTerminatedException
@@ -6,8 +8,35 @@ from processors.utils import target_reached
 
 
 class PilotGoalFormulatorProcessor(BaseProcessor):
+    # States in which a pilot is on its way to some location
+    ACTIVE_STATES = [
+        PilotState.GOING_TO_RENDEZVOUS,
+        PilotState.GOING_TO_WAITING_LOCATION,
+        PilotState.GOING_TO_BERTH,
+    ]
+
+    def idle_steps(self, dt):
+        for _, (_, _, _, pilot_path, pilot_fsm, _) in fetch_pilots(self.world):
+            if pilot_fsm.current() in self.ACTIVE_STATES:
+                return 0
+
+            if pilot_path.has_current_route():
+                return 0
+
+        return math.inf
+
+    def _process_idle(self, dt, steps):
+        # No goal can be formulated, the paths are advanced nonetheless
+        self.processed_entities = 0
+
+        for _, (_, _, _, pilot_path, _, _) in fetch_pilots(self.world):
+            pilot_path.advance_path(steps)
+
     def _process(self, dt):
-        for ent, (pos, _, vel, pilot_path, pilot_fsm, _) in fetch_pilots(self.world):
+        pilots = fetch_pilots(self.world)
+        self.processed_entities = len(pilots)
+
+        for ent, (pos, _, vel, pilot_path, pilot_fsm, _) in pilots:
             # Formulate a goal if none is set
             if not pilot_path.has_current_route() or target_reached(pilot_path, pos):
                 self.formulate_goal(ent, pilot_path, pilot_fsm, vel)
@@ -1,12 +1,31 @@
+import math
+
 from environment.queries import fetch_pilots
 from exceptions import NoPathException, PathTerminatedException
 from processors.base_movement_processor import BaseMovementProcessor
 
 
 class PilotMovementProcessor(BaseMovementProcessor):
+    def idle_steps(self, dt):
+        for _, (_, _, _, vessel_path, _, _) in fetch_pilots(self.world):
+            if vessel_path.has_current_route():
+                return 0
+
+        return math.inf
+
+    def _process_idle(self, dt, steps):
+        # Pilots without a route do not move
+        self.processed_entities = 0
+
     def _process(self, dt):
+        moving = []
+
         for _, (pos, cs, vel, vessel_path, _, _) in fetch_pilots(self.world):
             try:
-                self.update_position(vessel_path, pos, vel, cs, dt)
+                target = vessel_path.get_current_destination()
             except (PathTerminatedException, NoPathException) as _:
-                pass
+                continue
+
+            moving.append((target, pos, vel, cs))
+
+        self.update_positions(moving, dt)
@@ -1,5 +1,7 @@
+import math
+
 from components.fsm.states import TugState
-from environment.messaging import MessageBroker, SimulationMessage
+from environment.context import SimulationContext
 from environment.messaging.types import TugMessageType
 from environment.queries import fetch_tugs
 from exceptions import NoPathException, PathTerminatedException
@@ -10,8 +12,23 @@ from processors.utils import target_reached
 class TugGoalFormulatorProcessor(BaseProcessor):
     RESOURCE_CHECK_FRAME_DELTA = 20
 
-    def __init__(self):
-        self.message_broker = MessageBroker.get_instance()
+    # States in which a tug either moves or is handled by the harbour master
+    ACTIVE_STATES = [
+        TugState.GOING_TO_RENDEZVOUS,
+        TugState.GOING_TO_WAITING_LOCATION,
+        TugState.GOING_TO_BERTH,
+        TugState.REPLACING_MALFUNCTIONING_TUG,
+        TugState.TUGGING_IN,
+        TugState.TUGGING_OUT,
+    ]
+
+    def __init__(self, context=None):
+        """
+        :param context: the simulation context, defaults to SimulationContext.default()
+        """
+        context = context or SimulationContext.default()
+
+        self.message_broker = context.message_broker
         self.message_per_state = {
             TugState.IDLE: TugMessageType.NOT_TUGGING,
             TugState.GOING_TO_BERTH: TugMessageType.NOT_TUGGING,
@@ -25,10 +42,29 @@ class TugGoalFormulatorProcessor(BaseProcessor):
             TugState.TUGGING_OUT: TugMessageType.TUGGING_OUT,
         }
 
+    def idle_steps(self, dt):
+        for _, (_, _, _, _, vessel_path, vessel_fsm, _) in fetch_tugs(self.world):
+            if vessel_fsm.current() in self.ACTIVE_STATES:
+                return 0
+
+            if vessel_path.has_current_route():
+                return 0
+
+        return math.inf
+
+    def _process_idle(self, dt, steps):
+        # Not tugging statuses are skipped, they are no-ops for an
+        # idle harbour master
+        self.processed_entities = 0
+
+        for _, (_, _, _, _, vessel_path, _, _) in fetch_tugs(self.world):
+            vessel_path.advance_path(steps)
+
     def _process(self, dt):
-        for ent, (pos, frame_counter, _, vel, vessel_path, vessel_fsm, _) in fetch_tugs(
-            self.world
-        ):
+        tugs = fetch_tugs(self.world)
+        self.processed_entities = len(tugs)
+
+        for ent, (pos, frame_counter, _, vel, vessel_path, vessel_fsm, _) in tugs:
             # Formulate a goal if none is set
             if not vessel_path.has_current_route() or target_reached(vessel_path, pos):
                 self.formulate_goal(ent, vessel_path, vessel_fsm, vel)
@@ -36,8 +72,8 @@ class TugGoalFormulatorProcessor(BaseProcessor):
             state = vessel_fsm.current()
 
             if state in self.message_per_state:
-                self._send_harbour_master_message(
-                    ent=ent, message=self.message_per_state[state]
+                self._send_harbour_master_status(
+                    ent=ent, status=self.message_per_state[state]
                 )
 
     def formulate_goal(self, ent, vessel_path, fsm, vel):
@@ -61,9 +97,7 @@ class TugGoalFormulatorProcessor(BaseProcessor):
         finally:
             vessel_path.advance_path()
 
-    def _send_harbour_master_message(self, ent, message):
-        self.message_broker.send_message(
-            SimulationMessage(
-                sender=f"tug:{ent}", destination="harbour-master", message=message
-            )
+    def _send_harbour_master_status(self, ent, status):
+        self.message_broker.send_status(
+            sender=f"tug:{ent}", destination="harbour-master", status=status
         )
@@ -1,3 +1,5 @@
+import math
+
 from components.fsm.states import TugState
 from environment.queries import fetch_tugs
 from exceptions import NoPathException, PathTerminatedException
@@ -5,16 +7,39 @@ from processors.base_movement_processor import BaseMovementProcessor
 
 
 class TugMovementProcessor(BaseMovementProcessor):
+    # Tugging tugs are moved along with the vessel they are tugging
+    SKIPPED_STATES = [
+        TugState.BROKEN,
+        TugState.TUGGING_IN,
+        TugState.TUGGING_OUT,
+    ]
+
+    def idle_steps(self, dt):
+        for _, (_, _, _, _, vessel_path, fsm, _) in fetch_tugs(self.world):
+            if fsm.current() in self.SKIPPED_STATES:
+                continue
+
+            if vessel_path.has_current_route():
+                return 0
+
+        return math.inf
+
+    def _process_idle(self, dt, steps):
+        # Tugs without a route do not move
+        self.processed_entities = 0
+
     def _process(self, dt):
+        moving = []
+
         for _, (pos, _, cs, vel, vessel_path, fsm, _) in fetch_tugs(self.world):
-            if fsm.current() in [
-                TugState.BROKEN,
-                TugState.TUGGING_IN,
-                TugState.TUGGING_OUT,
-            ]:
+            if fsm.current() in self.SKIPPED_STATES:
                 continue
 
             try:
-                self.update_position(vessel_path, pos, vel, cs, dt)
+                target = vessel_path.get_current_destination()
             except (PathTerminatedException, NoPathException):
-                pass
+                continue
+
+            moving.append((target, pos, vel, cs))
+
+        self.update_positions(moving, dt)
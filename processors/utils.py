@@ -7,7 +7,7 @@ import numpy as np
 import numpy.linalg as la
 
 from utils.constants import (KNOTS_TO_METERS_SEC, METERS_TO_COORDS,
-                             TARGET_REACHED_DELTA)
+                             MIN_VESSEL_SPEED, TARGET_REACHED_DELTA)
 
 
 def lonlat_array_to_screen(proj, lonlat):
@@ -62,6 +62,45 @@ def knots_to_coords_sec(knots):
     return (knots * KNOTS_TO_METERS_SEC) * METERS_TO_COORDS
 
 
+def advance_positions(positions, targets, speeds, dt):
+    """Moves a batch of entities towards their targets in a single step
+
+    :param positions: (n, 2) array of [lon, lat] positions
+    :param targets: (n, 2) array of [lon, lat] targets
+    :param speeds: (n,) array of speeds in knots
+    :param dt: the elapsed seconds
+    :return: the (n, 2) arrays of the new positions and of the unit directions
+    """
+    directions = targets - positions
+
+    # Row-wise dot products, the same that np.linalg.norm computes for a vector
+    norms = np.sqrt(
+        np.matmul(directions[:, np.newaxis, :], directions[:, :, np.newaxis])
+    )
+    directions = directions / norms[:, 0]
+
+    velocities = knots_to_coords_sec(speeds)
+
+    return positions + directions * velocities[:, np.newaxis] * dt, directions
+
+
+def smooth_speeds(speeds, angles, min_speeds, max_speeds, c1=0.00001, c2=10000):
+    """Smooths the speeds of a batch of vessels in a single step: vessels
+    accelerate on straight paths and slow down in the turns, within the
+    speed limits and never below MIN_VESSEL_SPEED
+
+    :param speeds: (n,) array of speeds in knots
+    :param angles: (n,) array of the turn angles (degrees) of the paths
+    :param min_speeds: (n,) array of the minimum speeds in knots
+    :param max_speeds: (n,) array of the maximum speeds in knots
+    :return: the (n,) array of the smoothed speeds
+    """
+    speeds = speeds + (180 - angles) * c1 - (angles * speeds) / c2
+    speeds = np.maximum(np.minimum(speeds, max_speeds), min_speeds)
+
+    return np.maximum(MIN_VESSEL_SPEED, speeds)
+
+
 def meters_to_coords_sec(meters):
     return meters * METERS_TO_COORDS
 
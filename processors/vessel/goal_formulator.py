@@ -1,10 +1,12 @@
+import math
 import random
 
 from components import Velocity, VesselInfo
 from components.fsm.states import VesselState
-from environment.messaging import MessageBroker, SimulationMessage
+from environment.context import SimulationContext
+from environment.messaging import SimulationMessage
 from environment.messaging.types import VesselMessageType
-from environment.queries import fetch_vessels
+from environment.queries import VesselIndex, fetch_vessels
 from exceptions import NoPathException, PathTerminatedException
 from processors.base_processor import BaseProcessor
 from processors.utils import target_reached
@@ -21,13 +23,20 @@ class VesselGoalFormulatorProcessor(BaseProcessor):
     MIN_SPEED_THRESHOLD = 3
     RESOURCE_CHECK_FRAME_DELTA = 20
 
-    def __init__(self, vessel_base_class):
+    # States in which the vessels neither formulate goals nor notify the
+    # harbour master, their paths are terminated until the state changes
+    PASSIVE_STATES = (VesselState.SERVICING, VesselState.LEFT)
+
+    def __init__(self, vessel_base_class, context=None):
         """Initializes a goal formulator
 
         Arguments:
         vessel_base_class -- the Python base class of vessel classes
+        context -- the simulation context, defaults to SimulationContext.default()
         """
-        self.message_broker = MessageBroker.get_instance()
+        context = context or SimulationContext.default()
+
+        self.message_broker = context.message_broker
         self.message_per_state = {
             VesselState.INCOMING: VesselMessageType.REQUEST_ARRIVAL_CLEARANCE,
             VesselState.GOING_TO_ANCHORAGE: VesselMessageType.GOING_TO_ANCHORAGE,
@@ -62,21 +71,46 @@ class VesselGoalFormulatorProcessor(BaseProcessor):
             VesselState.LEFT: 5,
         }
 
-        # Taken from environment/queries/__init__.py
-        self.vessel_fsm_index = 5
+        # The states of every priority, by priority, without the passive ones
+        self.scheduled_states = [
+            tuple(
+                state
+                for state, state_priority in self.state_priorities.items()
+                if state_priority == priority and state not in self.PASSIVE_STATES
+            )
+            for priority in sorted(set(self.state_priorities.values()))
+        ]
 
         self.vessel_base_class = vessel_base_class
 
+    def idle_steps(self, dt):
+        for _, (_, _, _, _, vessel_path, vessel_fsm, _) in fetch_vessels(self.world):
+            # Vessels in these states would notify the harbour master
+            if vessel_fsm.current() in self.message_per_state:
+                return 0
+
+            if vessel_path.has_current_route():
+                return 0
+
+        return math.inf
+
+    def _process_idle(self, dt, steps):
+        # No goal can be formulated, the paths are advanced nonetheless
+        self.processed_entities = 0
+
+        for _, (_, _, _, _, vessel_path, _, _) in fetch_vessels(self.world):
+            vessel_path.advance_path(steps)
+
     def _process(self, dt):
-        vessels = fetch_vessels(self.world)
-        # Sort by state and spawn time (smaller entity id means spawned earlier)
-        vessels = sorted(
-            vessels,
-            key=lambda x: (
-                self.state_priorities[x[1][self.vessel_fsm_index].current()],
-                x[0],
-            ),
-        )
+        # Vessels by state priority and spawn time (smaller entity id means
+        # spawned earlier), the index keeps them sorted as their states change
+        vessel_index = VesselIndex.for_world(self.world)
+        vessels = [
+            vessel
+            for states in self.scheduled_states
+            for vessel in vessel_index.vessels_by_states(states)
+        ]
+        self.processed_entities = len(vessels)
 
         for ent, (
             pos,
@@ -90,8 +124,8 @@ class VesselGoalFormulatorProcessor(BaseProcessor):
             current_state = vessel_fsm.current()
             # Do not formulate a goal/advance the path if the vessel's tug has broken down and its waiting for a new one
             if current_state == VesselState.TUG_MALFUNCTION:
-                message = self.message_per_state[current_state]
-                self._send_harbour_master_message(ent=ent, message=message)
+                status = self.message_per_state[current_state]
+                self._send_harbour_master_status(ent=ent, status=status)
 
                 continue
 
@@ -158,9 +192,7 @@ class VesselGoalFormulatorProcessor(BaseProcessor):
         velocity = self.world.component_for_entity(ent, Velocity)
         vessel_info = self.world.component_for_entity(ent, VesselInfo)
 
-        vessel_class = self.vessel_base_class.get_vessel_class(
-            vessel_info.length, vessel_info.actual_draught
-        )
+        vessel_class = vessel_info.resolve_vessel_class(self.vessel_base_class)
 
         speed_data = target_section.speeds_for_class(vessel_class)
         max_speed, min_speed = speed_data["max"], speed_data["min"]
@@ -171,6 +203,11 @@ class VesselGoalFormulatorProcessor(BaseProcessor):
         new_speed = ((max_speed - min_speed) * random.random()) + min_speed
         velocity.velocity = new_speed
 
+    def _send_harbour_master_status(self, ent, status):
+        self.message_broker.send_status(
+            sender=f"vessel:{ent}", destination="harbour-master", status=status
+        )
+
     def _send_harbour_master_message(self, ent, message):
         self.message_broker.send_message(
             SimulationMessage(
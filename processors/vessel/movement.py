@@ -1,11 +1,16 @@
+import math
+
+import numpy as np
+
 from components import Course, Position, Velocity
 from components.fsm import SpeedStateMachine, TugStateMachine
 from components.fsm.states import SpeedState, TugState, VesselState
+from environment.context import SimulationContext
 from environment.queries import fetch_vessels
 from exceptions import NoPathException, PathTerminatedException
 from processors.base_movement_processor import BaseMovementProcessor
-from processors.utils import knots_to_coords_sec, meters_to_coords_sec
-from utils.constants import MIN_VESSEL_SPEED
+from processors.utils import (knots_to_coords_sec, meters_to_coords_sec,
+                              smooth_speeds)
 
 
 class VesselMovementProcessor(BaseMovementProcessor):
@@ -16,31 +21,101 @@ class VesselMovementProcessor(BaseMovementProcessor):
 
     TUGS_DISTANCE_METERS = 200
 
-    def __init__(self, vessel_base_class):
+    def __init__(self, vessel_base_class, context=None):
         """Initializes a movement processor
 
         Arguments:
         vessel_base_class -- the Python base class of vessel classes
+        context -- the simulation context, defaults to SimulationContext.default()
         """
         self.vessel_base_class = vessel_base_class
 
+        # The speed history of the idle steps is computed here, and shared
+        # with the position loggers through the context
+        self.idle_speeds = (context or SimulationContext.default()).idle_speeds
+        self.idle_speeds.compute = self._idle_speed_history
+
+    def idle_steps(self, dt):
+        for _, (pos, _, _, _, vessel_path, fsm, _) in fetch_vessels(self.world):
+            if not self._skip_vessel(pos, fsm) and vessel_path.has_current_route():
+                return 0
+
+        return math.inf
+
+    def _idle_speed_history(self, steps):
+        """Returns the speeds of the vessels during the next idle steps,
+        without changing them, see IdleSpeeds.history. Vessels without a
+        route do not move, but their speed is smoothed in every step, with
+        the same speed inputs
+
+        :param steps: the number of idle steps
+        """
+        entities = []
+        speed_inputs = []
+
+        for ent, (pos, _, _, vel, vessel_path, fsm, vessel_info) in fetch_vessels(
+            self.world
+        ):
+            if self._skip_vessel(pos, fsm):
+                continue
+
+            try:
+                speed_inputs.append(self._speed_inputs(vessel_info, vessel_path, vel))
+            except (PathTerminatedException, NoPathException):
+                continue
+
+            entities.append(ent)
+
+        if len(entities) == 0:
+            return {}
+
+        speeds, angles, min_speeds, max_speeds = np.array(speed_inputs, dtype=float).T
+        history = [speeds]
+
+        for _ in range(steps):
+            speeds = smooth_speeds(speeds, angles, min_speeds, max_speeds)
+            history.append(speeds)
+
+        return dict(zip(entities, np.array(history).T))
+
+    def _process_idle(self, dt, steps):
+        self.processed_entities = 0
+
+        for ent, speeds in self.idle_speeds.history(steps).items():
+            self.world.component_for_entity(ent, Velocity).velocity = float(speeds[-1])
+
+    def _skip_vessel(self, pos, fsm):
+        # Skip vessels not yet fully created or departed
+        return not pos.is_valid() or fsm.current() in [
+            VesselState.LEFT,
+            VesselState.TUG_MALFUNCTION,
+        ]
+
     def _process(self, dt):
+        vessels = []
+        speed_inputs = []
+
         for ent, (pos, _, cs, vel, vessel_path, fsm, vessel_info) in fetch_vessels(
             self.world
         ):
-            state = fsm.current()
-
-            if not pos.is_valid() or state in [
-                VesselState.LEFT,
-                VesselState.TUG_MALFUNCTION,
-            ]:
-                # Skip vessels not yet fully created or departed
+            if self._skip_vessel(pos, fsm):
                 continue
 
             try:
-                # Smooth the vessel's velocity
-                self._update_vessel_speed(vessel_info, vessel_path, vel)
+                speed_inputs.append(self._speed_inputs(vessel_info, vessel_path, vel))
+            except (PathTerminatedException, NoPathException):
+                continue
+
+            vessels.append((ent, pos, cs, vel, vessel_path, fsm))
+
+        # Smooth the vessels' velocity
+        self._update_vessel_speeds([vessel[3] for vessel in vessels], speed_inputs)
 
+        moving = []
+        moving_vessels = []
+
+        for ent, pos, cs, vel, vessel_path, fsm in vessels:
+            try:
                 # Update the velocity if a vessel speed state machine is being used
                 try:
                     speed_fsm = self.world.component_for_entity(ent, SpeedStateMachine)
@@ -50,62 +125,70 @@ class VesselMovementProcessor(BaseMovementProcessor):
                 except:
                     step_velocity = vel
 
-                direction = self.update_position(
-                    vessel_path, pos, step_velocity, cs, dt
-                )
-                velocity = knots_to_coords_sec(step_velocity.velocity)
-
-                # Update tugs position
-                if fsm.tugboats is not None:
-                    for tug_id in fsm.tugboats:
-                        tug_fsm = self.world.component_for_entity(
-                            tug_id, TugStateMachine
-                        )
-
-                        if not (
-                            tug_fsm.current() == TugState.TUGGING_IN
-                            or tug_fsm.current() == TugState.TUGGING_OUT
-                        ):
-                            continue
-
-                        tug_pos = self.world.component_for_entity(tug_id, Position)
-                        tug_course = self.world.component_for_entity(tug_id, Course)
-
-                        tug_pos.update_position(
-                            pos.lonlat
-                            + direction * velocity * dt
-                            + direction
-                            * meters_to_coords_sec(self.TUGS_DISTANCE_METERS)
-                        )
-                        tug_course.course = cs.course
+                target = vessel_path.get_current_destination()
             except (PathTerminatedException, NoPathException):
-                pass
+                continue
 
-    def _update_vessel_speed(self, vessel_info, vessel_path, vel):
-        angle = vessel_path.angle()
-        vessel_class = self.vessel_base_class.get_vessel_class(
-            vessel_info.length, vessel_info.actual_draught
-        )
+            moving.append((target, pos, step_velocity, cs))
+            moving_vessels.append(fsm)
+
+        directions = self.update_positions(moving, dt)
+
+        for (_, pos, step_velocity, cs), fsm, direction in zip(
+            moving, moving_vessels, directions
+        ):
+            if fsm.tugboats is None:
+                continue
 
-        c1 = 0.00001
-        c2 = 10000
+            velocity = knots_to_coords_sec(step_velocity.velocity)
+
+            # Update tugs position
+            for tug_id in fsm.tugboats:
+                tug_fsm = self.world.component_for_entity(tug_id, TugStateMachine)
+
+                if not (
+                    tug_fsm.current() == TugState.TUGGING_IN
+                    or tug_fsm.current() == TugState.TUGGING_OUT
+                ):
+                    continue
+
+                tug_pos = self.world.component_for_entity(tug_id, Position)
+                tug_course = self.world.component_for_entity(tug_id, Course)
+
+                tug_pos.update_position(
+                    pos.lonlat
+                    + direction * velocity * dt
+                    + direction * meters_to_coords_sec(self.TUGS_DISTANCE_METERS)
+                )
+                tug_course.course = cs.course
+
+    def _speed_inputs(self, vessel_info, vessel_path, vel):
+        """Returns the (speed, turn angle, min speed, max speed) used to
+        smooth the speed of a vessel"""
+        angle = vessel_path.angle()
 
         if vessel_path.path is not None and vessel_path.path_idx < len(
-            vessel_path.path["y"]
+            vessel_path.path
         ):
-            speed_limit = vessel_path.get_current_section().speeds_for_class(
-                vessel_class
-            )
-            vel.velocity = max(
-                min(
-                    vel.velocity + (180 - angle) * c1 - (angle * vel.velocity) / c2,
-                    speed_limit["max"],
-                ),
-                speed_limit["min"],
-            )
+            vessel_class = vessel_info.resolve_vessel_class(self.vessel_base_class)
+            min_speed, max_speed = vessel_path.get_current_speed_limits(vessel_class)
         else:
-            vel.velocity = (
-                vel.velocity + (180 - angle) * c1 - (angle * vel.velocity) / c2
-            )
+            # Past the end of the path no speed limit applies
+            min_speed, max_speed = -math.inf, math.inf
+
+        return vel.velocity, angle, min_speed, max_speed
+
+    def _update_vessel_speeds(self, velocities, speed_inputs):
+        """Smooths the speed of a batch of vessels at once, see smooth_speeds
+
+        :param velocities: the Velocity components of the vessels
+        :param speed_inputs: the speed inputs of every vessel, see _speed_inputs
+        """
+        if len(velocities) == 0:
+            return
+
+        speeds, angles, min_speeds, max_speeds = np.array(speed_inputs, dtype=float).T
+        speeds = smooth_speeds(speeds, angles, min_speeds, max_speeds)
 
-        vel.velocity = max(MIN_VESSEL_SPEED, vel.velocity)
+        for vel, speed in zip(velocities, speeds.tolist()):
+            vel.velocity = speed
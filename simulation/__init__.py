@@ -0,0 +1,4 @@
+from .config import DEFAULT_CONFIG, make_config
+from .experiment import parameter_grid, run_experiment
+from .results import VesselKPIs, aggregate_results, vessel_kpis
+from .simulation import Simulation, run_simulation
@@ -0,0 +1,226 @@
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+
+from simulation.config import make_config
+from simulation.results import RUN_TIME_KEYS
+from simulation.simulation import Simulation, load_context
+from simulation.synthetic_port import SyntheticPort
+
+# Version of the layout of the benchmark reports
+REPORT_VERSION = 1
+
+# Configuration shared by the scenarios: a fixed seed and simulated duration,
+# with the logs written to disk as in a regular run
+BENCHMARK_CONFIG = {"max_time": 100000, "seed": 0}
+
+# The scenarios of the benchmark, from the default port to busier ones
+SCENARIOS = {
+    "small": {},
+    "medium": {"tugs_count": 6, "pilots_count": 40, "arrival_rate": 2.0},
+    "large": {"tugs_count": 12, "pilots_count": 80, "arrival_rate": 4.0},
+}
+
+# Scenarios on synthetic ports, to measure how the simulation scales with
+# the size of the port. Their "port" value holds the SyntheticPort arguments
+PORT_SCENARIOS = {
+    "port_500": {
+        "port": {"berths": 500, "tug_waiting_locations": 3, "tugs": 20, "pilots": 40},
+        "tugs_count": 20,
+        "arrival_rate": 4.0,
+    },
+    "port_2000": {
+        "port": {"berths": 2000, "tug_waiting_locations": 5, "tugs": 40, "pilots": 80},
+        "tugs_count": 40,
+        "arrival_rate": 8.0,
+    },
+}
+
+# Metrics compared to the baseline, and whether higher values are better
+COMPARED_METRICS = {
+    "ticks_per_second": True,
+    "simulated_hours_per_second": True,
+    "peak_rss_mb": False,
+}
+
+
+def peak_rss_mb():
+    """Returns the peak resident memory of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # The peak is in bytes on macOS, in KB elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def machine_info():
+    """Returns a description of the machine running the benchmark"""
+    return {
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def run_scenario(config, port=None):
+    """Runs a profiled headless simulation and measures its cost.
+
+    :param config: the simulation configuration, see make_config. If it has
+        no output directory the logs are written to a temporary one
+    :param port: the arguments of the SyntheticPort the simulation runs on,
+        written to a temporary directory. None to use the data_dir of the
+        configuration
+    :return: dictionary of the performance metrics of the run
+    """
+    config = make_config(config, profile=True)
+    assert config["max_time"] is not None, "A max_time is required"
+
+    out = config["out"]
+
+    with tempfile.TemporaryDirectory() as temporary_out:
+        if out is None:
+            config["out"] = temporary_out
+
+        if port is not None:
+            config["data_dir"] = os.path.join(temporary_out, "port")
+            port = SyntheticPort(**port).generate(config["data_dir"])
+
+        load_start = time.perf_counter()
+        context = load_context(
+            config["cache"], config["verbose"], config["data_dir"]
+        ).replicate()
+        load_time = time.perf_counter() - load_start
+
+        results = Simulation(config, context).run()
+
+    profile = results.pop("profile")
+    wall_time = results["wall_time"]
+
+    return {
+        "config": dict(results.pop("config"), out=out),
+        "port": port,
+        "load_time": load_time,
+        "wall_time": wall_time,
+        "ticks": profile["ticks"],
+        "ticks_per_second": profile["ticks"] / wall_time,
+        "simulated_hours_per_second": results["simulation_time"] / 3600 / wall_time,
+        "peak_rss_mb": peak_rss_mb(),
+        "processors": {
+            name: {
+                "total_time": stats["total_time"],
+                "share": stats["total_time"] / wall_time,
+                "mean_time": stats["mean_time"],
+                "p95_time": stats["p95_time"],
+                "mean_entities": stats["mean_entities"],
+            }
+            for name, stats in profile["processors"].items()
+        },
+        # The indicators of the run, they only change with the simulation logic
+        "kpis": {
+            key: value for key, value in results.items() if key not in RUN_TIME_KEYS
+        },
+    }
+
+
+def run_benchmark(scenarios=None, base_config=None, repeat=1, isolate=True):
+    """Runs the benchmark scenarios one after the other.
+
+    :param scenarios: dictionary mapping the name of every scenario to its
+        configuration values, and optionally to the arguments of the
+        synthetic port it runs on (see PORT_SCENARIOS), defaults to SCENARIOS
+    :param base_config: configuration values shared by all the scenarios,
+        they override BENCHMARK_CONFIG
+    :param repeat: number of runs of every scenario, the metrics of the
+        fastest one are kept to reduce the noise of the measures
+    :param isolate: whether to run every scenario in a new process, so that
+        its traces loading time and its peak memory are its own
+    :return: the benchmark report, with the metrics of every scenario
+    """
+    assert repeat > 0, "Every scenario should be run at least once"
+
+    scenarios = SCENARIOS if scenarios is None else scenarios
+    base_config = dict(BENCHMARK_CONFIG, **(base_config or {}))
+    report = {
+        "version": REPORT_VERSION,
+        "machine": machine_info(),
+        "config": make_config(base_config),
+        "scenarios": {},
+    }
+
+    for name, values in scenarios.items():
+        values = dict(values)
+        port = values.pop("port", None)
+        config = make_config(base_config, **values)
+        runs = []
+
+        for _ in range(repeat):
+            if isolate:
+                with multiprocessing.Pool(1) as pool:
+                    runs.append(pool.apply(run_scenario, (config, port)))
+            else:
+                runs.append(run_scenario(config, port))
+
+        metrics = max(runs, key=lambda run: run["ticks_per_second"])
+        metrics["wall_times"] = [run["wall_time"] for run in runs]
+
+        report["scenarios"][name] = metrics
+
+    return report
+
+
+def compare_to_baseline(report, baseline, tolerance=0.1):
+    """Compares the metrics of the scenarios of a benchmark report with the
+    ones of a baseline report.
+
+    :param report: the benchmark report, see run_benchmark
+    :param baseline: the baseline benchmark report
+    :param tolerance: relative change of a metric allowed before it is
+        considered a regression
+    :return: list with, for every metric of the scenarios in both reports,
+        its baseline and current values, its relative change and whether it
+        regressed. The "kpis" metric checks that the indicators of the run
+        are the same, i.e. that the runs are comparable
+    """
+    assert tolerance >= 0, "The tolerance should be >= 0"
+    assert baseline.get("version") == REPORT_VERSION, "Unsupported baseline version"
+
+    comparisons = []
+
+    for name, metrics in report["scenarios"].items():
+        baseline_metrics = baseline["scenarios"].get(name)
+
+        if baseline_metrics is None:
+            continue
+
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            previous, current = baseline_metrics[metric], metrics[metric]
+            change = (current - previous) / previous if previous else 0.0
+            loss = -change if higher_is_better else change
+
+            comparisons.append(
+                {
+                    "scenario": name,
+                    "metric": metric,
+                    "baseline": previous,
+                    "current": current,
+                    "change": change,
+                    "regression": loss > tolerance,
+                }
+            )
+
+        comparisons.append(
+            {
+                "scenario": name,
+                "metric": "kpis",
+                "baseline": baseline_metrics["kpis"],
+                "current": metrics["kpis"],
+                "change": None,
+                "regression": baseline_metrics["kpis"] != metrics["kpis"],
+            }
+        )
+
+    return comparisons
@@ -0,0 +1,79 @@
+from log.console import LEVELS
+
+# Default configuration of a simulation run, mirrors the options of main.py
+DEFAULT_CONFIG = {
+    # Output directory of the logs, no logs are written to disk if None
+    "out": None,
+    # Directory of the dataset of the port, e.g. one made by generate_port.py
+    "data_dir": "example_data",
+    "step": 10,
+    "max_time": None,
+    "verbose": False,
+    # Minimum level of the verbose output (debug, info or warning), the vessel
+    # events are info messages, the tug and pilot events debug messages
+    "verbose_level": "debug",
+    # Maximum number of verbose messages printed per second, None for no limit
+    "verbose_rate": None,
+    "cache": False,
+    # Keep the positions history of the entities, only displayed by the graphics
+    "position_history": False,
+    "skip_ahead": False,
+    "tugs_count": 3,
+    # Number of pilots, None to read them from the pilots waiting locations
+    "pilots_count": None,
+    "tugs_allocation_data": False,
+    "single_tugs_company": True,
+    "fixed_generation": False,
+    # Factor applied to the vessel arrival rates
+    "arrival_rate": 1.0,
+    "berth_check_prob": 0,
+    "anomalous_speed": False,
+    "tugs_malfunction": False,
+    "tugs_break_percentage_idle": 0.00001,
+    "tugs_break_percentage_busy": 0.0002,
+    "seed": None,
+    "log_format": "csv",
+    "log_chunk_size": 100000,
+    # Write the events to disk as they happen instead of at the end of the run
+    "stream_events": False,
+    # Record the wall time of every processor, see processors.core.TickProfiler
+    "profile": False,
+    # Simulated hours between two printed profiling summaries, None for none
+    "profile_interval": None,
+}
+
+
+def make_config(config=None, **overrides):
+    """Returns a complete simulation configuration, i.e. the default
+    configuration updated with the given values.
+
+    :param config: dictionary of configuration values (optional)
+    :param overrides: configuration values, they take precedence over config
+    """
+    values = dict(config or {}, **overrides)
+    unknown = set(values) - set(DEFAULT_CONFIG)
+
+    if unknown:
+        raise ValueError(f"Unknown configuration keys: {', '.join(sorted(unknown))}")
+
+    full_config = dict(DEFAULT_CONFIG)
+    full_config.update(values)
+
+    assert full_config["step"] > 0, "The step size should be positive"
+    assert full_config["tugs_count"] > 0, "At least one tug is required"
+    assert (
+        full_config["pilots_count"] is None or full_config["pilots_count"] > 0
+    ), "At least one pilot is required"
+    assert full_config["verbose_level"] in LEVELS, "Unknown verbose level"
+    assert (
+        full_config["verbose_rate"] is None or full_config["verbose_rate"] > 0
+    ), "The verbose rate should be positive"
+    assert full_config["arrival_rate"] > 0, "The arrival rate should be positive"
+    assert (
+        0 <= full_config["berth_check_prob"] <= 1
+    ), "The berth check probability should be between 0 and 1"
+    assert (
+        full_config["profile_interval"] is None or full_config["profile_interval"] > 0
+    ), "The profiling interval should be positive"
+
+    return full_config
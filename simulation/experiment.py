@@ -0,0 +1,89 @@
+import itertools
+import multiprocessing
+import os
+import signal
+
+from simulation.config import make_config
+from simulation.results import aggregate_results
+from simulation.simulation import run_simulation
+
+
+def parameter_grid(grid):
+    """Returns every combination of the values of a parameter grid.
+
+    :param grid: dictionary mapping each configuration key to the list of
+        its values, e.g. {"tugs_count": [2, 3], "berth_check_prob": [0, 0.1]}
+    :return: list of dictionaries, one per combination
+    """
+    keys = list(grid)
+
+    return [
+        dict(zip(keys, values))
+        for values in itertools.product(*(grid[key] for key in keys))
+    ]
+
+
+def parameters_name(parameters):
+    """Returns the name of the output directory of a grid point"""
+    if not parameters:
+        return "default"
+
+    return ",".join(f"{key}={value}" for key, value in parameters.items())
+
+
+def _init_worker():
+    # The parent process handles the interruptions
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def run_experiment(base_config=None, grid=None, seeds=(0,), workers=None):
+    """Runs the simulation for every combination of the parameter grid with
+    every seed. The runs are spread over a pool of processes, every process
+    loads the traces once and reuses them for all its runs.
+
+    If the base configuration has an output directory, the logs of each run
+    are written to <out>/<parameters name>/seed_<seed>.
+
+    :param base_config: the configuration shared by all the runs
+    :param grid: the parameter grid, see parameter_grid (optional)
+    :param seeds: the seeds of the runs of every grid point
+    :param workers: number of processes, defaults to the number of CPUs.
+        With a single worker the runs are executed in this process
+    :return: list with, for every grid point, its parameters, the results
+        of its runs and their aggregated indicators
+    """
+    base_config = make_config(base_config)
+    points = parameter_grid(grid or {})
+    configs = []
+
+    for parameters in points:
+        for seed in seeds:
+            config = make_config(base_config, **parameters, seed=seed)
+
+            if base_config["out"] is not None:
+                config["out"] = os.path.join(
+                    base_config["out"], parameters_name(parameters), f"seed_{seed}"
+                )
+
+            configs.append(config)
+
+    if workers == 1:
+        runs = [run_simulation(config) for config in configs]
+    else:
+        with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+            runs = pool.map(run_simulation, configs, chunksize=1)
+
+    experiment = []
+
+    for i, parameters in enumerate(points):
+        point_runs = runs[i * len(seeds) : (i + 1) * len(seeds)]
+
+        experiment.append(
+            {
+                "parameters": parameters,
+                "runs": point_runs,
+                "kpis": aggregate_results(point_runs),
+            }
+        )
+
+    return experiment
@@ -0,0 +1,149 @@
+import functools
+import math
+
+import numpy as np
+from scipy import stats
+
+from components.fsm.states import VesselState
+
+# Separator of the source and destination states in the vessel events
+STATE_CHANGE_SEPARATOR = " → "
+
+# Numeric values of the run results that are not indicators: the simulated
+# time is the same in every run, the wall time only measures the machine
+RUN_TIME_KEYS = ("simulation_time", "wall_time")
+
+
+@functools.lru_cache(maxsize=None)
+def _state_change(event_type):
+    """Returns the (source state, destination state) of a state change event
+    type, None for the other events (e.g. the section crossings).
+    """
+    if "(" in event_type:
+        return None
+
+    src, separator, dst = event_type.partition(STATE_CHANGE_SEPARATOR)
+
+    return (src, dst) if separator else None
+
+
+def _mean(values):
+    return float(np.mean(values)) if values else None
+
+
+class VesselKPIs:
+    """Computes the key performance indicators of a run from the vessel
+    events, one event at a time. It can listen to a VesselEventLogger (see
+    EventLogger.listeners) whose events are not kept in memory. The times
+    are in seconds, only the completed stays are taken into account.
+    """
+
+    def __init__(self):
+        self.vessels_arrived = 0
+        self.port_times = []
+        self.anchorage_times = []
+        self.service_times = []
+
+        # The arrival, the anchorage time and the start of the states of
+        # the vessels in the port, None once they left
+        self._vessels = {}
+
+    def add(self, vessel_id, event):
+        """Adds an event of a vessel, after the previous ones of the vessel"""
+        if vessel_id not in self._vessels:
+            self.vessels_arrived += 1
+            self._vessels[vessel_id] = [event.timestamp, 0, {}]
+
+        vessel = self._vessels[vessel_id]
+        state_change = _state_change(event.event_type)
+
+        if vessel is None or state_change is None:
+            return
+
+        src, dst = state_change
+        arrival, anchorage_time, state_start = vessel
+        timestamp = event.timestamp
+        state_start[dst] = timestamp
+
+        if src == VesselState.WAITING_AT_ANCHORAGE:
+            anchorage_time += timestamp - state_start[src]
+            vessel[1] = anchorage_time
+        elif src == VesselState.SERVICING:
+            self.service_times.append(timestamp - state_start[src])
+
+        if dst == VesselState.LEFT:
+            self.port_times.append(timestamp - arrival)
+            self.anchorage_times.append(anchorage_time)
+            self._vessels[vessel_id] = None
+
+    def results(self):
+        """Returns the dictionary of the indicators"""
+        return {
+            "vessels_arrived": self.vessels_arrived,
+            "vessels_departed": len(self.port_times),
+            "mean_port_time": _mean(self.port_times),
+            "mean_anchorage_time": _mean(self.anchorage_times),
+            "mean_service_time": _mean(self.service_times),
+        }
+
+
+def vessel_kpis(vessel_logs):
+    """Computes the key performance indicators of a run from the vessel
+    events logs, see VesselKPIs.
+
+    :param vessel_logs: the logs of the VesselEventLogger
+    :return: dictionary of the indicators
+    """
+    kpis = VesselKPIs()
+
+    for vessel_id, vessel_log in vessel_logs.items():
+        for event in vessel_log["events"]:
+            kpis.add(vessel_id, event)
+
+    return kpis.results()
+
+
+def aggregate_results(runs, confidence=0.95):
+    """Aggregates the numeric indicators of several runs (e.g. with
+    different seeds) of the same configuration. The run times (see
+    RUN_TIME_KEYS) are not aggregated.
+
+    :param runs: list of results, as returned by run_simulation
+    :param confidence: the confidence level of the intervals
+    :return: dictionary with, for every indicator, its mean, standard
+        deviation, confidence interval half width and number of runs
+    """
+    assert 0 < confidence < 1, "The confidence level should be between 0 and 1"
+
+    values_per_key = {}
+
+    for run in runs:
+        for key, value in run.items():
+            if key in RUN_TIME_KEYS:
+                continue
+
+            # Indicators without a value (None) in a run are skipped
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                values_per_key.setdefault(key, []).append(value)
+
+    aggregated = {}
+
+    for key, values in values_per_key.items():
+        count = len(values)
+
+        mean = float(np.mean(values))
+        std = float(np.std(values, ddof=1)) if count > 1 else 0.0
+        half_width = (
+            float(stats.t.ppf((1 + confidence) / 2, count - 1) * std / math.sqrt(count))
+            if count > 1
+            else 0.0
+        )
+
+        aggregated[key] = {
+            "mean": mean,
+            "std": std,
+            "ci": half_width,
+            "runs": count,
+        }
+
+    return aggregated
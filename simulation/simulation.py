@@ -0,0 +1,640 @@
+import csv
+import functools
+import json
+import math
+import os
+import random
+import time
+
+import esper
+import numpy as np
+from shapely.geometry import Polygon
+
+from anomalies import TugMalfunctionAnomaly
+from components.fsm import NULL_SPEED_MODEL
+from environment.context import SimulationContext
+from environment.initializers import (AnchoragesInitializer, BerthsInitializer,
+                                      PilotsInitializer, TugsInitializer)
+from environment.navigation import TraceCache, TraceLoader
+from environment.navigation.trace_loader import print_progress
+from example.example_model.anchorages import assign_anchorage
+from example.example_model.berth_designator import berths_allocation_designator
+from example.example_model.berth_service_distribution_factory import \
+    BerthServiceDistributionFactory
+from example.example_model.tugboat_company_logic import \
+    DefaultTugCompanyStrategy
+from example.example_model.vessel_class import VesselClass
+from example.example_model.vessel_content_type import VesselContentType
+from example.example_model.vessel_distribution_factory import \
+    VesselDistributionFactory
+from example.example_model.vessel_type import VesselType
+from log.console import LEVELS, ConsoleLogger
+from processors.ais import (AISPilotLogProcessor, AISTugLogProcessor,
+                            AISVesselLogProcessor, SectionsLogProcessor)
+from processors.ais.model import ColumnarAISPositionLogger
+from processors.core import ProfilerProcessor, TickProfiler, TimerProcessor
+from processors.generators import (FixedVesselGeneratorProcessor,
+                                   VesselGeneratorProcessor)
+from processors.harbourmaster import HarbourMasterProcessor
+from processors.harbourmaster.strategies import (DefaultTugStrategy,
+                                                 DefaultVesselStrategy)
+from processors.pilot import (PilotGoalFormulatorProcessor,
+                              PilotMovementProcessor)
+from processors.tug import TugGoalFormulatorProcessor, TugMovementProcessor
+from processors.vessel import (VesselGoalFormulatorProcessor,
+                               VesselMovementProcessor)
+from simulation.config import make_config
+from simulation.results import VesselKPIs, vessel_kpis
+
+# Dataset of the example port, the files below are relative to its directory
+DEFAULT_DATA_DIR = "example_data"
+
+# Maximum number of idle steps processed at once in skip-ahead mode, it
+# bounds the size of the position logs added at once
+MAX_IDLE_STEPS = 1000
+
+ocean_berth_traces_folder = "traces/ocean_berth"
+ocean_tugs_rv_traces_folder = "traces/ocean_tugs_rv"
+ocean_pilots_rv_traces_folder = "traces/ocean_pilots_rv"
+pilots_rv_berth_traces_folder = "traces/pilots_rv_berth"
+pilots_rv_tugs_rv_traces_folder = "traces/pilots_rv_tugs_rv"
+tugs_rv_berth_traces_folder = "traces/tugs_rv_berth"
+tugs_wl_tugs_rv_traces_folder = "traces/tugs_wl_tugs_rv"
+pilots_wl_pilot_rv_traces_folder = "traces/pilots_wl_pilots_rv"
+pilots_wl_berth_traces_folder = "traces/pilots_wl_berth"
+ocean_tug_wl_traces_folder = "traces/ocean_tugs_wl"
+
+berths_filename = "berths.csv"
+terminal_service_times_filename = "terminal-service-times.csv"
+anchorages_filename = "anchorages.geojson"
+spawn_area_filename = "spawn.geojson"
+sections_filename = "sections.geojson"
+
+tugs_waiting_locations_filename = "tugs/waiting_locations.geojson"
+pilots_waiting_location_filename = "pilots/waiting_locations.geojson"
+tugs_rendezvous_filename = "tugs/rendezvous_locations.geojson"
+pilots_rendezvous_filename = "pilots/rendezvous_locations.geojson"
+tugs_deattach_location_filename = "tugs/deattach_location.geojson"
+
+# The trace folders, in the order of the arguments of PathFinder.load_traces
+traces_folders = [
+    ocean_berth_traces_folder,
+    ocean_tugs_rv_traces_folder,
+    ocean_pilots_rv_traces_folder,
+    pilots_rv_berth_traces_folder,
+    tugs_rv_berth_traces_folder,
+    pilots_rv_tugs_rv_traces_folder,
+    tugs_wl_tugs_rv_traces_folder,
+    pilots_wl_pilot_rv_traces_folder,
+    pilots_wl_berth_traces_folder,
+    ocean_tug_wl_traces_folder,
+]
+
+traces_cache_dir = "example/traces_cache"
+
+
+def data_path(data_dir, path):
+    """Returns the path of a file of a dataset, e.g. berths_filename"""
+    return os.path.join(data_dir, path)
+
+
+@functools.lru_cache(maxsize=None)
+def load_context(cache=False, verbose=False, data_dir=DEFAULT_DATA_DIR):
+    """Loads the sections and the path finder of a port. They are
+    loaded once per process: every simulation uses a replica of the returned
+    context, which shares them.
+
+    :param cache: whether to load the traces from the traces cache. The cache
+        is (re)built if it does not exist or if the input files changed
+    :param verbose: whether to print the progress of the traces loading
+    :param data_dir: the directory of the dataset of the port
+    """
+    sections_path = data_path(data_dir, sections_filename)
+    folders = [data_path(data_dir, folder) for folder in traces_folders]
+
+    context = SimulationContext()
+    context.section_manager.create_sections(sections_path, VesselClass)
+
+    traces_cache = (
+        TraceCache(traces_cache_dir, [sections_path, *folders]) if cache else None
+    )
+
+    path_finder = context.path_finder
+    path_finder.load_traces(
+        *folders,
+        ocean_spawn_ids=[1],
+        cache=traces_cache,
+        loader=TraceLoader(progress=print_progress if verbose else None),
+    )
+
+    path_finder.load_tugs_rendezvous_locations(
+        data_path(data_dir, tugs_rendezvous_filename)
+    )
+    path_finder.load_pilots_rendezvous_locations(
+        data_path(data_dir, pilots_rendezvous_filename), VesselClass.from_class_code
+    )
+
+    return context
+
+
+def idle_steps(processors, dt):
+    """Returns for how many of the next steps all the processors are idle."""
+    steps = math.inf
+
+    for processor in processors:
+        steps = min(steps, processor.idle_steps(dt))
+
+        if steps == 0:
+            break
+
+    return steps
+
+
+def save_log_to_file(filename, logs):
+    with open(filename, "w") as ais_out_file:
+        out_lines = logs.header() + logs.logs
+        csv_writer = csv.writer(ais_out_file)
+
+        for row in out_lines:
+            csv_writer.writerow(row)
+
+
+class Simulation:
+    """A run of the example port simulation.
+
+    Every simulation has its own SimulationContext, so that several
+    simulations can be built and run in the same process. By default the
+    contexts are replicas of the one returned by load_context(), and share
+    its sections and path finder.
+    """
+
+    def __init__(self, config=None, context=None):
+        """Builds the simulation world.
+
+        :param config: the simulation configuration, see make_config
+        :param context: the simulation context (optional), it must have the
+            sections and the path finder of the example port loaded
+        """
+        self.config = make_config(config)
+
+        if context is None:
+            context = load_context(
+                self.config["cache"], self.config["verbose"], self.config["data_dir"]
+            ).replicate()
+
+        self.context = context
+        self.current_time = 0
+        self.wall_time = None
+        self.running = True
+        self._logs_written = False
+
+        self._build()
+
+    def _build(self):
+        config = self.config
+
+        if config["seed"] is not None:
+            # sets random seed for random and numpy
+            random.seed(config["seed"])
+            np.random.seed(config["seed"])
+
+        if config["out"] is not None and not os.path.exists(config["out"]):
+            os.makedirs(config["out"])
+
+        context = self.context
+        path_finder = context.path_finder
+
+        self.world = world = esper.World()
+
+        # Initialize the simulation clock
+        context.run_info.set_simulation_start_time(time.time())
+        context.run_info.set_simulation_end_time(config["max_time"])
+        context.run_info.set_simulation_step_size(config["step"])
+
+        context.keep_position_history = config["position_history"]
+
+        # Initialize loggers, their verbose output is written by a background
+        # thread so that printing does not slow down the simulation
+        self.console = None
+
+        if config["verbose"]:
+            self.console = ConsoleLogger(
+                LEVELS[config["verbose_level"]], config["verbose_rate"]
+            )
+
+        for logger, _ in self._event_loggers():
+            logger.verbose = config["verbose"]
+            logger.console = self.console
+
+        # Streamed events are not kept in memory, the indicators are then
+        # computed as the vessel events are logged
+        self.streamed_kpis = None
+
+        if config["out"] is not None and config["stream_events"]:
+            for logger, name in self._event_loggers():
+                logger.stream_to(f"{config['out']}/{name}.csv")
+
+            self.streamed_kpis = VesselKPIs()
+            context.vessel_event_logger.listeners.append(self.streamed_kpis.add)
+
+        # Add the AIS and section occupancy loggers to the simulation
+        # The position logs are written to disk in chunks while the simulation runs
+        if config["out"] is not None:
+            self.vessel_logger_pos = AISVesselLogProcessor(
+                self._position_logger("vessel_pos"), context=context
+            )
+            self.pilot_logger_pos = AISPilotLogProcessor(
+                self._position_logger("pilot_pos"), context=context
+            )
+            self.tug_logger_pos = AISTugLogProcessor(
+                self._position_logger("tug_pos"), context=context
+            )
+            self.sections_logger = SectionsLogProcessor(context=context)
+
+            world.add_processor(self.vessel_logger_pos)
+            world.add_processor(self.pilot_logger_pos)
+            world.add_processor(self.tug_logger_pos)
+            world.add_processor(self.sections_logger)
+        else:
+            self.vessel_logger_pos = None
+            self.pilot_logger_pos = None
+            self.tug_logger_pos = None
+            self.sections_logger = None
+
+        # Create Esper processors for the simulation
+        vessel_goal_formulator = VesselGoalFormulatorProcessor(
+            VesselClass, context=context
+        )
+        vessel_movement_processor = VesselMovementProcessor(
+            VesselClass, context=context
+        )
+        tug_movement_processor = TugMovementProcessor()
+        pilot_movement_processor = PilotMovementProcessor()
+
+        timer_processor = TimerProcessor(context=context)
+
+        # Create berth service time generator
+        berth_service_distribution_factory = BerthServiceDistributionFactory(
+            self._data_path(terminal_service_times_filename)
+        )
+
+        # Add berths to the simulation
+        berths_generator = BerthsInitializer(
+            world,
+            self._data_path(berths_filename),
+            VesselContentType,
+            berth_service_distribution_factory,
+            berth_randomized_check_prob=config["berth_check_prob"],
+            context=context,
+        )
+
+        berths_generator.create_berths()
+
+        # Add tugs to the simulation
+        self.tugs_generator = TugsInitializer(
+            world,
+            self._data_path(tugs_waiting_locations_filename),
+            tugs_count=config["tugs_count"],
+            companies_from_data=config["tugs_allocation_data"],
+            context=context,
+        )
+        self.tugs_generator.create_tugboats()
+
+        # Add pilots to the simulation
+        pilots_generator = PilotsInitializer(
+            world,
+            self._data_path(pilots_waiting_location_filename),
+            num=config["pilots_count"],
+            context=context,
+        )
+        pilots_generator.create_pilots()
+
+        # Add anchorages to the simulation
+        anchorages_generator = AnchoragesInitializer(
+            world, self._data_path(anchorages_filename)
+        )
+        anchorages_generator.create_anchorages()
+
+        # Define tugboat logic and set the tugboat companies (single vs multiple)
+        tugboat_logic = DefaultTugCompanyStrategy(
+            world, self.tugs_generator.get_tugboat_companies()
+        )
+        context.tug_company_strategy = tugboat_logic
+
+        if config["single_tugs_company"]:
+            # Strategy with one tug company
+            tug_designator = tugboat_logic.select_tugs
+        else:
+            # Strategy with different tug companies
+            tug_designator = tugboat_logic.assign_specific_tugs_to_vessel
+
+        vessel_strategy = DefaultVesselStrategy(
+            world=world,
+            anchorage_designator=assign_anchorage,
+            berth_designator=berths_allocation_designator,
+            path_finder=path_finder,
+            tug_designator=tug_designator,
+        )
+
+        deattach_filename = self._data_path(tugs_deattach_location_filename)
+
+        if config["tugs_malfunction"]:
+            with open(deattach_filename) as deattach_file:
+                deattach_polygon = Polygon(
+                    json.loads(deattach_file.read())["features"][0]["geometry"][
+                        "coordinates"
+                    ][0]
+                )
+
+            tug_malfunction_anomaly = TugMalfunctionAnomaly(
+                world,
+                path_finder,
+                config["tugs_break_percentage_idle"],
+                config["tugs_break_percentage_busy"],
+                tug_designator,
+                deattach_polygon,
+                context=context,
+            )
+        else:
+            tug_malfunction_anomaly = None
+
+        tug_strategy = DefaultTugStrategy(
+            world=world,
+            path_finder=path_finder,
+            deattach_polygon_filename=deattach_filename,
+            tug_malfunction_anomaly=tug_malfunction_anomaly,
+        )
+
+        hm_processor = HarbourMasterProcessor(
+            world=world,
+            vessel_strategy=vessel_strategy,
+            tug_strategy=tug_strategy,
+            logger=context.vessel_event_logger,
+            context=context,
+        )
+
+        # Define the probabilities of the speed anomalies Markov model
+        if config["anomalous_speed"]:
+            speed_transition_p = {"double": 0.1, "half": 0.1, "reset": 0.8}
+
+            anomalous_vessel_percent = 0.2
+        else:
+            anomalous_vessel_percent = 0
+            speed_transition_p = NULL_SPEED_MODEL
+
+        # Create vessel generators for each vessel type
+        vessel_distribution_factory = VesselDistributionFactory(
+            arrival_rate=config["arrival_rate"]
+        )
+        vessel_generators = []
+
+        for vessel_type in VesselType:
+            if config["max_time"] is not None:
+                vessel_generator = FixedVesselGeneratorProcessor(
+                    world=world,
+                    inter_arrival_time_sampler=vessel_distribution_factory.inter_arrival_time_sampler(
+                        vessel_type
+                    ),
+                    vessel_info_sampler=vessel_distribution_factory.vessel_info_sampler(
+                        vessel_type
+                    ),
+                    spawn_area_filename=self._data_path(spawn_area_filename),
+                    run_info=context.run_info,
+                    vessel_logger=context.vessel_event_logger,
+                    context=context,
+                )
+            else:
+                vessel_generator = VesselGeneratorProcessor(
+                    world=world,
+                    inter_arrival_time_sampler=vessel_distribution_factory.inter_arrival_time_sampler(
+                        vessel_type
+                    ),
+                    vessel_info_sampler=vessel_distribution_factory.vessel_info_sampler(
+                        vessel_type
+                    ),
+                    spawn_area_filename=self._data_path(spawn_area_filename),
+                    vessel_logger=context.vessel_event_logger,
+                    context=context,
+                )
+
+            world.add_processor(vessel_generator)
+            vessel_generators.append(vessel_generator)
+
+        tug_goal_formulator = TugGoalFormulatorProcessor(context=context)
+        pilot_goal_formulator = PilotGoalFormulatorProcessor()
+
+        world.add_processor(vessel_goal_formulator)
+        world.add_processor(tug_goal_formulator)
+        world.add_processor(pilot_goal_formulator)
+        world.add_processor(vessel_movement_processor)
+        world.add_processor(tug_movement_processor)
+        world.add_processor(pilot_movement_processor)
+        world.add_processor(timer_processor)
+        world.add_processor(hm_processor)
+
+        # In skip-ahead mode the next steps in which all the processors are
+        # idle (i.e. nothing moves until the next timer or arrival) are
+        # processed at once. The cheapest processors are polled first
+        self.simulation_processors = [
+            hm_processor,
+            timer_processor,
+            *vessel_generators,
+            tug_goal_formulator,
+            pilot_goal_formulator,
+            vessel_goal_formulator,
+            vessel_movement_processor,
+            tug_movement_processor,
+            pilot_movement_processor,
+        ]
+
+        for processor in [
+            self.vessel_logger_pos,
+            self.pilot_logger_pos,
+            self.tug_logger_pos,
+            self.sections_logger,
+        ]:
+            if processor is not None:
+                self.simulation_processors.append(processor)
+
+        # The processors become idle once an event is logged or a timer
+        # fires, thus they are polled only then (or after skipped steps)
+        # rather than in every step. Missing an idle step is harmless
+        self._events_count = 0
+        self._polled_activity = None
+
+        for logger, _ in self._event_loggers():
+            logger.listeners.append(self._count_event)
+
+        # Record the time spent by every processor in each step, the
+        # profiler processor (lowest priority) closes the steps
+        if config["profile"]:
+            interval = config["profile_interval"]
+            self.profiler = TickProfiler(
+                report_interval=None if interval is None else interval * 3600
+            )
+            self.profiler.instrument(self.simulation_processors)
+            world.add_processor(ProfilerProcessor(self.profiler, context), priority=-1)
+        else:
+            self.profiler = None
+
+    def _event_loggers(self):
+        """Returns the event loggers and the names of their log files"""
+        return [
+            (self.context.vessel_event_logger, "vessel_events"),
+            (self.context.pilot_event_logger, "pilot_events"),
+            (self.context.tug_event_logger, "tug_events"),
+        ]
+
+    def _data_path(self, path):
+        return data_path(self.config["data_dir"], path)
+
+    def _position_logger(self, name):
+        extension = ".csv" if self.config["log_format"] == "csv" else ""
+
+        return ColumnarAISPositionLogger(
+            f"{self.config['out']}/{name}{extension}",
+            chunk_size=self.config["log_chunk_size"],
+            output_format=self.config["log_format"],
+        )
+
+    def step(self, max_steps=math.inf):
+        """Advances the simulation by one step or, in skip-ahead mode, by all
+        the next steps (up to max_steps) in which the processors are idle
+
+        :param max_steps: the maximum number of steps to advance by
+        :return: the number of steps the simulation advanced by
+        """
+        step = self.config["step"]
+        steps = self._idle_steps(step, max_steps) if self.config["skip_ahead"] else 0
+
+        if steps > 0:
+            self.world.process(step, steps)
+        else:
+            self.world.process(step)
+            steps = 1
+
+        for _ in range(steps):
+            self.current_time += step
+
+        self.context.run_info.update_time(steps)
+
+        return steps
+
+    def _idle_steps(self, step, max_steps):
+        activity = (self._events_count, self.context.timer_scheduler.fired_count)
+
+        if activity == self._polled_activity:
+            return 0
+
+        self._polled_activity = activity
+
+        steps = min(
+            idle_steps(self.simulation_processors, step), max_steps, MAX_IDLE_STEPS
+        )
+
+        if steps > 0:
+            # The processors might still be idle after the skipped steps
+            self._polled_activity = None
+
+        return steps
+
+    def _count_event(self, entity_id, event):
+        self._events_count += 1
+
+    def stop(self):
+        """Stops the simulation at the end of the current step"""
+        self.running = False
+
+    def close_console(self):
+        """Writes the pending verbose output and stops its writer thread"""
+        if self.console is not None:
+            self.console.close()
+
+    def run(self):
+        """Runs the simulation headless until it is stopped or, if a
+        max_time was specified, until max_time seconds were simulated.
+        The logs are then written to the output directory (if any).
+
+        :return: the results of the run, see results()
+        """
+        max_time = self.config["max_time"]
+        step = self.config["step"]
+        start_time = time.time()
+
+        while self.running:
+            if max_time is not None and self.current_time > max_time:
+                break
+
+            if max_time is None:
+                self.step()
+            else:
+                # Keep a step of margin for the rounding of the accumulated time
+                self.step(math.floor((max_time - self.current_time) / step))
+
+        self.running = False
+        self.wall_time = time.time() - start_time
+
+        self.close_console()
+        self.write_logs()
+
+        return self.results()
+
+    def write_logs(self):
+        """Writes the event, position and section logs to the output
+        directory. Nothing is written if no output directory was set, or if
+        the logs were already written.
+        """
+        out = self.config["out"]
+
+        if out is None or self._logs_written:
+            return
+
+        self._logs_written = True
+
+        for logger, name in self._event_loggers():
+            if logger.streaming:
+                logger.close_stream()
+            else:
+                logger.log_to_csv(f"{out}/{name}.csv")
+
+        self.vessel_logger_pos.logger.close()
+        self.pilot_logger_pos.logger.close()
+        self.tug_logger_pos.logger.close()
+
+        save_log_to_file(f"{out}/sections.csv", self.sections_logger.logger)
+
+        if self.profiler is not None:
+            self.profiler.write_json(f"{out}/profile.json")
+
+    def results(self):
+        """Returns the results of the run, i.e. its configuration and its
+        key performance indicators (see simulation.results.vessel_kpis).
+        """
+        results = {
+            "config": dict(self.config),
+            "simulation_time": self.current_time,
+            "wall_time": self.wall_time,
+        }
+
+        if self.streamed_kpis is not None:
+            results.update(self.streamed_kpis.results())
+        else:
+            results.update(vessel_kpis(self.context.vessel_event_logger.vessel_logs))
+
+        if self.profiler is not None:
+            results["profile"] = self.profiler.as_dict()
+
+        return results
+
+
+def run_simulation(config=None):
+    """Runs an headless simulation.
+
+    :param config: the simulation configuration, see make_config. A max_time
+        is required, as the simulation would otherwise run forever
+    :return: the results of the run, see Simulation.results
+    """
+    config = make_config(config)
+    assert config["max_time"] is not None, "A max_time is required"
+
+    return Simulation(config).run()
@@ -0,0 +1,568 @@
+import csv
+import json
+import math
+import os
+
+import numpy as np
+
+from simulation.simulation import (anchorages_filename, berths_filename,
+                                   ocean_berth_traces_folder,
+                                   ocean_pilots_rv_traces_folder,
+                                   ocean_tug_wl_traces_folder,
+                                   ocean_tugs_rv_traces_folder,
+                                   pilots_rendezvous_filename,
+                                   pilots_rv_berth_traces_folder,
+                                   pilots_rv_tugs_rv_traces_folder,
+                                   pilots_waiting_location_filename,
+                                   pilots_wl_berth_traces_folder,
+                                   pilots_wl_pilot_rv_traces_folder,
+                                   sections_filename, spawn_area_filename,
+                                   terminal_service_times_filename,
+                                   tugs_deattach_location_filename,
+                                   tugs_rendezvous_filename,
+                                   tugs_rv_berth_traces_folder,
+                                   tugs_waiting_locations_filename,
+                                   tugs_wl_tugs_rv_traces_folder)
+
+# The sea side of the synthetic port is the one of the example port: vessels
+# spawn in the same area and wait in the same anchorages (lon, lat)
+SPAWN_AREA = [
+    [3.9825439453125, 51.434320273775626],
+    [3.9722442626953125, 51.41762278159904],
+    [4.0230560302734375, 51.40520274223228],
+    [4.031982421875, 51.42490192575532],
+    [4.0024566650390625, 51.431323737268755],
+    [3.9825439453125, 51.434320273775626],
+]
+ANCHORAGES = [
+    (
+        "1",
+        20,
+        [
+            [4.089317321777344, 51.40348936856666],
+            [4.079017639160156, 51.394921537317366],
+            [4.126396179199219, 51.38860173348145],
+            [4.126567840576172, 51.39749205520681],
+            [4.089317321777344, 51.40348936856666],
+        ],
+    ),
+    (
+        "2",
+        10,
+        [
+            [4.062023162841797, 51.377138167062725],
+            [4.0615081787109375, 51.367815206777905],
+            [4.0944671630859375, 51.36395687478539],
+            [4.101676940917969, 51.372209022284004],
+            [4.062023162841797, 51.377138167062725],
+        ],
+    ),
+]
+
+# Start of the ocean traces, next to the spawn area
+OCEAN_POINT = (4.035, 51.405)
+
+# The port entrance, where the pilots board. The channel runs east from it,
+# the docks of the sections branch off the channel north and south
+ENTRANCE = (4.1425, 51.3825)
+CHANNEL_START = ENTRANCE[0] + 0.01
+SECTION_WIDTH = 0.005
+DOCK_OFFSET = 0.003
+BERTH_SPACING = 0.0015
+BERTH_OFFSET = 0.0008
+LOCATION_SIZE = 0.0006
+
+# The ship types of the berths, see VesselContentType
+BERTH_SHIP_TYPES = (2, 3, 4)
+
+
+def square(center, size=LOCATION_SIZE):
+    """Returns the closed ring of a square around a point"""
+    lon, lat = center
+    half = size / 2
+
+    return [
+        [lon - half, lat - half],
+        [lon + half, lat - half],
+        [lon + half, lat + half],
+        [lon - half, lat + half],
+        [lon - half, lat - half],
+    ]
+
+
+def rectangle(min_lon, min_lat, max_lon, max_lat):
+    """Returns the closed ring of a rectangle"""
+    return [
+        [min_lon, min_lat],
+        [max_lon, min_lat],
+        [max_lon, max_lat],
+        [min_lon, max_lat],
+        [min_lon, min_lat],
+    ]
+
+
+def feature(geometry_type, coordinates, properties=None):
+    return {
+        "type": "Feature",
+        "properties": properties or {},
+        "geometry": {"type": geometry_type, "coordinates": coordinates},
+    }
+
+
+def write_features(filename, features):
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+
+    with open(filename, "w") as out_file:
+        json.dump({"type": "FeatureCollection", "features": features}, out_file)
+
+
+class SyntheticPort:
+    """Generator of the dataset of a synthetic port of a configurable size.
+
+    The port has the layout of the datasets read by the simulation (see
+    DEFAULT_DATA_DIR): the sections, berths and terminals, the anchorages,
+    the rendezvous and waiting locations of the tugs and the pilots, and the
+    traces of the ten route families between them. Every location is
+    reachable by the routes the simulation looks up, so that the dataset
+    can replace the example one, e.g. to measure how the simulation scales
+    with the number of berths and traces.
+
+    The berths are spread over sections of berths_per_section berths, one
+    terminal and one tug rendezvous per section. The traces of a route
+    follow the same waypoints with a random jitter, drawn from the seed.
+    """
+
+    def __init__(
+        self,
+        berths=100,
+        berths_per_section=20,
+        tug_waiting_locations=2,
+        pilots=10,
+        tugs=10,
+        traces_per_route=2,
+        traces_per_file=1000,
+        waypoint_spacing=0.005,
+        jitter=0.0002,
+        seed=0,
+    ):
+        """
+        :param berths: number of berths
+        :param berths_per_section: number of berths in every section
+        :param tug_waiting_locations: number of tug waiting locations, spread
+            along the channel
+        :param pilots: number of pilots, in a single waiting location
+        :param tugs: number of tugs, shared between the waiting locations
+        :param traces_per_route: number of traces between every origin and
+            destination
+        :param traces_per_file: maximum number of traces in a GeoJSON file
+        :param waypoint_spacing: maximum distance between two waypoints of a
+            trace, in degrees
+        :param jitter: standard deviation of the displacement of the
+            waypoints, in degrees
+        :param seed: seed of the random jitter
+        """
+        assert berths > 0, "At least one berth is required"
+        assert berths_per_section > 0, "At least one berth per section is required"
+        assert (
+            tug_waiting_locations > 0
+        ), "At least one tug waiting location is required"
+        assert pilots > 0 and tugs > 0, "At least one pilot and one tug are required"
+        assert traces_per_route > 0, "At least one trace per route is required"
+        assert traces_per_file > 0, "At least one trace per file is required"
+        assert waypoint_spacing > 0, "The waypoint spacing should be positive"
+        assert jitter >= 0, "The jitter should be >= 0"
+
+        self.berths = berths
+        self.berths_per_section = berths_per_section
+        self.sections = math.ceil(berths / berths_per_section)
+        self.tug_waiting_locations = tug_waiting_locations
+        self.pilots = pilots
+        self.tugs = tugs
+        self.traces_per_route = traces_per_route
+        self.traces_per_file = traces_per_file
+        self.waypoint_spacing = waypoint_spacing
+        self.jitter = jitter
+        self.seed = seed
+
+        # Length of the docks, north and south of the channel
+        self.dock_length = (
+            DOCK_OFFSET + math.ceil(berths_per_section / 2) * BERTH_SPACING
+        )
+
+    def generate(self, data_dir):
+        """Writes the dataset of the port to a directory
+
+        :param data_dir: the directory, e.g. the --data-dir of main.py
+        :return: dictionary with the size of the generated dataset
+        """
+        rng = np.random.default_rng(self.seed)
+
+        self._write_sections(data_dir, rng)
+        self._write_berths(data_dir, rng)
+        self._write_locations(data_dir)
+
+        traces = {}
+        waypoints = 0
+
+        for folder, routes in self._routes().items():
+            count, folder_waypoints = self._write_traces(
+                os.path.join(data_dir, folder), routes, rng
+            )
+
+            traces[os.path.basename(folder)] = count
+            waypoints += folder_waypoints
+
+        return {
+            "berths": self.berths,
+            "sections": self.sections,
+            "tug_waiting_locations": self.tug_waiting_locations,
+            "pilots": self.pilots,
+            "tugs": self.tugs,
+            "traces": traces,
+            "waypoints": waypoints,
+        }
+
+    def section_of_berth(self, berth_id):
+        """Returns the number (from 1) of the section of a berth"""
+        return berth_id // self.berths_per_section + 1
+
+    def _mouth(self, section):
+        """Returns the point where the dock of a section meets the channel"""
+        return (CHANNEL_START + (section - 0.5) * SECTION_WIDTH, ENTRANCE[1])
+
+    def _berth_position(self, berth_id):
+        index = berth_id % self.berths_per_section
+        side = 1 if index % 2 == 0 else -1
+        mouth_lon, channel_lat = self._mouth(self.section_of_berth(berth_id))
+
+        return (
+            mouth_lon + BERTH_OFFSET,
+            channel_lat + side * (DOCK_OFFSET + index // 2 * BERTH_SPACING),
+        )
+
+    def _tug_waiting_location(self, location_id):
+        """Returns the channel point of a tug waiting location and its center"""
+        # The waiting locations are between two docks
+        boundary = math.floor(
+            (location_id - 0.5) * self.sections / self.tug_waiting_locations
+        )
+        channel_point = (CHANNEL_START + boundary * SECTION_WIDTH, ENTRANCE[1])
+
+        return channel_point, (channel_point[0], channel_point[1] - 0.001)
+
+    def _pilot_waiting_location(self):
+        """Returns the channel point of the pilot waiting location and its center"""
+        channel_point = (ENTRANCE[0] + 0.004, ENTRANCE[1])
+
+        return channel_point, (channel_point[0], channel_point[1] - 0.004)
+
+    def _dock(self, berth_id):
+        """Returns the waypoints from the mouth of a dock to one of its berths"""
+        mouth = self._mouth(self.section_of_berth(berth_id))
+        berth = self._berth_position(berth_id)
+
+        return [mouth, (mouth[0], berth[1]), berth]
+
+    def _write_sections(self, data_dir, rng):
+        features = []
+        half_height = self.dock_length + 0.002
+
+        for section in range(1, self.sections + 1):
+            min_lon = CHANNEL_START + (section - 1) * SECTION_WIDTH
+            speeds = rng.uniform(6.0, 10.0, 2).round(1)
+
+            features.append(
+                feature(
+                    "Polygon",
+                    [
+                        rectangle(
+                            min_lon,
+                            ENTRANCE[1] - half_height,
+                            min_lon + SECTION_WIDTH,
+                            ENTRANCE[1] + half_height,
+                        )
+                    ],
+                    {
+                        "name": f"section_{section}",
+                        "follows_after_section": section - 1,
+                        "speed": {
+                            f"class_{i + 1}": {"min": 0.0, "max": float(speed)}
+                            for i, speed in enumerate(speeds)
+                        },
+                        "allowed_classes": [],
+                    },
+                )
+            )
+
+        write_features(os.path.join(data_dir, sections_filename), features)
+
+    def _write_berths(self, data_dir, rng):
+        os.makedirs(data_dir, exist_ok=True)
+
+        with open(os.path.join(data_dir, berths_filename), "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(
+                [
+                    "id",
+                    "name",
+                    "lat",
+                    "lon",
+                    "type",
+                    "max_quay_length",
+                    "max_depth",
+                    "ship_types",
+                    "terminal",
+                    "section",
+                ]
+            )
+
+            for berth_id in range(self.berths):
+                lon, lat = self._berth_position(berth_id)
+                section = self.section_of_berth(berth_id)
+
+                writer.writerow(
+                    [
+                        berth_id,
+                        f"Berth {berth_id + 1}",
+                        lat,
+                        lon,
+                        "quay",
+                        250,
+                        20,
+                        BERTH_SHIP_TYPES[berth_id % len(BERTH_SHIP_TYPES)],
+                        f"terminal {section}",
+                        section,
+                    ]
+                )
+
+        # A terminal per section, serving both vessel classes
+        service_times = rng.integers(1000, 1700, (self.sections, 2))
+
+        with open(
+            os.path.join(data_dir, terminal_service_times_filename), "w", newline=""
+        ) as f:
+            writer = csv.writer(f)
+            writer.writerow(["terminal", "section", "class 1", "class 2"])
+
+            for section, (class_1, class_2) in enumerate(service_times, start=1):
+                writer.writerow([f"terminal {section}", section, class_1, class_2])
+
+    def _write_locations(self, data_dir):
+        write_features(
+            os.path.join(data_dir, spawn_area_filename),
+            [feature("Polygon", SPAWN_AREA)],
+        )
+        write_features(
+            os.path.join(data_dir, anchorages_filename),
+            [
+                feature(
+                    "Polygon",
+                    shape,
+                    {"name": name, "max_draught": draught, "use": "", "id": i},
+                )
+                for i, (name, draught, shape) in enumerate(ANCHORAGES)
+            ],
+        )
+
+        # The tugs leave the vessels departing the port between the first
+        # dock and the ocean. The tugs only check it every few ticks, so the
+        # area spans several kilometres of the route
+        write_features(
+            os.path.join(data_dir, tugs_deattach_location_filename),
+            [
+                feature(
+                    "Polygon",
+                    [
+                        rectangle(
+                            OCEAN_POINT[0] + 0.025,
+                            ENTRANCE[1] - 0.003,
+                            CHANNEL_START - 0.001,
+                            OCEAN_POINT[1] - 0.005,
+                        )
+                    ],
+                )
+            ],
+        )
+        write_features(
+            os.path.join(data_dir, tugs_rendezvous_filename),
+            [
+                feature(
+                    "Point",
+                    list(self._mouth(section)),
+                    {"id": str(section), "vessel_final_destination": [section]},
+                )
+                for section in range(1, self.sections + 1)
+            ],
+        )
+        write_features(
+            os.path.join(data_dir, pilots_rendezvous_filename),
+            [
+                feature(
+                    "Point",
+                    list(ENTRANCE),
+                    {
+                        "id": 1,
+                        "usage": "arrival",
+                        "vessel_class": ["1", "2"],
+                        "pilot_access": "ship",
+                    },
+                )
+            ],
+        )
+
+        tugs_per_location = np.full(
+            self.tug_waiting_locations, self.tugs // self.tug_waiting_locations
+        )
+        tugs_per_location[: self.tugs % self.tug_waiting_locations] += 1
+
+        write_features(
+            os.path.join(data_dir, tugs_waiting_locations_filename),
+            [
+                feature(
+                    "Polygon",
+                    [square(self._tug_waiting_location(location_id)[1])],
+                    {
+                        "id": location_id,
+                        "tugboats_count": int(count),
+                        "name": f"tug_location_{location_id}",
+                        "companies": ["Synthetic Tug Company"],
+                        "tugs_per_company": [int(count)],
+                    },
+                )
+                for location_id, count in enumerate(tugs_per_location, start=1)
+            ],
+        )
+        write_features(
+            os.path.join(data_dir, pilots_waiting_location_filename),
+            [
+                feature(
+                    "Polygon",
+                    [square(self._pilot_waiting_location()[1])],
+                    {
+                        "id": 1,
+                        "pilots_count": self.pilots,
+                        "name": "pilot_location_1",
+                        "companies": ["Synthetic Pilot Company"],
+                        "pilots_per_company": [self.pilots],
+                    },
+                )
+            ],
+        )
+
+    def _routes(self):
+        """Returns the routes of every trace folder, as lists of (origin,
+        destination, waypoints) tuples"""
+        berths = range(self.berths)
+        sections = range(1, self.sections + 1)
+        tug_locations = range(1, self.tug_waiting_locations + 1)
+        pilot_channel, pilot_location = self._pilot_waiting_location()
+
+        return {
+            ocean_berth_traces_folder: [
+                ("ocean:1", f"berth:{b}", [OCEAN_POINT, ENTRANCE, *self._dock(b)])
+                for b in berths
+            ],
+            ocean_tugs_rv_traces_folder: [
+                (
+                    "ocean:1",
+                    f"tug_rendezvous:{s}",
+                    [OCEAN_POINT, ENTRANCE, self._mouth(s)],
+                )
+                for s in sections
+            ],
+            ocean_pilots_rv_traces_folder: [
+                ("ocean:1", "pilot_rendezvous:1", [OCEAN_POINT, ENTRANCE])
+            ],
+            pilots_rv_berth_traces_folder: [
+                ("pilot_rendezvous:1", f"berth:{b}", [ENTRANCE, *self._dock(b)])
+                for b in berths
+            ],
+            tugs_rv_berth_traces_folder: [
+                (
+                    f"tug_rendezvous:{self.section_of_berth(b)}",
+                    f"berth:{b}",
+                    self._dock(b),
+                )
+                for b in berths
+            ],
+            pilots_rv_tugs_rv_traces_folder: [
+                (
+                    "pilot_rendezvous:1",
+                    f"tug_rendezvous:{s}",
+                    [ENTRANCE, self._mouth(s)],
+                )
+                for s in sections
+            ],
+            tugs_wl_tugs_rv_traces_folder: [
+                (
+                    f"tug_waiting_location:{w}",
+                    f"tug_rendezvous:{s}",
+                    [*self._tug_waiting_location(w)[::-1], self._mouth(s)],
+                )
+                for w in tug_locations
+                for s in sections
+            ],
+            pilots_wl_pilot_rv_traces_folder: [
+                (
+                    "pilot_waiting_location:1",
+                    "pilot_rendezvous:1",
+                    [pilot_location, ENTRANCE],
+                )
+            ],
+            pilots_wl_berth_traces_folder: [
+                (
+                    "pilot_waiting_location:1",
+                    f"berth:{b}",
+                    [pilot_location, pilot_channel, *self._dock(b)],
+                )
+                for b in berths
+            ],
+            ocean_tug_wl_traces_folder: [
+                (
+                    "ocean:1",
+                    f"tug_waiting_location:{w}",
+                    [OCEAN_POINT, ENTRANCE, *self._tug_waiting_location(w)],
+                )
+                for w in tug_locations
+            ],
+        }
+
+    def _trace_coords(self, waypoints, rng):
+        """Returns the coordinates of a trace along the given waypoints"""
+        waypoints = np.array(waypoints, dtype=float)
+        points = [waypoints[:1]]
+
+        for start, end in zip(waypoints[:-1], waypoints[1:]):
+            steps = max(1, math.ceil(np.hypot(*(end - start)) / self.waypoint_spacing))
+            points.append(
+                start + np.outer(np.arange(1, steps + 1) / steps, end - start)
+            )
+
+        coords = np.concatenate(points)
+
+        # The endpoints stay on the locations they connect
+        coords[1:-1] += rng.normal(0, self.jitter, (len(coords) - 2, 2))
+
+        return coords.round(6)
+
+    def _write_traces(self, folder, routes, rng):
+        features = [
+            feature(
+                "LineString",
+                self._trace_coords(waypoints, rng).tolist(),
+                {"origin": origin, "destination": destination},
+            )
+            for origin, destination, waypoints in routes
+            for _ in range(self.traces_per_route)
+        ]
+        name = os.path.basename(folder)
+
+        for i, start in enumerate(range(0, len(features), self.traces_per_file)):
+            write_features(
+                os.path.join(folder, f"{name}_{i:03d}.geojson"),
+                features[start : start + self.traces_per_file],
+            )
+
+        waypoints = sum(len(f["geometry"]["coordinates"]) for f in features)
+
+        return len(features), waypoints
@@ -16,8 +16,8 @@ def world_and_timer_processor():
 
     world.add_processor(timer_processor)
 
-    timer_scheduler = TimerScheduler.get_instance()
-    timer_scheduler.world = world
+    # Discard the timers scheduled by previous tests
+    TimerScheduler.get_instance().clear()
 
     return world, timer_processor
 
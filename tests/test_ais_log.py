@@ -0,0 +1,118 @@
+import csv
+
+import numpy as np
+import pytest
+
+from components import Course, Position, Velocity
+from processors.ais.model import AISPositionLogger, ColumnarAISPositionLogger
+
+
+def add_logs(logger, count):
+    for i in range(count):
+        logger.add_log(
+            i % 3,
+            Position(np.array([4.0 + i / 10, 51.0 + i / 10])),
+            Velocity(10.5),
+            Course(i / 100),
+            "speeding_up" if i % 2 else None,
+            float(i * 10),
+            state="idle",
+        )
+
+
+def test_csv_chunks(tmp_path):
+    filename = f"{tmp_path}/pos.csv"
+
+    in_memory_logger = AISPositionLogger()
+    logger = ColumnarAISPositionLogger(filename, chunk_size=4)
+
+    add_logs(in_memory_logger, 10)
+    add_logs(logger, 10)
+
+    # Full chunks are written to disk, the rest is kept in memory
+    assert logger.chunks_count == 2
+    assert len(logger.logs) == 2
+
+    logger.close()
+
+    with open(filename) as in_file:
+        rows = list(csv.reader(in_file))
+
+    expected_rows = [
+        ["" if v is None else str(v) for v in row] for row in in_memory_logger.logs
+    ]
+
+    assert rows[0] == logger.header()[0]
+    assert rows[1:] == expected_rows
+
+
+def test_npz_chunks(tmp_path):
+    filename = f"{tmp_path}/pos"
+
+    logger = ColumnarAISPositionLogger(filename, chunk_size=4, output_format="npz")
+    add_logs(logger, 6)
+    logger.close()
+
+    first_chunk = np.load(f"{filename}.00000.npz")
+    last_chunk = np.load(f"{filename}.00001.npz")
+
+    assert len(first_chunk["entity"]) == 4
+    assert len(last_chunk["entity"]) == 2
+    assert last_chunk["timestamp"].tolist() == [40.0, 50.0]
+    assert last_chunk["speed_fsm_state"].tolist() == ["", "speeding_up"]
+    assert last_chunk["state"].tolist() == ["idle", "idle"]
+
+
+def test_invalid_format(tmp_path):
+    with pytest.raises(AssertionError):
+        ColumnarAISPositionLogger(f"{tmp_path}/pos", output_format="xml")
+
+
+@pytest.mark.parametrize("chunk_size", [4, 100])
+def test_bulk_logs(tmp_path, chunk_size):
+    entities = [3, 1, 2]
+    lonlats = np.array([[4.0, 51.0], [4.1, 51.1], [4.2, 51.2]])
+    velocities = np.array([[10.0, 0.5, 1.0], [10.0, 0.6, 1.0], [10.0, 0.7, 1.0]])
+    courses = [0.1, 0.2, 0.3]
+    speed_fsm_states = ["double", None, None]
+    timestamps = [10.0, 20.0, 30.0]
+    states = ["servicing", "left", "idle"]
+
+    in_memory_logger = AISPositionLogger()
+    logger = ColumnarAISPositionLogger(f"{tmp_path}/pos.csv", chunk_size=chunk_size)
+
+    # The bulk logs are the ones added one by one, in timestamp order
+    for timestamp, step_velocities in zip(timestamps, velocities):
+        for i, ent in enumerate(entities):
+            in_memory_logger.add_log(
+                ent,
+                Position(lonlats[i]),
+                Velocity(float(step_velocities[i])),
+                Course(courses[i]),
+                speed_fsm_states[i],
+                timestamp,
+                state=states[i],
+            )
+
+    logger.add_log(0, Position(lonlats[0]), Velocity(1.0), Course(0.0), None, 0)
+    logger.add_logs(
+        entities, lonlats, velocities, courses, speed_fsm_states, timestamps, states
+    )
+    logger.close()
+
+    with open(f"{tmp_path}/pos.csv") as in_file:
+        rows = list(csv.reader(in_file))
+
+    expected_rows = [
+        ["" if v is None else str(v) for v in row] for row in in_memory_logger.logs
+    ]
+
+    assert rows[2:] == expected_rows
+    assert logger.chunks_count == (3 if chunk_size == 4 else 1)
+
+    bulk_logger = AISPositionLogger()
+    bulk_logger.add_logs(
+        entities, lonlats, velocities, courses, speed_fsm_states, timestamps, states
+    )
+
+    assert bulk_logger.logs == in_memory_logger.logs
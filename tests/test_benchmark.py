@@ -0,0 +1,60 @@
+"""
+    Tests the comparison of the benchmark reports with a baseline
+"""
+
+import copy
+
+import pytest
+
+from simulation.benchmark import REPORT_VERSION, compare_to_baseline
+
+
+def benchmark_report(ticks_per_second, peak_rss_mb, vessels_departed=10):
+    metrics = {
+        "ticks_per_second": ticks_per_second,
+        "simulated_hours_per_second": ticks_per_second / 360,
+        "peak_rss_mb": peak_rss_mb,
+        "kpis": {"vessels_departed": vessels_departed},
+    }
+
+    return {"version": REPORT_VERSION, "scenarios": {"small": metrics}}
+
+
+def comparison(comparisons, metric):
+    return next(c for c in comparisons if c["metric"] == metric)
+
+
+def test_compare_to_baseline():
+    baseline = benchmark_report(1000, 100)
+
+    comparisons = compare_to_baseline(benchmark_report(950, 105), baseline, 0.1)
+
+    assert comparison(comparisons, "ticks_per_second")["change"] == pytest.approx(-0.05)
+    assert not any(c["regression"] for c in comparisons)
+
+    # Slower, larger and with different indicators
+    comparisons = compare_to_baseline(benchmark_report(800, 120, 9), baseline, 0.1)
+
+    assert comparison(comparisons, "ticks_per_second")["regression"]
+    assert comparison(comparisons, "simulated_hours_per_second")["regression"]
+    assert comparison(comparisons, "peak_rss_mb")["regression"]
+    assert comparison(comparisons, "kpis")["regression"]
+
+    # Faster runs are not regressions
+    comparisons = compare_to_baseline(benchmark_report(2000, 50), baseline, 0.1)
+
+    assert not any(c["regression"] for c in comparisons)
+
+
+def test_compare_other_scenarios():
+    report = benchmark_report(1000, 100)
+    baseline = copy.deepcopy(report)
+    baseline["scenarios"]["large"] = baseline["scenarios"].pop("small")
+
+    # Only the scenarios in both reports are compared
+    assert compare_to_baseline(report, baseline) == []
+
+    baseline["version"] = REPORT_VERSION + 1
+
+    with pytest.raises(AssertionError):
+        compare_to_baseline(report, baseline)
@@ -0,0 +1,78 @@
+"""
+    Tests that the console logger writes the verbose output from its
+    writer thread, filtered by level, batched and rate limited
+"""
+
+import io
+import logging
+
+from components import TugInfo
+from environment import RunInfo
+from log.console import ConsoleLogger
+from log.events.tug import TugEvent
+from log.tug import TugEventLogger
+
+
+def message(timestamp, text):
+    return text
+
+
+def test_console_logger():
+    output = io.StringIO()
+    console = ConsoleLogger(level=logging.INFO, batch_size=2, output=output)
+
+    console.log(logging.DEBUG, message, "ignored")
+
+    for i in range(5):
+        console.log(logging.INFO, message, f"message {i}")
+
+    console.close()
+
+    assert console.closed
+    assert output.getvalue().splitlines() == [f"message {i}" for i in range(5)]
+
+
+def test_dropped_messages():
+    output = io.StringIO()
+    console = ConsoleLogger(max_rate=2, capacity=5, flush_interval=60, output=output)
+
+    # The writer does not wake up before close, the buffer fills up
+    for i in range(8):
+        console.log(logging.WARNING, message, f"message {i}")
+
+    console.close()
+
+    assert output.getvalue().splitlines() == [
+        "message 0",
+        "message 1",
+        "[6 console messages dropped]",
+    ]
+
+
+def test_event_logger_console():
+    run_info = RunInfo()
+    run_info.set_simulation_start_time(1000)
+
+    output = io.StringIO()
+    console = ConsoleLogger(output=output)
+
+    logger = TugEventLogger(run_info)
+    logger.verbose = True
+    logger.console = console
+    logger.log_event(3, TugInfo(), TugEvent("idle → going_to_rendezvous", 1.0, 1060))
+
+    # The events are formatted by the writer thread
+    console.close()
+
+    assert "Tug 3" in output.getvalue()
+    assert "IDLE → GOING_TO_RENDEZVOUS" in output.getvalue()
+
+    output = io.StringIO()
+    console = ConsoleLogger(level=logging.INFO, output=output)
+
+    logger.console = console
+    logger.log_event(3, TugInfo(), TugEvent("idle → going_to_rendezvous", 1.0, 1120))
+    console.close()
+
+    # The tug events are debug messages
+    assert output.getvalue() == ""
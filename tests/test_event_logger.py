@@ -0,0 +1,117 @@
+"""
+Tests the event loggers: the interned event types, the static
+information kept once per entity and the streaming of the events
+"""
+
+import pytest
+
+from components import TugInfo, VesselInfo
+from environment import RunInfo
+from example.example_model.vessel_class import VesselClass
+from log.events.codes import event_code, transition_code
+from log.events.tug import TugEvent
+from log.events.vessel import VesselEvent
+from log.tug import TugEventLogger
+from log.vessel import VesselEventLogger
+from simulation import VesselKPIs, vessel_kpis
+
+from .fixtures.vessel_ctype import VesselContentType
+
+
+@pytest.fixture
+def run_info():
+    run_info = RunInfo()
+    run_info.set_simulation_start_time(1000)
+
+    return run_info
+
+
+def vessel_events():
+    events = [
+        ("1", "incoming → going_to_berth", 1000),
+        ("2", "incoming → going_to_anchorage", 1100),
+        ("1", "going_to_berth → servicing", 1500),
+        ("2", "going_to_anchorage → waiting_at_anchorage", 1600),
+        ("1", "servicing → leaving", 2500),
+        ("2", "waiting_at_anchorage → going_to_berth", 2600),
+        ("1", "leaving → left", 3000),
+    ]
+
+    return [
+        (vessel_id, VesselEvent(event_type, 5.0, None, None, None, None, timestamp))
+        for vessel_id, event_type, timestamp in events
+    ]
+
+
+def test_event_codes():
+    code = event_code("incoming → going_to_berth")
+
+    assert transition_code("incoming", "going_to_berth") == code
+    assert event_code("incoming → going_to_berth") == code
+    assert event_code("going_to_berth → servicing") != code
+
+    event = TugEvent(code, 10.0, 1200)
+
+    assert event.event_type == "incoming → going_to_berth"
+    assert event.to_list(TugInfo(length=20), 1000)[1:3] == [200.0, 20]
+
+
+def test_streamed_events(tmp_path, run_info):
+    vessel_info = VesselInfo(
+        length=200,
+        vessel_type=VesselContentType.LIQUID_BULK,
+        vessel_class=VesselClass.CLASS_1,
+        number_of_tugboats=2,
+    )
+
+    streamed = TugEventLogger(run_info)
+    streamed.stream_to(tmp_path / "streamed.csv")
+    logger = TugEventLogger(run_info)
+
+    for timestamp in (1000, 1100, 1200):
+        event = TugEvent("idle → going_to_rendezvous", 10.0, timestamp)
+
+        streamed.log_event(3, TugInfo(), event)
+        logger.log_event(3, TugInfo(), event)
+
+    streamed.close_stream()
+    logger.log_to_csv(tmp_path / "logged.csv")
+
+    assert (tmp_path / "streamed.csv").read_text() == (
+        tmp_path / "logged.csv"
+    ).read_text()
+    assert len(logger.tug_logs["3"]["events"]) == 3
+
+    # The streamed events are not kept, the static information is kept once
+    assert streamed.tug_logs["3"]["events"] == []
+    assert streamed.tug_logs["3"]["name"] == "Tug 3"
+
+    vessel_logger = VesselEventLogger(run_info)
+    vessel_logger.log_event(
+        1,
+        vessel_info,
+        VesselEvent(
+            transition_code("going_to_berth", "servicing"), 0, 7, (3, 4), 0, None, 1500
+        ),
+    )
+
+    assert vessel_logger.vessel_logs["1"]["info"] is not vessel_info
+    assert vessel_logger.vessel_logs["1"]["name"] == vessel_info.name
+
+    row = vessel_logger.vessel_logs["1"]["events"][0].to_list(vessel_info, 1000)
+    assert row[11:] == [7, [3, 4], 0, None, "GOING_TO_BERTH → SERVICING"]
+
+
+def test_incremental_kpis(run_info):
+    logger = VesselEventLogger(run_info)
+    kpis = VesselKPIs()
+    logger.listeners.append(kpis.add)
+
+    for vessel_id, event in vessel_events():
+        logger.log_event(vessel_id, VesselInfo(), event)
+
+    # The events of the vessels are interleaved
+    assert kpis.results() == vessel_kpis(logger.vessel_logs)
+    assert kpis.results()["vessels_arrived"] == 2
+    assert kpis.results()["vessels_departed"] == 1
+    assert kpis.results()["mean_anchorage_time"] == 0
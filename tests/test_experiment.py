@@ -0,0 +1,89 @@
+"""
+    Tests the experiment runner helpers: the configurations, the
+    parameter grids and the results aggregation
+"""
+
+import pytest
+
+from log.events.vessel import VesselEvent
+from simulation import (DEFAULT_CONFIG, aggregate_results, make_config,
+                        parameter_grid, vessel_kpis)
+
+
+def vessel_event(event_type, timestamp):
+    return VesselEvent(event_type, None, None, None, None, None, timestamp)
+
+
+def test_make_config():
+    config = make_config({"tugs_count": 2}, seed=4)
+
+    assert config["tugs_count"] == 2
+    assert config["seed"] == 4
+    assert config["step"] == DEFAULT_CONFIG["step"]
+
+    with pytest.raises(ValueError):
+        make_config(tugs=2)
+
+
+def test_parameter_grid():
+    grid = parameter_grid({"tugs_count": [2, 3], "berth_check_prob": [0, 0.1]})
+
+    assert grid == [
+        {"tugs_count": 2, "berth_check_prob": 0},
+        {"tugs_count": 2, "berth_check_prob": 0.1},
+        {"tugs_count": 3, "berth_check_prob": 0},
+        {"tugs_count": 3, "berth_check_prob": 0.1},
+    ]
+    assert parameter_grid({}) == [{}]
+
+
+def test_vessel_kpis():
+    vessel_logs = {
+        "1": {
+            "name": "departed",
+            "events": [
+                vessel_event("incoming → going_to_anchorage", 0),
+                vessel_event("going_to_anchorage → waiting_at_anchorage", 100),
+                vessel_event("CHANGE-SECTION (OCEAN → SECTION_1)", 150),
+                vessel_event("waiting_at_anchorage → going_to_berth", 400),
+                vessel_event("going_to_berth → servicing", 500),
+                vessel_event("servicing → leaving", 1500),
+                vessel_event("leaving → left", 2000),
+            ],
+        },
+        "2": {
+            "name": "servicing",
+            "events": [
+                vessel_event("incoming → going_to_berth", 1000),
+                vessel_event("going_to_berth → servicing", 1200),
+            ],
+        },
+    }
+
+    kpis = vessel_kpis(vessel_logs)
+
+    assert kpis["vessels_arrived"] == 2
+    assert kpis["vessels_departed"] == 1
+    assert kpis["mean_port_time"] == 2000
+    assert kpis["mean_anchorage_time"] == 300
+    assert kpis["mean_service_time"] == 1000
+
+    assert vessel_kpis({})["mean_port_time"] is None
+
+
+def test_aggregate_results():
+    runs = [
+        {"seed": 0, "departed": 10, "port_time": None, "skip": True, "wall_time": 2.0},
+        {"seed": 1, "departed": 14, "port_time": 5.0, "skip": False, "wall_time": 3.0},
+    ]
+
+    aggregated = aggregate_results(runs)
+
+    assert "skip" not in aggregated
+    assert "wall_time" not in aggregated
+    assert aggregated["departed"]["mean"] == 12
+    assert aggregated["departed"]["runs"] == 2
+    assert aggregated["departed"]["ci"] > aggregated["departed"]["std"]
+
+    # Indicators with a single value have no spread
+    assert aggregated["port_time"] == {"mean": 5.0, "std": 0.0, "ci": 0.0, "runs": 1}
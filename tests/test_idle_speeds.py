@@ -0,0 +1,29 @@
+from environment import RunInfo
+from environment.idle_speeds import IdleSpeeds
+
+
+def test_history_computed_once():
+    run_info = RunInfo()
+    run_info.set_simulation_start_time(1000)
+    run_info.set_simulation_step_size(10)
+
+    calls = []
+
+    def compute(steps):
+        calls.append(steps)
+        return {1: list(range(steps + 1))}
+
+    idle_speeds = IdleSpeeds(run_info)
+    assert idle_speeds.history(3) == {}
+
+    idle_speeds.compute = compute
+
+    # Shared by all the readers of the same idle steps
+    assert idle_speeds.history(3) == {1: [0, 1, 2, 3]}
+    assert idle_speeds.history(3) == {1: [0, 1, 2, 3]}
+    assert calls == [3]
+
+    # Computed again for the next idle steps
+    run_info.update_time(3)
+    assert idle_speeds.history(2) == {1: [0, 1, 2]}
+    assert calls == [3, 2]
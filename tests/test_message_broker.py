@@ -60,3 +60,49 @@ def test_message_entities():
     # is not numeric
     with pytest.raises(ValueError):
         message.destination_entity_id
+
+
+def test_drain(message_broker):
+    messages = [
+        SimulationMessage(sender="test-sender", destination=TEST_RECEIVER, message=i)
+        for i in range(3)
+    ]
+
+    for message in messages:
+        message_broker.send_message(message)
+
+    assert message_broker.has_messages(TEST_RECEIVER)
+
+    drained = message_broker.drain(TEST_RECEIVER)
+
+    # The queue is emptied and the messages are returned in order
+    assert not message_broker.has_messages(TEST_RECEIVER)
+    assert [message.message for message in drained] == [0, 1, 2]
+    assert len(message_broker.drain(TEST_RECEIVER)) == 0
+
+
+def test_message_ids():
+    first = SimulationMessage(sender="ent:1", destination=TEST_RECEIVER, message="a")
+    second = SimulationMessage(sender="ent:1", destination=TEST_RECEIVER, message="a")
+
+    assert isinstance(first.id, int)
+    assert second.id > first.id
+
+
+def test_status_coalescing(message_broker, mock_message):
+    message_broker.send_status("ent:1", TEST_RECEIVER, "waiting")
+    message_broker.send_message(mock_message)
+    message_broker.send_status("ent:2", TEST_RECEIVER, "waiting")
+    message_broker.send_status("ent:1", TEST_RECEIVER, "moving")
+
+    # Only the latest status of a sender is delivered, in its first position
+    drained = list(message_broker.drain(TEST_RECEIVER))
+    assert [(m.sender, m.message) for m in drained] == [
+        ("ent:1", "moving"),
+        ("test-sender", "lorem"),
+        ("ent:2", "waiting"),
+    ]
+
+    # The status message objects are reused
+    message_broker.send_status("ent:1", TEST_RECEIVER, "waiting")
+    assert message_broker.get_messages(TEST_RECEIVER)[0] is drained[0]
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from environment.navigation import PathFinder, Trace
+from environment.navigation.path_finder import (nearest_waypoints,
+                                                project_on_paths)
+from environment.navigation.sections import Section, SectionManager
+
+
+@pytest.fixture
+def sections():
+    shape = [[0, 0], [1, 0], [1, 1], [0, 0]]
+
+    return [Section(name=name, shape=shape) for name in "ABCD"]
+
+
+@pytest.fixture
+def trace(sections):
+    return Trace([[0, 0], [1, 0], [2, 0], [2, 2]], sections)
+
+
+@pytest.fixture
+def path_finder():
+    return PathFinder(SectionManager())
+
+
+def test_nearest_waypoints():
+    rng = np.random.default_rng(0)
+    paths_coords = [rng.random((n, 2)) for n in [1, 5, 20]]
+    points = rng.random((3, 2))
+
+    nearest = nearest_waypoints(points, paths_coords)
+
+    for point, coords, index in zip(points, paths_coords, nearest):
+        distances = [np.hypot(*(point - waypoint)) for waypoint in coords]
+        assert index == int(np.argmin(distances))
+
+    # The first of the closest waypoints is selected
+    assert nearest_waypoints([[1, 0]], [np.array([[0, 0], [2, 0], [2, 0]])])[0] == 0
+    assert nearest_waypoints([[2, 1]], [np.array([[0, 0], [2, 0], [2, 0]])])[0] == 1
+
+
+def test_project_on_paths():
+    paths_coords = [
+        np.array([[0.0, 0.0], [1.0, 0.0], [2.0, 0.0], [2.0, 2.0]]),
+        np.array([[5.0, 5.0]]),
+    ]
+
+    segments, ratios, projections = project_on_paths(
+        [[1.5, 0.5], [0.0, 0.0]], paths_coords
+    )
+
+    assert segments.tolist() == [1, 0]
+    assert ratios.tolist() == [0.5, 0.0]
+    assert projections.tolist() == [[1.5, 0.0], [5.0, 5.0]]
+
+
+def test_trim_trace(path_finder, trace):
+    trimmed = path_finder.trim_trace_to_current_position([1.9, 0.6], trace)
+
+    assert trimmed.coords.tolist() == [[2, 0], [2, 2]]
+    assert trimmed.trace is trace
+
+    # The position is projected on the segment (2, 0) -> (2, 2)
+    projected = path_finder.trim_trace_to_current_position(
+        [1.9, 0.6], trace, project=True
+    )
+
+    assert projected.coords.tolist() == [[2, 0.6], [2, 2]]
+    assert projected.section(0) is trace.point_sections[2]
+
+
+def test_trim_traces(path_finder, trace):
+    positions = [[0.1, 0.1], [2.1, 1.9], [1.2, 0.0]]
+    traces = [trace, trace.view().reversed(), trace]
+
+    trimmed = path_finder.trim_traces_to_current_positions(positions, traces)
+
+    assert [view.coords.tolist() for view in trimmed] == [
+        trace.coords.tolist(),
+        trace.coords[::-1].tolist(),
+        trace.coords[1:].tolist(),
+    ]
+
+    for position, trace, view in zip(positions, traces, trimmed):
+        single = path_finder.trim_trace_to_current_position(position, trace)
+        assert view.coords.tolist() == single.coords.tolist()
@@ -16,3 +16,26 @@ def test_create():
 
     assert position.lon() == 4
     assert position.lat() == 10
+
+
+def test_history():
+    position = Position(np.array([0.0, 0.0]))
+
+    for i in range(1, Position.TRACE_LENGTH + 10):
+        position.update_position(np.array([float(i), -float(i)]))
+
+    history = position.history()
+
+    # Only the last positions are kept, from the oldest one
+    assert len(history["lon"]) == Position.TRACE_LENGTH
+    assert history["lon"][0] == 10
+    assert history["lon"][-1] == Position.TRACE_LENGTH + 9
+    assert history["lat"][-1] == -(Position.TRACE_LENGTH + 9)
+
+
+def test_history_disabled():
+    position = Position(np.array([4.0, 10.0]), keep_history=False)
+    position.update_position(np.array([5.0, 11.0]))
+
+    assert len(position.history()["lon"]) == 0
+    assert position.lon() == 5
@@ -3,7 +3,9 @@ import math
 import numpy as np
 import pytest
 
-from processors.utils import convert_course_angle, course, vector_angle
+from processors.utils import (advance_positions, convert_course_angle, course,
+                              knots_to_coords_sec, smooth_speeds, vector_angle)
+from utils.constants import MIN_VESSEL_SPEED
 
 
 def test_vector_angle():
@@ -53,3 +55,44 @@ def test_convert_course_angle():
 
     assert math.degrees(convert_course_angle(line)) == 45
     assert math.degrees(convert_course_angle(negative_line)) == 135
+
+
+def test_advance_positions():
+    rng = np.random.default_rng(42)
+
+    positions = 4 + rng.random((50, 2))
+    targets = 4 + rng.random((50, 2))
+    speeds = 10 * rng.random(50)
+
+    new_positions, directions = advance_positions(positions, targets, speeds, 10)
+
+    # The batch matches moving each entity on its own
+    for i in range(len(positions)):
+        direction = targets[i] - positions[i]
+        direction = direction / np.linalg.norm(direction)
+
+        expected = positions[i] + direction * knots_to_coords_sec(speeds[i]) * 10
+
+        assert np.array_equal(directions[i], direction)
+        assert np.array_equal(new_positions[i], expected)
+
+
+def test_smooth_speeds():
+    rng = np.random.default_rng(42)
+
+    speeds = 15 * rng.random(50)
+    angles = 180 * rng.random(50)
+    min_speeds = np.full(50, 3.0)
+    max_speeds = np.full(50, 12.0)
+    max_speeds[:10] = np.inf
+
+    smoothed = smooth_speeds(speeds, angles, min_speeds, max_speeds)
+
+    # The batch matches smoothing each speed on its own
+    for i in range(len(speeds)):
+        speed = (
+            speeds[i] + (180 - angles[i]) * 0.00001 - (angles[i] * speeds[i]) / 10000
+        )
+        speed = max(MIN_VESSEL_SPEED, max(min(speed, max_speeds[i]), min_speeds[i]))
+
+        assert smoothed[i] == speed
@@ -0,0 +1,90 @@
+"""
+    Tests that the tick profiler records the steps of the
+    instrumented processors only
+"""
+
+import json
+
+import esper
+
+from environment.context import SimulationContext
+from processors.base_processor import BaseProcessor
+from processors.core import ProfilerProcessor, TickProfiler
+from processors.pilot import PilotMovementProcessor
+
+
+class CountingProcessor(BaseProcessor):
+    def __init__(self, entities=None):
+        self.steps = 0
+        self.entities = entities
+
+    def _process(self, dt):
+        self.steps += 1
+        self.processed_entities = self.entities
+
+
+def test_profiler(tmp_path):
+    context = SimulationContext()
+    context.run_info.set_simulation_start_time(0)
+    context.run_info.set_simulation_step_size(10)
+
+    summaries = []
+    profiler = TickProfiler(window=2, report_interval=30, output=summaries.append)
+
+    counted, uncounted, ignored = (
+        CountingProcessor(entities=3),
+        CountingProcessor(),
+        CountingProcessor(),
+    )
+    profiler.instrument([counted, uncounted])
+
+    world = esper.World()
+
+    for processor in [counted, uncounted, ignored]:
+        world.add_processor(processor)
+
+    world.add_processor(ProfilerProcessor(profiler, context), priority=-1)
+
+    for _ in range(4):
+        world.process(10)
+        context.run_info.update_time()
+
+    assert ignored.steps == 4
+
+    profile = profiler.as_dict()
+    stats = profile["processors"]["CountingProcessor"]
+
+    # The two instrumented processors are aggregated in every tick
+    assert profile["ticks"] == 4
+    assert stats["ticks"] == 4
+    assert stats["calls"] == 8
+    assert stats["mean_entities"] == 3
+    assert sum(stats["histogram"].values()) == 2
+
+    # A summary was printed after 30 simulated seconds
+    assert len(summaries) == 1
+    assert "CountingProcessor" in profiler.summary()
+
+    profiler.write_json(tmp_path / "profile.json")
+
+    with open(tmp_path / "profile.json") as profile_file:
+        assert json.load(profile_file)["ticks"] == 4
+
+
+def test_idle_steps_entities():
+    profiler = TickProfiler()
+    processor = PilotMovementProcessor()
+    profiler.instrument([processor])
+
+    world = esper.World()
+    world.add_processor(processor)
+
+    # An idle step does not report the entities of the last regular step
+    processor.processed_entities = 5
+    processor.process(10, idle_steps=3)
+    profiler.end_tick(10)
+
+    stats = profiler.as_dict()["processors"]["PilotMovementProcessor"]
+
+    assert processor.processed_entities == 0
+    assert stats["mean_entities"] == 0
@@ -0,0 +1,151 @@
+import esper
+import numpy as np
+import pytest
+
+from components import (BerthInfo, LocationInfo, LocationType, Position,
+                        Shape)
+from components.fsm import (BerthStateMachine, TugStateMachine,
+                            VesselStateMachine)
+from components.fsm.states import BerthState, TugState
+from environment.initializers import AnchoragesInitializer
+from environment.queries import (AnchorageList, BerthList, ResourceIndex,
+                                 WaitingLocationList)
+
+from .constants import MOCK_ANCHORAGES_FILENAME
+
+SQUARE = [[0, 0], [0, 1], [1, 1], [1, 0]]
+
+
+@pytest.fixture
+def resources_world():
+    world = esper.World()
+
+    for berth_id, content_type in enumerate(
+        ["container", "bulk", "container"]
+    ):
+        berth = world.create_entity()
+
+        world.add_component(berth, Position(lonlat=np.array([4.0, 51.0])))
+        world.add_component(
+            berth,
+            BerthInfo(
+                berth_id,
+                f"berth-{berth_id}",
+                None,
+                15.0,
+                content_type,
+                section=None,
+                allowed_vessel_classes=[berth_id],
+            ),
+        )
+        world.add_component(berth, BerthStateMachine(lambda _: 100))
+
+    for location_id, location_type in enumerate(
+        [LocationType.TUGBOATS_STORAGE, LocationType.PILOTS_STORAGE]
+    ):
+        location = world.create_entity()
+
+        world.add_component(location, Shape(SQUARE))
+        world.add_component(
+            location, LocationInfo(location_id, f"location-{location_id}", location_type)
+        )
+
+    AnchoragesInitializer(world, MOCK_ANCHORAGES_FILENAME).create_anchorages()
+
+    return world
+
+
+def test_berths_queries(resources_world):
+    berths = BerthList(world=resources_world)
+
+    assert [b[1][1].id for b in berths.filter_by_ids([2, 0, 5])] == [0, 2]
+    assert [b[1][1].id for b in berths.filter_by_vessel_types(["container"])] == [0, 2]
+    assert [b[1][1].id for b in berths.filter_by_vessel_class(1)] == [1]
+
+
+def test_allowed_vessel_classes_required():
+    with pytest.raises(ValueError):
+        BerthInfo(0, "berth-0", None, 15.0, "bulk", None, None)
+
+    with pytest.raises(TypeError):
+        BerthInfo(0, "berth-0", None, 15.0, "bulk", section=None)
+
+
+def test_berths_state_index(resources_world):
+    _, (_, _, berth_fsm) = BerthList(world=resources_world).filter_by_ids([1])[0]
+
+    # The state transitions are reflected by the index
+    berth_fsm.book(VesselStateMachine())
+
+    available = BerthList(world=resources_world).filter_by_available(
+        BerthState.AVAILABLE
+    )
+    booked = BerthList(world=resources_world).filter_by_available(
+        BerthState.WAITING_FOR_VESSEL
+    )
+
+    assert [b[1][1].id for b in available] == [0, 2]
+    assert [b[1][1].id for b in booked] == [1]
+
+    # Lists of berths are still filtered by scanning them
+    assert [b[1][1].id for b in available.filter_by_ids([2])] == [2]
+
+
+def test_waiting_locations_queries(resources_world):
+    locations = WaitingLocationList(world=resources_world)
+
+    _, (location_info, _) = locations.filter_by_ids([1])[0]
+    assert location_info.type == LocationType.PILOTS_STORAGE
+
+    tug_locations = locations.filter_by_location_type(LocationType.TUGBOATS_STORAGE)
+    assert [l[1][0].id for l in tug_locations] == [0]
+
+
+def test_anchorages_queries(resources_world):
+    _, (anchorage_info, _, _) = list(AnchorageList(world=resources_world))[0]
+
+    anchorage = AnchorageList(world=resources_world).get_by_name(anchorage_info.name)
+    assert anchorage[1][0] is anchorage_info
+
+
+def test_invalidation(resources_world):
+    index = ResourceIndex.for_world(resources_world)
+    assert ResourceIndex.for_world(resources_world) is index
+
+    ResourceIndex.invalidate(resources_world)
+    assert ResourceIndex.for_world(resources_world) is not index
+
+
+def test_state_listeners(resources_world):
+    _, (_, _, berth_fsm) = BerthList(world=resources_world).filter_by_ids([0])[0]
+
+    # The index and the on_state_change callback both get the transitions
+    events = []
+    berth_fsm.on_state_change(lambda event: events.append(event.dst))
+    berth_fsm.book(VesselStateMachine())
+
+    booked = BerthList(world=resources_world).filter_by_available(
+        BerthState.WAITING_FOR_VESSEL
+    )
+
+    assert events == [BerthState.WAITING_FOR_VESSEL]
+    assert [b[1][1].id for b in booked] == [0]
+
+    # The berths of a class are still filtered by state
+    berths = BerthList(world=resources_world).filter_by_vessel_class(0)
+    assert list(berths.filter_by_available(BerthState.AVAILABLE)) == []
+
+    # A dropped index stops listening to the state machines
+    ResourceIndex.invalidate(resources_world)
+    assert berth_fsm.state_listeners == []
+
+
+def test_tug_state_listeners():
+    events = []
+
+    # Every state machine keeps its on_state_change callback with listeners
+    fsm = TugStateMachine(0, on_state_change=lambda event: events.append(event.src))
+    fsm.state_listeners.append(lambda event: events.append(event.dst))
+    fsm.go_to_rendezvous(1, 2)
+
+    assert events == [TugState.IDLE, TugState.GOING_TO_RENDEZVOUS]
@@ -0,0 +1,67 @@
+import pytest
+
+from environment.navigation import RouteTable, Trace
+from environment.navigation.route_table import parse_route_id
+from environment.navigation.sections import Section
+
+
+def make_trace(*coords):
+    section = Section(name="A", shape=[[0, 0], [1, 0], [1, 1], [0, 0]])
+
+    return Trace(coords, [section] * len(coords))
+
+
+@pytest.fixture
+def route_table():
+    traces = {
+        "ocean:1-berth:1": [make_trace([0, 0], [1, 1]), make_trace([0, 0], [2, 2])],
+        "ocean:1-berth:2": [make_trace([0, 0], [3, 3])],
+        "berth:2-ocean:1": [make_trace([3, 3], [5, 5])],
+        "ocean-tug_waiting_location:1": [make_trace([0, 0], [4, 4])],
+    }
+    rendezvous_traces = {"tug_rendezvous:1-berth:1": [make_trace([6, 6], [1, 1])]}
+
+    return RouteTable([traces, rendezvous_traces])
+
+
+def test_parse_route_id():
+    assert parse_route_id("ocean:1-berth:3") == (("ocean", "1"), ("berth", "3"))
+    assert parse_route_id("ocean-tug_waiting_location:2") == (
+        ("ocean", None),
+        ("tug_waiting_location", "2"),
+    )
+
+
+def test_paths(route_table):
+    paths = route_table.paths(("ocean", 1), ("berth", 1))
+
+    assert len(paths) == 2
+    assert paths[0].coords.tolist() == [[0, 0], [1, 1]]
+
+    # Integer and string ids are the same location
+    assert route_table.paths(("ocean", "1"), ("berth", "1")) == paths
+    assert route_table.paths(("ocean",), ("tug_waiting_location", 1))
+    assert route_table.paths(("ocean", 2), ("berth", 1)) == ()
+
+
+def test_reverse_paths(route_table):
+    # Routes without traces in their direction follow the opposite traces
+    paths = route_table.paths(("berth", 1), ("ocean", 1))
+
+    assert len(paths) == 2
+    assert paths[1].coords.tolist() == [[2, 2], [0, 0]]
+
+    reverse_paths = route_table.paths(("berth", 1), ("tug_rendezvous", 1))
+    assert reverse_paths[0].coords.tolist() == [[1, 1], [6, 6]]
+
+    # The traces of a direction are preferred to the reversed ones
+    paths = route_table.paths(("berth", 2), ("ocean", 1))
+    assert paths[0].coords.tolist() == [[3, 3], [5, 5]]
+
+
+def test_routes_for(route_table):
+    destinations = [("berth", 2), ("berth", 3), ("berth", 1)]
+    routes = route_table.routes_for(("ocean", 1), destinations)
+
+    assert list(routes) == [("berth", 2), ("berth", 1)]
+    assert routes[("berth", 1)] == route_table.paths(("ocean", 1), ("berth", 1))
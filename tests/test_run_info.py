@@ -0,0 +1,37 @@
+from environment import RunInfo
+
+
+def test_steps_until():
+    run_info = RunInfo.get_instance()
+    run_info.set_simulation_start_time(1000)
+    run_info.set_simulation_step_size(10)
+
+    assert run_info.steps_until(0) == 0
+    assert run_info.steps_until(95) == 9
+
+    # The simulation time is still lower during the returned steps
+    for _ in range(9):
+        assert run_info.simulation_time() < 95
+        run_info.update_time()
+
+    assert run_info.steps_until(95) == 0
+
+
+def test_several_steps():
+    run_info = RunInfo()
+    run_info.set_simulation_start_time(1000)
+    run_info.set_simulation_step_size(0.1)
+
+    stepped_run_info = RunInfo()
+    stepped_run_info.set_simulation_start_time(1000)
+    stepped_run_info.set_simulation_step_size(0.1)
+
+    times = run_info.simulation_times(7)
+    run_info.update_time(7)
+
+    # The time is accumulated as by single steps
+    for simulation_time in times:
+        assert stepped_run_info.simulation_time() == simulation_time
+        stepped_run_info.update_time()
+
+    assert run_info.timestamp() == stepped_run_info.timestamp()
@@ -1,6 +1,8 @@
+import numpy as np
 import pytest
+from shapely.geometry import Point
 
-from environment.navigation.sections import SectionManager
+from environment.navigation.sections import OCEAN_SECTION_INDEX, SectionManager
 from example.example_model.vessel_class import VesselClass
 from exceptions import NoSectionException
 
@@ -47,3 +49,56 @@ def test_get_section(section_manager):
 
     assert ocean is not None
     assert ocean.name == "ocean"
+
+
+def brute_force_section(section_manager, point):
+    """Returns the first section containing the point, by a linear scan"""
+    for section in section_manager.sections:
+        if section.shape.contains(Point(point)):
+            return section
+
+    return section_manager.ocean_section
+
+
+def test_sections_for_points(section_manager):
+    shared_start, shared_middle, shared_end = (
+        np.array([3.6330413818359375, 51.40713021087577]),
+        np.array([3.6385345458984375, 51.42747075866634]),
+        np.array([3.4891891479492188, 51.44352269273299]),
+    )
+
+    points = [
+        # The ocean, inside the first section and inside the second one
+        [3.4941673278808594, 51.45529052633677],
+        [3.544635772705078, 51.430895644580175],
+        [3.7, 51.44],
+        # The vertices and the middle of the edges shared by the sections
+        shared_start,
+        shared_middle,
+        shared_end,
+        (shared_start + shared_middle) / 2,
+        (shared_middle + shared_end) / 2,
+    ]
+
+    # A grid over the sections and the ocean around them
+    points += [
+        [lon, lat]
+        for lon in np.linspace(3.47, 3.75, 15)
+        for lat in np.linspace(51.40, 51.46, 15)
+    ]
+
+    expected = [brute_force_section(section_manager, p).name for p in points]
+
+    # Both sections and the ocean are in the expected results
+    assert {"section_1", "section_2", "ocean"} <= set(expected)
+
+    # The batched and single point lookups match the linear scan
+    sections = section_manager.sections_for_points(points)
+    assert [s.name for s in sections] == expected
+    assert [section_manager.section_for_point(p).name for p in points] == expected
+
+    indices = section_manager.section_indices_for_points(np.array(points[:3]))
+    assert indices.tolist() == [OCEAN_SECTION_INDEX, 0, 1]
+
+    # An empty batch yields no sections
+    assert len(section_manager.section_indices_for_points(np.empty((0, 2)))) == 0
@@ -0,0 +1,75 @@
+"""
+    Tests that the simulation contexts keep the state of
+    their simulations apart
+"""
+
+import esper
+
+from components.fsm import BerthStateMachine
+from environment import RunInfo
+from environment.context import SimulationContext
+from environment.messaging import SimulationMessage
+from processors.core import TimerProcessor
+from utils.timer import SimulationTimer, TimerScheduler
+
+from .constants import TEST_RECEIVER
+
+
+def test_default_context():
+    context = SimulationContext.default()
+
+    assert context is SimulationContext.default()
+    assert context.run_info is RunInfo.get_instance()
+    assert context.timer_scheduler is TimerScheduler.get_instance()
+
+
+def test_replicate():
+    context = SimulationContext()
+    replica = context.replicate()
+
+    # The sections and the traces are shared
+    assert replica.section_manager is context.section_manager
+    assert replica.path_finder is context.path_finder
+    assert replica.path_finder.sections_manager is context.section_manager
+
+    # The state of the run is not
+    assert replica.run_info is not context.run_info
+    assert replica.message_broker is not context.message_broker
+    assert replica.timer_scheduler is not context.timer_scheduler
+    assert replica.vessel_event_logger.run_info is replica.run_info
+
+
+def test_independent_contexts():
+    first, second = SimulationContext(), SimulationContext()
+
+    first.message_broker.send_message(
+        SimulationMessage(sender="sender", destination=TEST_RECEIVER, message="lorem")
+    )
+
+    assert first.message_broker.has_messages(TEST_RECEIVER)
+    assert not second.message_broker.has_messages(TEST_RECEIVER)
+
+    # Every world advances only the timers of its own context
+    fired = []
+
+    first_world = esper.World()
+    first_world.add_processor(TimerProcessor(context=first))
+
+    first.timer_scheduler.schedule(
+        SimulationTimer(duration=10, target_function=lambda: fired.append("first"))
+    )
+    second.timer_scheduler.schedule(
+        SimulationTimer(duration=10, target_function=lambda: fired.append("second"))
+    )
+
+    first_world.process(20)
+
+    assert fired == ["first"]
+    assert len(second.timer_scheduler) == 1
+
+    # The components created for a context schedule their timers on it
+    berth_fsm = BerthStateMachine(lambda _: 100, timer_scheduler=second.timer_scheduler)
+    berth_fsm._schedule_processing(100, None)
+
+    assert len(second.timer_scheduler) == 2
+    assert len(first.timer_scheduler) == 0
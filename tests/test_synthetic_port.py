@@ -0,0 +1,87 @@
+"""
+    Tests that the synthetic ports are consistent: every location the
+    simulation routes vessels, tugs and pilots to is reachable
+"""
+
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from simulation import make_config, run_simulation
+from simulation.simulation import (berths_filename, load_context,
+                                   ocean_berth_traces_folder)
+from simulation.synthetic_port import SyntheticPort
+
+
+@pytest.fixture
+def port_dir(tmp_path):
+    port = SyntheticPort(berths=30, berths_per_section=8, traces_per_file=25)
+    summary = port.generate(str(tmp_path))
+
+    assert summary["sections"] == 4
+    assert summary["traces"]["ocean_berth"] == 60
+
+    return str(tmp_path)
+
+
+def test_generate(port_dir, tmp_path_factory):
+    berths = pd.read_csv(os.path.join(port_dir, berths_filename))
+
+    assert berths["id"].tolist() == list(range(30))
+    assert berths["section"].tolist() == [i // 8 + 1 for i in range(30)]
+
+    # The traces are split in files of at most traces_per_file traces
+    folder = os.path.join(port_dir, ocean_berth_traces_folder)
+    files = sorted(os.listdir(folder))
+
+    assert files == [
+        "ocean_berth_000.geojson",
+        "ocean_berth_001.geojson",
+        "ocean_berth_002.geojson",
+    ]
+
+    # The same seed generates the same port
+    other_dir = str(tmp_path_factory.mktemp("port"))
+    SyntheticPort(berths=30, berths_per_section=8, traces_per_file=25).generate(
+        other_dir
+    )
+
+    for filename in files:
+        with open(os.path.join(folder, filename)) as expected, open(
+            os.path.join(other_dir, ocean_berth_traces_folder, filename)
+        ) as actual:
+            assert json.load(expected) == json.load(actual)
+
+
+def test_routes(port_dir):
+    path_finder = load_context(data_dir=port_dir).path_finder
+
+    assert sorted(path_finder.ocean_connected_berth_ids()) == list(range(30))
+
+    berths = pd.read_csv(os.path.join(port_dir, berths_filename))
+
+    for berth_id, section in zip(berths["id"], berths["section"]):
+        paths, rendezvous_id = path_finder.tug_rendezvous_berth_paths(
+            final_section=section, berth_id=berth_id
+        )
+
+        assert rendezvous_id == str(section)
+        assert path_finder.pilot_waiting_location_berth_path(None, berth_id, 1)
+
+        # The traces end at the berths, inside their sections
+        assert paths[0].section(len(paths[0].coords) - 1).name == f"section_{section}"
+
+    for waiting_location_id in (1, 2):
+        assert path_finder.tugs_waiting_location_rendezvous_path(
+            None, waiting_location_id, "4"
+        )
+
+
+def test_simulation(port_dir):
+    results = run_simulation(
+        make_config(data_dir=port_dir, max_time=50000, seed=0, arrival_rate=4.0)
+    )
+
+    assert results["vessels_departed"] > 0
@@ -0,0 +1,115 @@
+import math
+
+import pytest
+
+from utils.timer import SimulationTimer, TimerScheduler
+from utils.timer.timer_status import TimerStatus
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = TimerScheduler.get_instance()
+    scheduler.clear()
+
+    yield scheduler
+
+    scheduler.clear()
+
+
+class FiredTimers(list):
+    """Records the names of the fired timers"""
+
+    def append(self, name):
+        super().append(name)
+
+
+def test_firing_order(scheduler):
+    fired = FiredTimers()
+
+    for name, duration in [("a", 30), ("b", 10), ("c", 20), ("d", 10)]:
+        scheduler.schedule(
+            SimulationTimer(duration=duration, target_function=fired.append, name=name)
+        )
+
+    # A timer fires only once its duration is surpassed
+    scheduler.advance(10)
+    assert fired == []
+
+    # Timers due at the same time fire in scheduling order
+    scheduler.advance(15)
+    assert fired == ["b", "d", "c"]
+
+    scheduler.advance(100)
+    assert fired == ["b", "d", "c", "a"]
+    assert len(scheduler) == 0
+
+
+def test_schedule_from_current_time(scheduler):
+    timer = SimulationTimer(duration=10, target_function=lambda: None)
+
+    scheduler.advance(100)
+    scheduler.schedule(timer)
+    scheduler.advance(10)
+
+    assert timer.status == TimerStatus.IN_PROGRESS
+
+    scheduler.advance(1)
+
+    assert timer.status == TimerStatus.FIRED
+    assert timer.elapsed_seconds == 11
+
+
+def test_invalidation(scheduler):
+    fired = FiredTimers()
+
+    timer = SimulationTimer(duration=10, target_function=fired.append, name="a")
+    scheduler.schedule(timer)
+    timer.invalidate()
+
+    scheduler.advance(20)
+
+    assert fired == []
+    assert timer.status == TimerStatus.INVALIDATED
+    assert len(scheduler) == 0
+
+
+def test_idle_steps(scheduler):
+    assert scheduler.idle_steps(10) == math.inf
+
+    invalidated = SimulationTimer(duration=5, target_function=lambda: None)
+    timer = SimulationTimer(duration=100, target_function=lambda: None)
+
+    scheduler.schedule(invalidated)
+    scheduler.schedule(timer)
+    invalidated.invalidate()
+
+    steps = scheduler.idle_steps(10)
+    assert steps == 9
+
+    # No timer fires during the idle steps
+    for _ in range(steps):
+        scheduler.advance(10)
+
+    assert timer.status == TimerStatus.IN_PROGRESS
+    assert scheduler.idle_steps(10) == 0
+
+
+def test_advance_steps(scheduler):
+    fired = FiredTimers()
+
+    scheduler.schedule(
+        SimulationTimer(duration=35, target_function=fired.append, name="a")
+    )
+
+    # The idle steps are advanced at once
+    steps = scheduler.idle_steps(10)
+    scheduler.advance(10, steps)
+
+    assert scheduler.time == steps * 10
+    assert fired == []
+    assert scheduler.fired_count == 0
+
+    scheduler.advance(10, 2)
+
+    assert fired == ["a"]
+    assert scheduler.fired_count == 1
@@ -0,0 +1,235 @@
+import copy
+
+import numpy as np
+import pytest
+from haversine import Unit, haversine
+
+from environment.navigation import CompositePath, Trace, TraceView
+from environment.navigation.trace import turn_angle
+from environment.navigation.sections import Section
+
+
+@pytest.fixture()
+def trace():
+    section_shape = [[10, 10], [15, 10], [15, 5], [10, 5], [10, 10]]
+
+    section_a = Section(name="A", shape=section_shape)
+    section_b = Section(name="B", shape=section_shape)
+
+    # Trace with sections AAABB
+    return Trace(
+        [[5, 5], [10, 10], [15, 15], [20, 20], [25, 25]],
+        [section_a] * 3 + [section_b] * 2,
+    )
+
+
+@pytest.fixture()
+def ocean_section():
+    return Section(name="Ocean", shape=[[0, 0], [1, 0], [1, 1], [0, 0]])
+
+
+def test_trace_is_immutable(trace):
+    with pytest.raises(ValueError):
+        trace.coords[0, 0] = 0
+
+    # Copies share the same waypoints
+    assert copy.deepcopy(trace) is trace
+
+    view = trace.view()
+    assert copy.deepcopy(view) is view
+    assert view.crossed_sections == frozenset(trace.point_sections)
+
+
+def test_view(trace):
+    view = trace.view()
+
+    assert len(view) == len(trace)
+    assert view.coords.tolist() == trace.coords.tolist()
+    assert view["x"] == [5, 10, 15, 20, 25]
+    assert [s.name for s in view["point_sections"]] == ["A", "A", "A", "B", "B"]
+
+    with pytest.raises(IndexError):
+        view.point(len(view))
+
+
+def test_reversed_view(trace):
+    view = trace.view().reversed()
+
+    assert view.coords.tolist() == trace.coords[::-1].tolist()
+    assert [view.section(i).name for i in range(len(view))] == list("BBAAA")
+
+    # Reversing twice gives back the original path
+    assert view.reversed().coords.tolist() == trace.coords.tolist()
+
+    # The base trace is shared
+    assert view.trace is trace
+
+
+def test_prefixed_view(trace, ocean_section):
+    view = trace.view().with_prefix([0, 1], ocean_section)
+
+    assert len(view) == len(trace) + 1
+    assert view.point(0).tolist() == [0, 1]
+    assert view.section(0) is ocean_section
+    assert view.coords[1:].tolist() == trace.coords.tolist()
+
+    # Dropping the prefix point gives back the original path
+    assert view.tail(1).coords.tolist() == trace.coords.tolist()
+
+    # A prefixed path can still be reversed
+    reversed_view = view.reversed()
+    assert reversed_view.coords.tolist() == view.coords[::-1].tolist()
+    assert reversed_view.section(len(reversed_view) - 1) is ocean_section
+
+
+def test_tail(trace):
+    view = trace.view().reversed().tail(2)
+
+    assert view.coords.tolist() == trace.coords[::-1][2:].tolist()
+    assert view.reversed().coords.tolist() == trace.coords[:3].tolist()
+    assert view.trace is trace
+
+
+def test_concat(trace, ocean_section):
+    a = trace.view().with_prefix([0, 1], ocean_section)
+    b = trace.view().reversed()
+
+    merged = Trace.concat(a, b)
+
+    assert len(merged) == len(a) + len(b)
+    assert merged.coords.tolist() == np.concatenate((a.coords, b.coords)).tolist()
+    assert isinstance(merged.view(), TraceView)
+
+
+def test_composite_path(trace, ocean_section):
+    a = trace.view().with_prefix([0, 1], ocean_section)
+    b = trace.view().reversed()
+
+    path = CompositePath([a, b])
+    expected = Trace.concat(a, b).view()
+
+    assert len(path) == len(expected)
+    assert path.coords.tolist() == expected.coords.tolist()
+    assert path.point_sections == expected.point_sections
+    assert path.crossed_sections == expected.crossed_sections
+
+    for i in range(len(path)):
+        assert path.point(i).tolist() == expected.point(i).tolist()
+        assert path.section(i) is expected.section(i)
+
+    with pytest.raises(IndexError):
+        path.point(len(path))
+
+    assert path["x"] == expected["x"]
+    assert path["point_sections"] == expected["point_sections"]
+
+    with pytest.raises(KeyError):
+        path["z"]
+
+    # The segments reference the original traces
+    assert all(segment.trace is trace for segment in path.segments)
+
+    # Views of a composite path are composite paths too
+    assert path.tail(3).coords.tolist() == expected.coords[3:].tolist()
+    assert path.tail(len(a) + 1).coords.tolist() == b.coords[1:].tolist()
+    assert path.reversed().coords.tolist() == expected.coords[::-1].tolist()
+    assert path.reversed().section(len(path) - 1) is ocean_section
+
+    prefixed = path.with_prefix([2, 3], ocean_section)
+    assert prefixed.coords.tolist() == [[2, 3]] + expected.coords.tolist()
+    assert len(prefixed.segments) == 3
+
+    # Reversing or prefixing a prefixed view does not copy the trace
+    assert isinstance(a.reversed(), CompositePath)
+    assert a.reversed().segments[0].trace is trace
+    assert a.with_prefix([2, 3], ocean_section).coords[1:].tolist() == (
+        a.coords.tolist()
+    )
+
+
+def path_angles_and_distances(coords):
+    angles = [0] + [
+        turn_angle(coords[i - 1], coords[i], coords[i + 1])
+        for i in range(1, len(coords) - 1)
+    ]
+    distances = [0.0]
+
+    for a, b in zip(coords, coords[1:]):
+        distances.append(distances[-1] + haversine(a[::-1], b[::-1], unit=Unit.METERS))
+
+    return angles, distances
+
+
+def test_turn_angles(trace, ocean_section):
+    bent = Trace(
+        [[3.5, 51.4], [3.51, 51.4], [3.51, 51.41], [3.5, 51.41], [3.49, 51.42]],
+        trace.point_sections,
+    )
+
+    assert bent.turn_angles[0] == bent.turn_angles[-1] == 0
+    assert bent.turn_angles[1] == pytest.approx(90, abs=0.5)
+    assert bent.segment_lengths[0] == 0
+
+    # The angle is 0 at the repeated waypoints
+    repeated = Trace(
+        [[3.5, 51.4], [3.51, 51.4], [3.51, 51.4], [3.5, 51.41], [3.49, 51.42]],
+        trace.point_sections,
+    )
+
+    assert repeated.turn_angles.tolist() == [
+        0,
+        0,
+        0,
+        turn_angle([3.51, 51.4], [3.5, 51.41], [3.49, 51.42]),
+        0,
+    ]
+    assert bent.distances[-1] == pytest.approx(sum(bent.segment_lengths))
+
+    view = bent.view()
+    paths = [
+        view,
+        view.reversed(),
+        view.tail(1),
+        view.with_prefix([3.48, 51.39], ocean_section),
+        view.reversed().with_prefix([3.48, 51.43], ocean_section),
+        CompositePath([view, view.reversed().tail(2)]),
+    ]
+
+    for path in paths:
+        coords = path.coords.tolist()
+        angles, distances = path_angles_and_distances(coords)
+
+        assert [path.turn_angle(i) for i in range(1, len(path) - 1)] == angles[1:]
+        assert [path.distance(i) for i in range(len(path))] == pytest.approx(distances)
+
+        # Only the inner waypoints have a turn angle
+        for i in [0, len(path) - 1]:
+            with pytest.raises(IndexError):
+                path.turn_angle(i)
+
+
+def test_speed_limits(trace, ocean_section):
+    section_a, section_b = trace.point_sections[0], trace.point_sections[-1]
+    section_b.vessel_speeds = {"class 1": {"min": 1.0, "max": 5.0}}
+
+    limits = trace.speed_limits("class 1")
+
+    assert limits.tolist() == [[0.0, 15.0]] * 3 + [[1.0, 5.0]] * 2
+    assert trace.speed_limits("class 1") is limits
+    assert trace.speed_limits("class 2").tolist() == [[0.0, 15.0]] * 5
+
+    view = trace.view().reversed().with_prefix([0, 0], ocean_section)
+    paths = [view, CompositePath([view, trace.view()])]
+
+    for path in paths:
+        for i in range(len(path)):
+            speeds = path.section(i).speeds_for_class("class 1")
+
+            assert path.speed_limits("class 1", i).tolist() == [
+                speeds["min"],
+                speeds["max"],
+            ]
+
+        for i in [-1, len(path)]:
+            with pytest.raises(IndexError):
+                path.speed_limits("class 1", i)
@@ -0,0 +1,134 @@
+"""
+    Tests that the path finder loads the same traces from the traces
+    cache and that stale or corrupt caches are rebuilt
+"""
+
+import json
+import os
+
+import geojson
+import numpy as np
+import pytest
+
+from environment.navigation import PathFinder, TraceCache
+from environment.navigation.sections import SectionManager
+from example.example_model.vessel_class import VesselClass
+
+from .constants import MOCK_SECTIONS_FILENAME
+
+OCEAN_POINT = [3.4941673278808594, 51.45529052633677]
+SECTION_1_POINT = [3.544635772705078, 51.430895644580175]
+
+
+def trace_feature(origin, destination, coordinates):
+    return geojson.Feature(
+        geometry=geojson.LineString(coordinates),
+        properties={"origin": origin, "destination": destination},
+    )
+
+
+@pytest.fixture
+def traces_folder(tmp_path):
+    folder = tmp_path / "traces"
+    folder.mkdir()
+
+    features = [
+        trace_feature("ocean:1", "berth:1", [OCEAN_POINT, SECTION_1_POINT]),
+        trace_feature("ocean:1", "berth:1", [OCEAN_POINT, OCEAN_POINT]),
+        trace_feature("ocean:1", "berth:2", [SECTION_1_POINT, OCEAN_POINT]),
+    ]
+
+    with open(folder / "traces.geojson", "w") as traces_file:
+        geojson.dump(geojson.FeatureCollection(features), traces_file)
+
+    return str(folder)
+
+
+@pytest.fixture
+def section_manager():
+    manager = SectionManager()
+    manager.create_sections(MOCK_SECTIONS_FILENAME, VesselClass)
+
+    return manager
+
+
+def load_path_finder(section_manager, traces_folder, cache):
+    path_finder = PathFinder(section_manager)
+    path_finder.load_traces(traces_folder, ocean_spawn_ids=[1], cache=cache)
+
+    return path_finder
+
+
+def make_cache(tmp_path, traces_folder):
+    return TraceCache(str(tmp_path / "cache"), [MOCK_SECTIONS_FILENAME, traces_folder])
+
+
+def assert_same_traces(expected, actual):
+    assert sorted(expected.berths) == sorted(actual.berths)
+    assert expected.berth_traces.keys() == actual.berth_traces.keys()
+
+    for route_id, traces in expected.berth_traces.items():
+        for trace, cached_trace in zip(traces, actual.berth_traces[route_id]):
+            assert np.array_equal(trace.coords, cached_trace.coords)
+            assert trace.point_sections == cached_trace.point_sections
+            assert trace.crossed_sections == cached_trace.crossed_sections
+
+
+def test_cached_traces(tmp_path, traces_folder, section_manager):
+    expected = load_path_finder(section_manager, traces_folder, None)
+
+    cache = make_cache(tmp_path, traces_folder)
+    assert cache.load(["section_1", "section_2"]) is None
+
+    # The first load builds the cache, the second one reads it
+    built = load_path_finder(section_manager, traces_folder, cache)
+    cached = load_path_finder(section_manager, traces_folder, cache)
+
+    assert os.path.isdir(cache.path)
+    assert_same_traces(expected, built)
+    assert_same_traces(expected, cached)
+
+    # The cached waypoints are memory mapped, not copied
+    coords = cached.berth_traces["ocean:1-berth:1"][0].coords
+    assert not coords.flags.owndata and not coords.flags.writeable
+
+
+def test_stale_cache(tmp_path, traces_folder, section_manager):
+    cache = make_cache(tmp_path, traces_folder)
+    load_path_finder(section_manager, traces_folder, cache)
+
+    # Changing an input file changes the key of the cache
+    with open(os.path.join(traces_folder, "traces.geojson"), "a") as traces_file:
+        traces_file.write("\n")
+
+    new_cache = make_cache(tmp_path, traces_folder)
+    assert new_cache.key != cache.key
+    assert new_cache.load(["section_1", "section_2"]) is None
+
+    load_path_finder(section_manager, traces_folder, new_cache)
+
+    # The stale cache is removed once the new one is written
+    assert os.listdir(tmp_path / "cache") == [os.path.basename(new_cache.path)]
+
+
+def test_corrupt_cache(tmp_path, traces_folder, section_manager):
+    expected = load_path_finder(section_manager, traces_folder, None)
+
+    cache = make_cache(tmp_path, traces_folder)
+    load_path_finder(section_manager, traces_folder, cache)
+
+    with open(os.path.join(cache.path, "index.json"), "r") as index_file:
+        index = json.load(index_file)
+
+    # Trace ranges past the end of the arrays
+    index["groups"]["berth_traces"]["routes"]["ocean:1-berth:1"] = [[0, 100]]
+
+    with open(os.path.join(cache.path, "index.json"), "w") as index_file:
+        json.dump(index, index_file)
+
+    assert cache.load(["section_1", "section_2"]) is None
+
+    rebuilt = load_path_finder(section_manager, traces_folder, cache)
+
+    assert_same_traces(expected, rebuilt)
+    assert cache.load(["section_1", "section_2"]) is not None
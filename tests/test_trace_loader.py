@@ -0,0 +1,96 @@
+"""
+    Tests that the trace loader streams the GeoJSON features and reads
+    the same traces in parallel and in this process
+"""
+
+import geojson
+import numpy as np
+import pytest
+
+from environment.navigation import TraceLoader
+from environment.navigation import trace_loader
+from environment.navigation.trace_loader import iter_features
+
+
+def trace_feature(origin, destination, length):
+    coordinates = [[3.5 + i * 0.001, 51.4 - i * 0.001, 0.0] for i in range(length)]
+
+    return geojson.Feature(
+        geometry=geojson.LineString(coordinates),
+        properties={"origin": origin, "destination": destination},
+    )
+
+
+@pytest.fixture
+def traces_folders(tmp_path):
+    folders = {}
+
+    for name in ["ocean_berth", "tugs_rv_berth"]:
+        folder = tmp_path / name
+        folder.mkdir()
+
+        for file_id in range(3):
+            features = [
+                trace_feature(f"ocean:{file_id}", f"berth:{i}", 10 + i)
+                for i in range(4)
+            ]
+
+            with open(folder / f"traces_{file_id}.geojson", "w") as traces_file:
+                geojson.dump(geojson.FeatureCollection(features), traces_file)
+
+        folders[name] = str(folder)
+
+    return folders
+
+
+def test_iter_features(traces_folders):
+    path = f"{traces_folders['ocean_berth']}/traces_0.geojson"
+
+    with open(path, "r") as traces_file:
+        expected = geojson.loads(traces_file.read())["features"]
+
+    # Chunks much smaller than a feature
+    assert list(iter_features(path, chunk_size=16)) == expected
+    assert list(iter_features(path)) == expected
+
+
+def test_iter_invalid_features(tmp_path):
+    path = tmp_path / "invalid.geojson"
+
+    path.write_text('{"type": "FeatureCollection", "features": [{"type": ')
+
+    with pytest.raises(Exception):
+        list(iter_features(str(path)))
+
+    path.write_text('{"type": "Feature"}')
+
+    with pytest.raises(Exception):
+        list(iter_features(str(path)))
+
+
+def test_parallel_load(traces_folders, monkeypatch):
+    progress = []
+
+    serial_loader = TraceLoader(workers=1)
+    serial = serial_loader.load(traces_folders)
+
+    monkeypatch.setattr(trace_loader, "PARALLEL_MIN_SIZE", 0)
+    parallel_loader = TraceLoader(
+        workers=2, progress=lambda folder, *args: progress.append((folder, *args))
+    )
+    parallel = parallel_loader.load(traces_folders)
+
+    assert serial.keys() == parallel.keys() == traces_folders.keys()
+
+    for name, traces in serial.items():
+        assert len(traces) == 12
+
+        for (origin, destination, waypoints), parallel_trace in zip(
+            traces, parallel[name]
+        ):
+            assert (origin, destination) == parallel_trace[:2]
+            assert waypoints.shape[1] == 2
+            assert np.array_equal(waypoints, parallel_trace[2])
+
+    assert set(parallel_loader.timings) == set(traces_folders.values())
+    assert [entry[1:3] for entry in progress] == [(1, 3), (2, 3), (3, 3)] * 2
@@ -0,0 +1,89 @@
+"""
+    Tests that the vessel index is kept up to date by the vessel
+    state machines, and that the goal formulator skips the passive states
+"""
+
+import esper
+import numpy as np
+
+from components import (Course, FrameCounter, Position, Velocity, VesselInfo,
+                        VesselPath)
+from components.fsm import VesselStateMachine
+from components.fsm.states import VesselState
+from environment.queries import VesselIndex
+from example.example_model.vessel_class import VesselClass
+from processors.vessel import VesselGoalFormulatorProcessor
+
+
+def add_vessel(world):
+    vessel = world.create_entity()
+
+    fsm = VesselStateMachine()
+    fsm.generate()
+
+    world.add_component(vessel, Position(lonlat=np.array([4.0, 51.0])))
+    world.add_component(vessel, FrameCounter())
+    world.add_component(vessel, Course())
+    world.add_component(vessel, Velocity(velocity=10))
+    world.add_component(vessel, VesselPath())
+    world.add_component(vessel, fsm)
+    world.add_component(vessel, VesselInfo())
+
+    return vessel, fsm
+
+
+def test_vessel_index():
+    world = esper.World()
+    first, first_fsm = add_vessel(world)
+
+    # The index is built from the world, the next vessels are added
+    index = VesselIndex.for_world(world)
+    second, second_fsm = add_vessel(world)
+    index.add(second)
+    index.add(second)
+
+    assert VesselIndex.for_world(world) is index
+    assert len(index) == 2
+
+    second_fsm.fsm.go_to_anchorage()
+
+    assert [v[0] for v in index.vessels_by_state(VesselState.INCOMING)] == [first]
+    assert [v[0] for v in index.vessels_by_state(VesselState.GOING_TO_ANCHORAGE)] == [
+        second
+    ]
+
+    first_fsm.fsm.go_to_anchorage()
+    first_fsm.fsm.stop_at_anchorage()
+
+    # The vessels of several states are merged by entity id
+    entries = index.vessels_by_states(
+        [VesselState.GOING_TO_ANCHORAGE, VesselState.WAITING_AT_ANCHORAGE]
+    )
+
+    assert [v[0] for v in entries] == [first, second]
+    assert entries[1][1][5] is second_fsm
+
+    # The vessels that left are dropped
+    second_fsm.fsm.go_to_berth()
+    second_fsm.fsm.servicing()
+    second_fsm.fsm.done_servicing()
+    second_fsm.fsm.leave()
+    second_fsm.fsm.complete()
+
+    assert len(index) == 1
+    assert index.vessels_by_state(VesselState.LEFT) == []
+
+    VesselIndex.invalidate(world)
+
+    assert VesselIndex.for_world(world) is not index
+
+
+def test_scheduled_states():
+    processor = VesselGoalFormulatorProcessor(VesselClass)
+
+    states = [state for states in processor.scheduled_states for state in states]
+
+    assert processor.scheduled_states[0] == (VesselState.TUG_MALFUNCTION,)
+    assert VesselState.WAITING_AT_ANCHORAGE in states
+    assert VesselState.SERVICING not in states
+    assert VesselState.LEFT not in states
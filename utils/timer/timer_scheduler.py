@@ -1,24 +1,92 @@
+import heapq
+import itertools
+import math
+
+
 class TimerScheduler:
-    world = None
+    """Keeps the scheduled simulation timers in a priority queue, ordered
+    by the absolute simulation time at which they are due.
+
+    Timers that are due at the same time fire in the order they were
+    scheduled. Invalidated timers are not removed from the queue, they are
+    discarded once they reach its head.
+    """
+
     __instance = None
 
     @staticmethod
     def get_instance():
-        if TimerScheduler.__instance == None:
-            TimerScheduler()
+        """Returns the default instance, used when no SimulationContext is given"""
+        if TimerScheduler.__instance is None:
+            TimerScheduler.__instance = TimerScheduler()
 
         return TimerScheduler.__instance
 
     def __init__(self):
-        """Private constructor."""
-        if TimerScheduler.__instance != None:
-            raise Exception("This class is a singleton!")
-        else:
-            TimerScheduler.__instance = self
+        self.clear()
+
+    @property
+    def time(self):
+        """The simulation time (in seconds) the timers were advanced to"""
+        return self._time
 
     def schedule(self, timer):
-        if not self.world:
-            raise Exception("The timer creator was not supplied a world!")
+        """Schedules a timer, starting from the current simulation time"""
+        start = self._time
+
+        heapq.heappush(
+            self._queue, (start + timer.duration, next(self._counter), start, timer)
+        )
+
+    def advance(self, dt, steps=1):
+        """Advances the simulation time by dt seconds and fires the due timers.
+
+        :param dt: the elapsed seconds
+        :param steps: advances the time by steps times dt seconds at once,
+            the timers are fired at the end, see idle_steps
+        """
+        for _ in range(steps):
+            self._time += dt
+
+        while self._queue:
+            _, _, start, timer = self._queue[0]
+
+            if not timer.completed() and self._time - start <= timer.duration:
+                break
+
+            heapq.heappop(self._queue)
+
+            # Invalidated timers are simply dropped
+            if not timer.completed():
+                timer.update(self._time - start)
+                self.fired_count += 1
+
+    def idle_steps(self, dt):
+        """Returns a conservative number of the next advance(dt) calls
+        during which no timer is fired, or math.inf if no timer is pending.
+
+        :param dt: the seconds each call advances the time by
+        """
+        # Invalidated timers would be discarded by the next advance anyway
+        while self._queue and self._queue[0][3].completed():
+            heapq.heappop(self._queue)
+
+        if not self._queue:
+            return math.inf
+
+        due, _, _, _ = self._queue[0]
+
+        # Keep a step of margin for the rounding of the accumulated time
+        return max(0, math.floor((due - self._time) / dt) - 1)
+
+    def __len__(self):
+        return len(self._queue)
+
+    def clear(self):
+        """Removes all the scheduled timers and resets the simulation time"""
+        self._time = 0
+        self._queue = []
 
-        timer_entity = self.world.create_entity()
-        self.world.add_component(timer_entity, timer)
+        # Number of timers fired so far
+        self.fired_count = 0
+        self._counter = itertools.count()